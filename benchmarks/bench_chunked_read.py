@@ -0,0 +1,83 @@
+"""
+Compare the whole-sheet read with the chunked reads on a very large worksheet.
+
+Starts benchmarks/fake_google_api.py in-process with one workbook of --rows
+job rows and reads it with GoogleSheetsReader.read_sheets,
+read_sheets_chunked and read_sheet_chunks (chunks consumed and dropped). For
+each it reports the wall time, the time until the first rows were usable and
+the peak traced memory. Times are measured on a separate untraced run, since
+tracemalloc slows allocation-heavy code down several times.
+
+Usage:
+    python benchmarks/bench_chunked_read.py [--rows 20000] [--chunk-rows 2000]
+        [--latency-ms 80] [--bandwidth-kbps 0]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from google.auth.credentials import AnonymousCredentials
+
+from fake_google_api import FakeGoogleAPI, FaultInjector, Fixtures
+from mi_app.google_sheets import GoogleConnection, GoogleSheetsReader
+
+
+def read_modes(reader, key, chunk_rows):
+    """Return name -> callable reading the sheet and returning the time the first rows were usable"""
+    def whole():
+        reader.read_sheets("key", key)
+        return time.perf_counter()
+
+    def buffered():
+        first = []
+        reader.read_sheets_chunked("key", key, chunk_rows=chunk_rows,
+                                   on_chunk=lambda done, total: first or first.append(time.perf_counter()))
+        return first[0]
+
+    def streamed():
+        first = None
+        for _ in reader.read_sheet_chunks("key", key, chunk_rows=chunk_rows):
+            first = first or time.perf_counter()
+        return first
+
+    return {"read_sheets": whole, "read_sheets_chunked": buffered, "read_sheet_chunks": streamed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--chunk-rows', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=80)
+    parser.add_argument('--bandwidth-kbps', type=float, default=0)
+    args = parser.parse_args()
+
+    fixtures = Fixtures.synthetic(1, jobs=args.rows)
+    faults = FaultInjector(latency_ms=args.latency_ms, bandwidth_kbps=args.bandwidth_kbps)
+    key = next(iter(fixtures.spreadsheets))
+
+    with FakeGoogleAPI(fixtures, faults=faults) as api:
+        connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url)
+        reader = GoogleSheetsReader(connection)
+        reader.read_sheets("key", key)  # Warm the connection pool
+
+        print(f"{'mode':>20} {'seconds':>8} {'first rows':>11} {'peak MB':>8}")
+        for name, read in read_modes(reader, key, args.chunk_rows).items():
+            start = time.perf_counter()
+            first = read()
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            read()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{name:>20} {elapsed:>8.2f} {first - start:>11.2f} {peak / 2 ** 20:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the structural Docs API read with the Drive export fast path.
+
+For every document id the script times GoogleDocumentReader.read_document in
+"structure", "text" and "markdown" modes and reports the median time and the
+size of the transferred response.
+
+Usage:
+    python benchmarks/bench_docs_read.py DOC_ID [DOC_ID ...] [--credentials PATH] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mi_app.google_sheets import (
+    DOCS_API_URL, DOCS_FIELDS, DRIVE_EXPORT_URL, EXPORT_FORMATS,
+    GoogleConnection, GoogleDocumentReader,
+)
+
+MODES = ("structure", "text", "markdown")
+
+
+def response_size(connection, doc_id, mode):
+    """Return the number of bytes of the response behind a read mode"""
+    if mode == "structure":
+        url, params = DOCS_API_URL.format(document_id=doc_id), {'fields': DOCS_FIELDS}
+    else:
+        url, params = DRIVE_EXPORT_URL.format(file_id=doc_id), {'mimeType': EXPORT_FORMATS[mode]}
+    return len(connection.get_bytes(url, params))
+
+
+def time_read(reader, doc_id, mode, runs):
+    """Return the median time of read_document in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        reader.read_document(doc_id, mode=mode)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("doc_ids", nargs="+")
+    parser.add_argument("--credentials", default=None)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    connection = GoogleConnection(args.credentials)
+    reader = GoogleDocumentReader(connection)
+    # Warm the connection pool and the token so the first mode is not penalized
+    reader.read_document(args.doc_ids[0], mode="text")
+
+    print(f"{'document':<46} {'mode':<10} {'median ms':>10} {'bytes':>10}")
+    for doc_id in args.doc_ids:
+        for mode in MODES:
+            elapsed = time_read(reader, doc_id, mode, args.runs)
+            size = response_size(connection, doc_id, mode)
+            print(f"{doc_id:<46} {mode:<10} {elapsed:>10.1f} {size:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
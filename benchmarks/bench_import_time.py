@@ -0,0 +1,75 @@
+"""
+Import-time benchmark for the GUI entry point.
+
+Runs ``python -X importtime -c "import mi_app.gui"`` in a fresh interpreter and
+reports the cumulative import time of ``mi_app.gui``. It exits with status 1
+when the time exceeds the budget or when one of the heavy dependencies is
+imported eagerly, so it can be used to catch startup regressions.
+
+Usage:
+    python benchmarks/bench_import_time.py [--budget-ms 150] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported before the window exists
+HEAVY_MODULES = ("pandas", "gspread", "google.auth", "docxtpl", "lxml")
+
+PROBE = (
+    "import sys, mi_app.gui; "
+    "print(','.join(m for m in {modules!r} if m in sys.modules))"
+)
+
+
+def measure_import_ms():
+    """Return the cumulative import time of mi_app.gui in milliseconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mi_app.gui"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == "mi_app.gui":
+            return int(parts[1]) / 1000.0
+    raise RuntimeError("mi_app.gui not found in -X importtime output")
+
+
+def eager_heavy_modules():
+    """Return the heavy modules loaded as a side effect of importing the GUI"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(modules=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return [name for name in result.stdout.strip().split(",") if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = [measure_import_ms() for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"import mi_app.gui: median {median:.1f} ms over {args.runs} runs "
+          f"(min {min(timings):.1f} ms, max {max(timings):.1f} ms)")
+
+    failed = False
+    eager = eager_heavy_modules()
+    if eager:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(eager)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: import time above the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
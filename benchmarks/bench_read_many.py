@@ -0,0 +1,66 @@
+"""
+End-to-end read throughput against the local Google API stand-in.
+
+Starts benchmarks/fake_google_api.py in-process with the given latency and
+fault settings, then reads every fixture workbook through
+GoogleSheetsReader.read_many at several concurrency levels and reports
+spreadsheets per second, retries and faults. No Google credentials are needed.
+
+Usage:
+    python benchmarks/bench_read_many.py [--sheets 40] [--workers 1 2 4 8]
+        [--latency-ms 80] [--jitter-ms 40] [--bandwidth-kbps 0]
+        [--quota-rpm 0] [--rate-429 0.0] [--error-rate 0.0]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from google.auth.credentials import AnonymousCredentials
+
+from fake_google_api import FakeGoogleAPI, FaultInjector, Fixtures
+from mi_app.google_sheets import GoogleConnection, GoogleSheetsReader
+
+
+def run(api, workers, requests_per_minute):
+    """Read every fixture workbook once; return (seconds, failures, scheduler metrics)"""
+    connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url,
+                                  requests_per_minute=requests_per_minute)
+    reader = GoogleSheetsReader(connection)
+    keys = list(api.fixtures.spreadsheets)
+    start = time.perf_counter()
+    failures = sum(1 for _, _, error in reader.read_many("key", keys, max_workers=workers) if error)
+    return time.perf_counter() - start, failures, connection.scheduler.metrics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sheets", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--jitter-ms", type=float, default=40)
+    parser.add_argument("--bandwidth-kbps", type=float, default=0)
+    parser.add_argument("--quota-rpm", type=int, default=0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--client-rpm", type=int, default=6000,
+                        help="Client-side request budget of the scheduler")
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'seconds':>8} {'sheets/s':>9} {'failed':>7}  scheduler")
+    for workers in args.workers:
+        faults = FaultInjector(args.latency_ms, args.jitter_ms, args.bandwidth_kbps, args.quota_rpm,
+                               args.rate_429, args.error_rate, seed=workers)
+        with FakeGoogleAPI(Fixtures.synthetic(args.sheets), faults) as api:
+            seconds, failures, metrics = run(api, workers, args.client_rpm)
+            print(f"{workers:>7} {seconds:>8.2f} {args.sheets / seconds:>9.1f} {failures:>7}  {metrics}")
+            print(f"{'':>7} server: {dict(api.stats)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
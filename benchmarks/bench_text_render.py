@@ -0,0 +1,49 @@
+"""
+Descriptor throughput of the Markdown/HTML generator.
+
+Builds a descriptor-shaped sheet with the fixtures of the local Google API
+stand-in, then writes one file per job with TextGenerator.generate_descriptors
+in each output format and reports files per second. Run it from the
+repository root, where the default template path resolves.
+
+Usage:
+    python benchmarks/bench_text_render.py [--jobs 2000] [--formats markdown html]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_google_api import Fixtures
+from mi_app.text_generator import OUTPUT_FORMATS, TextGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--formats', nargs='+', default=list(OUTPUT_FORMATS), choices=list(OUTPUT_FORMATS))
+    args = parser.parse_args()
+
+    workbook = next(iter(Fixtures.synthetic(1, jobs=args.jobs).spreadsheets.values()))
+    sheet = pd.DataFrame(workbook['sheets']['Sheet1'])
+    generator = TextGenerator()
+    positions = range(len(generator.doc_generator.job_table(sheet)))
+
+    print(f"{'format':>10} {'files':>7} {'seconds':>8} {'files/s':>9}")
+    for fmt in args.formats:
+        with tempfile.TemporaryDirectory() as output_dir:
+            start = time.perf_counter()
+            written = sum(1 for _ in generator.generate_descriptors(sheet, positions, output_dir, fmt))
+            elapsed = time.perf_counter() - start
+        print(f"{fmt:>10} {written:>7} {elapsed:>8.2f} {written / elapsed:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
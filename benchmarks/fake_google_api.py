@@ -0,0 +1,444 @@
+"""
+Local stand-in for the Google APIs the app uses, with fault injection.
+
+Serves fixture workbooks and documents over the endpoints GoogleConnection,
+GoogleSheetsReader, GoogleDocumentReader and DriveChangesWatcher call:
+
+    Sheets  GET /v4/spreadsheets/{id}                   metadata
+            GET /v4/spreadsheets/{id}/values/{range}    values (A1 ranges)
+            GET /v4/spreadsheets/{id}/values:batchGet   values of several ranges
+    Drive   GET /drive/v3/files                         list, filtered by name
+            GET /drive/v3/files/{id}                    file metadata
+            GET /drive/v3/files/{id}/export             text/plain, text/markdown
+            GET /drive/v3/changes/startPageToken
+            GET /drive/v3/changes
+    Docs    GET /v1/documents/{id}
+
+Each response can be delayed (latency and jitter), throttled (bandwidth)
+and replaced by a 429 quota error or a 503 at a given rate. A per-minute
+quota answers 429 once exhausted, like the real APIs. Faults are drawn
+from a seeded generator, so runs are reproducible.
+
+Point the app at it with:
+
+    from google.auth.credentials import AnonymousCredentials
+    GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=server.url)
+
+Admin endpoints: POST /_admin/touch/{id} records a change of a file for the
+changes feed, GET /_admin/stats returns request counters.
+
+Usage:
+    python benchmarks/fake_google_api.py [--fixtures FILE.json] [--synthetic 20]
+        [--port 8080] [--latency-ms 80] [--jitter-ms 40] [--bandwidth-kbps 0]
+        [--quota-rpm 0] [--rate-429 0.0] [--error-rate 0.0] [--seed 0]
+
+Fixture file format:
+    {"spreadsheets": {"<id>": {"title": "...", "sheets": {"Sheet1": [[...], ...]}}},
+     "documents": {"<id>": {"title": "...", "paragraphs": ["...", ...]}}}
+"""
+import argparse
+import gzip
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+SPREADSHEET_MIME = "application/vnd.google-apps.spreadsheet"
+DOCUMENT_MIME = "application/vnd.google-apps.document"
+
+# Bytes written per throttled chunk when a bandwidth limit is set
+THROTTLE_CHUNK = 16 * 1024
+
+A1_CELL = re.compile(r"([A-Za-z]*)(\d*)")
+
+
+class Fixtures:
+    """Spreadsheets and documents served by the stand-in, plus a change log"""
+
+    def __init__(self, spreadsheets=None, documents=None):
+        self.spreadsheets = spreadsheets or {}
+        self.documents = documents or {}
+        self.changes = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("spreadsheets"), data.get("documents"))
+
+    @classmethod
+    def synthetic(cls, count, jobs=30, cols=45):
+        """Descriptor-shaped workbooks: header block at column 42, jobs from row 11"""
+        spreadsheets, documents = {}, {}
+        for n in range(count):
+            rows = [[""] * cols for _ in range(11 + jobs)]
+            header = [(2, f"COD-{n}"), (3, "v1"), (4, "2025-01-01"), (5, "Autor"),
+                      (6, "Revisor"), (7, "Aprobador"), (8, "Borrador"), (9, "2025-02-02")]
+            for row, value in header:
+                rows[row][42] = value
+            for i in range(jobs):
+                row = rows[11 + i]
+                row[2], row[3] = f"Nivel {i % 4}", f"Cargo {i}"
+                for col in range(4, 29):
+                    row[col] = f"Descripción {n}-{i}-{col}"
+            spreadsheets[f"sheet{n:04d}" + "x" * 21] = {"title": f"Descriptores {n}", "sheets": {"Sheet1": rows}}
+            documents[f"doc{n:04d}" + "x" * 21] = {
+                "title": f"Documento {n}",
+                "paragraphs": [f"Párrafo {p} del documento {n}." for p in range(200)],
+            }
+        return cls(spreadsheets, documents)
+
+    def touch(self, file_id):
+        with self._lock:
+            self.changes.append(file_id)
+
+    def changes_since(self, token):
+        with self._lock:
+            return self.changes[token:], len(self.changes)
+
+
+class FaultInjector:
+    """Latency, bandwidth, quota and error behaviour applied to every API response"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, bandwidth_kbps=0, quota_rpm=0,
+                 rate_429=0.0, error_rate=0.0, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth = bandwidth_kbps * 1024 / 8 if bandwidth_kbps else 0
+        self.quota_rpm = quota_rpm
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = deque()
+
+    def delay(self):
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        return (self.latency_ms + jitter) / 1000
+
+    def fault(self):
+        """Return the status code to fail the request with, or None"""
+        with self._lock:
+            now = time.monotonic()
+            if self.quota_rpm:
+                while self._recent and now - self._recent[0] > 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.quota_rpm:
+                    return 429
+                self._recent.append(now)
+            draw = self._random.random()
+        if draw < self.rate_429:
+            return 429
+        if draw < self.rate_429 + self.error_rate:
+            return 503
+        return None
+
+
+class FakeGoogleAPI:
+    """
+    The stand-in server, runnable in-process for benchmarks.
+
+    Usage:
+        with FakeGoogleAPI(Fixtures.synthetic(10), FaultInjector(latency_ms=50)) as api:
+            connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url)
+    """
+
+    def __init__(self, fixtures, faults=None, host="127.0.0.1", port=0):
+        self.fixtures = fixtures
+        self.faults = faults or FaultInjector()
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        handler = type("Handler", (_Handler,), {"api": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    api = None
+    protocol_version = "HTTP/1.1"
+
+    ROUTES = (
+        (re.compile(r"^/v4/spreadsheets/([^/]+)/values:batchGet$"), "_values_batch_get"),
+        (re.compile(r"^/v4/spreadsheets/([^/]+)/values/(.+)$"), "_values_get"),
+        (re.compile(r"^/v4/spreadsheets/([^/:]+)$"), "_spreadsheet_metadata"),
+        (re.compile(r"^/drive/v3/changes/startPageToken$"), "_start_page_token"),
+        (re.compile(r"^/drive/v3/changes$"), "_changes"),
+        (re.compile(r"^/drive/v3/files/([^/]+)/export$"), "_export"),
+        (re.compile(r"^/drive/v3/files/([^/]+)$"), "_file_metadata"),
+        (re.compile(r"^/drive/v3/files$"), "_list_files"),
+        (re.compile(r"^/v1/documents/([^/]+)$"), "_document"),
+    )
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/_admin/stats":
+            return self._send_json(200, dict(self.api.stats))
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.query_lists = parse_qs(url.query)
+
+        for pattern, method in self.ROUTES:
+            match = pattern.match(url.path)
+            if match:
+                self.api.count(method.lstrip("_"))
+                time.sleep(self.api.faults.delay())
+                status = self.api.faults.fault()
+                if status:
+                    self.api.count(f"fault_{status}")
+                    return self._send_error(status)
+                try:
+                    return getattr(self, method)(*(unquote(group) for group in match.groups()))
+                except KeyError as e:
+                    return self._send_error(404, f"Requested entity was not found: {e}")
+        self._send_error(404, f"Unknown endpoint: {url.path}")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        match = re.match(r"^/_admin/touch/([^/]+)$", url.path)
+        if not match:
+            return self._send_error(404, f"Unknown endpoint: {url.path}")
+        self.api.fixtures.touch(unquote(match.group(1)))
+        self._send_json(200, {})
+
+    # Sheets
+
+    def _spreadsheet_metadata(self, spreadsheet_id):
+        spreadsheet = self.api.fixtures.spreadsheets[spreadsheet_id]
+        sheets = []
+        for index, (title, rows) in enumerate(spreadsheet["sheets"].items()):
+            sheets.append({"properties": {
+                "sheetId": index, "title": title, "index": index, "sheetType": "GRID",
+                "gridProperties": {"rowCount": max(len(rows), 1),
+                                   "columnCount": max((len(row) for row in rows), default=1)},
+            }})
+        self._send_json(200, {
+            "spreadsheetId": spreadsheet_id,
+            "properties": {"title": spreadsheet["title"], "locale": "es_ES"},
+            "sheets": sheets,
+        })
+
+    def _values_get(self, spreadsheet_id, range_name):
+        spreadsheet = self.api.fixtures.spreadsheets[spreadsheet_id]
+        self._send_json(200, _value_range(spreadsheet, range_name))
+
+    def _values_batch_get(self, spreadsheet_id):
+        spreadsheet = self.api.fixtures.spreadsheets[spreadsheet_id]
+        ranges = self.query_lists.get("ranges", [])
+        self._send_json(200, {
+            "spreadsheetId": spreadsheet_id,
+            "valueRanges": [_value_range(spreadsheet, range_name) for range_name in ranges],
+        })
+
+    # Drive
+
+    def _list_files(self):
+        query = self.query.get("q", "")
+        name = re.search(r'name = "([^"]*)"', query)
+        files = []
+        for file_id, spreadsheet in self.api.fixtures.spreadsheets.items():
+            if name is None or spreadsheet["title"] == name.group(1):
+                files.append(_file(file_id, spreadsheet["title"], SPREADSHEET_MIME))
+        self._send_json(200, {"kind": "drive#fileList", "files": files})
+
+    def _file_metadata(self, file_id):
+        fixtures = self.api.fixtures
+        if file_id in fixtures.spreadsheets:
+            metadata = _file(file_id, fixtures.spreadsheets[file_id]["title"], SPREADSHEET_MIME)
+            # Every touch is an edit, so it bumps the file version as Drive does
+            metadata["version"] = str(1 + fixtures.changes.count(file_id))
+            return self._send_json(200, metadata)
+        document = fixtures.documents[file_id]
+        self._send_json(200, _file(file_id, document["title"], DOCUMENT_MIME))
+
+    def _export(self, file_id):
+        document = self.api.fixtures.documents[file_id]
+        mime_type = self.query.get("mimeType", "")
+        if mime_type not in ("text/plain", "text/markdown"):
+            return self._send_error(400, f"Export to {mime_type} is not emulated")
+        text = "\n".join(document["paragraphs"]) + "\n"
+        self._send(200, text.encode("utf-8"), f"{mime_type}; charset=utf-8")
+
+    def _start_page_token(self):
+        _, token = self.api.fixtures.changes_since(0)
+        self._send_json(200, {"startPageToken": str(token)})
+
+    def _changes(self):
+        changes, token = self.api.fixtures.changes_since(int(self.query.get("pageToken", "0")))
+        self._send_json(200, {
+            "newStartPageToken": str(token),
+            "changes": [{"fileId": file_id, "removed": False} for file_id in changes],
+        })
+
+    # Docs
+
+    def _document(self, document_id):
+        document = self.api.fixtures.documents[document_id]
+        content = [
+            {"paragraph": {"elements": [{"textRun": {"content": paragraph + "\n"}}]}}
+            for paragraph in document["paragraphs"]
+        ]
+        self._send_json(200, {"documentId": document_id, "title": document["title"],
+                              "body": {"content": content}})
+
+    # Responses
+
+    def _send_error(self, status, message=None):
+        reasons = {429: "RESOURCE_EXHAUSTED", 503: "UNAVAILABLE", 404: "NOT_FOUND", 400: "INVALID_ARGUMENT"}
+        message = message or ("Quota exceeded" if status == 429 else "The service is currently unavailable")
+        self._send_json(status, {"error": {"code": status, "message": message,
+                                           "status": reasons.get(status, "UNKNOWN")}})
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json; charset=UTF-8")
+
+    def _send(self, status, body, content_type):
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=5)
+            encoding = "gzip"
+        else:
+            encoding = None
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+
+        bandwidth = self.api.faults.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        for start in range(0, len(body), THROTTLE_CHUNK):
+            chunk = body[start:start + THROTTLE_CHUNK]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / bandwidth)
+
+
+def _file(file_id, name, mime_type):
+    return {"kind": "drive#file", "id": file_id, "name": name, "mimeType": mime_type,
+            "createdTime": "2025-01-01T00:00:00.000Z", "modifiedTime": "2025-01-01T00:00:00.000Z"}
+
+
+def _value_range(spreadsheet, range_name):
+    """Slice a sheet by an A1 range such as 'Sheet1', "'Sheet1'!A1:C10" or 'A5:AZ'"""
+    sheets = spreadsheet["sheets"]
+    sheet_name, _, cells = range_name.rpartition("!")
+    if not sheet_name:
+        # A bare sheet name, or cells of the first sheet
+        if range_name.strip("'") in sheets:
+            sheet_name, cells = range_name, ""
+        else:
+            sheet_name = next(iter(sheets))
+    title = sheet_name.strip("'").replace("''", "'")
+    rows = sheets[title]
+
+    first_col, first_row, last_col, last_row = 0, 0, None, len(rows) - 1
+    if cells:
+        start, _, end = cells.partition(":")
+        first_col, first_row = _a1_cell(start, 0, 0)
+        last_col, last_row = _a1_cell(end or start, None, len(rows) - 1)
+
+    stop_col = None if last_col is None else last_col + 1
+    values = [row[first_col:stop_col] for row in rows[first_row:last_row + 1]]
+    # The API drops trailing empty cells and rows
+    values = [_trim(row) for row in values]
+    while values and not values[-1]:
+        values.pop()
+    response = {"range": f"'{title}'!{cells or 'A1'}", "majorDimension": "ROWS"}
+    if values:
+        response["values"] = values
+    return response
+
+
+def _a1_cell(cell, default_col, default_row):
+    """Return the 0-based (column, row) of an A1 cell; missing parts get the defaults"""
+    letters, digits = A1_CELL.fullmatch(cell).groups()
+    col = default_col
+    if letters:
+        col = 0
+        for letter in letters.upper():
+            col = col * 26 + ord(letter) - ord("A") + 1
+        col -= 1
+    row = int(digits) - 1 if digits else default_row
+    return col, row
+
+
+def _trim(row):
+    end = len(row)
+    while end and row[end - 1] in ("", None):
+        end -= 1
+    return row[:end]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fixtures", help="JSON fixture file")
+    parser.add_argument("--synthetic", type=int, default=0, help="Number of generated workbooks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-kbps", type=float, default=0, help="0 means unlimited")
+    parser.add_argument("--quota-rpm", type=int, default=0, help="Requests per minute before 429; 0 means unlimited")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        fixtures = Fixtures.load(args.fixtures)
+    else:
+        fixtures = Fixtures.synthetic(args.synthetic or 5)
+    faults = FaultInjector(args.latency_ms, args.jitter_ms, args.bandwidth_kbps, args.quota_rpm,
+                           args.rate_429, args.error_rate, args.seed)
+    api = FakeGoogleAPI(fixtures, faults, args.host, args.port)
+    print(f"Serving {len(fixtures.spreadsheets)} spreadsheets and {len(fixtures.documents)} documents at {api.url}")
+    for spreadsheet_id, spreadsheet in list(fixtures.spreadsheets.items())[:5]:
+        print(f"  {spreadsheet_id}  {spreadsheet['title']}")
+    try:
+        api.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
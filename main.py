@@ -1,274 +1,14 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import gspread
-from google.oauth2 import service_account
-import pandas as pd
-from fpdf import FPDF
 import os
-import json
-from gspread.utils import GridRangeType
-
-
-# Try to import Google Docs API modules, but make them optional
-GOOGLE_DOCS_AVAILABLE = True
-try:
-    from googleapiclient.discovery import build
-except ImportError:
-    GOOGLE_DOCS_AVAILABLE = False
-
-
-class GoogleConnection:
-    """Class for handling Google API connections and credential validation"""
-
-    def __init__(self, credentials_path=None, ):
-        self.credentials_path = credentials_path
-        self.client = None
-        self.scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-            "https://www.googleapis.com/auth/documents"
-        ]
-
-    def select_credentials(self):
-        """Allow user to select credentials file"""
-        file_path = filedialog.askopenfilename(
-            title="Select Google API Credentials",
-            filetypes=[("JSON files", "*.json")]
-        )
-        if file_path:
-            self.credentials_path = file_path
-            return True
-        return False
-
-    def validate_credentials(self):
-        """Validate the selected credentials file"""
-        if not self.credentials_path:
-            return False, "No credentials file selected"
-
-        try:
-            # Try to load the credentials file
-            with open(self.credentials_path, 'r') as f:
-                json_data = json.load(f)
-
-            # Check if it has the required fields for a service account
-            required_fields = ['client_email', 'private_key', 'project_id']
-            for field in required_fields:
-                if field not in json_data:
-                    return False, f"Invalid credentials: missing {field}"
-
-            # Try to connect to Google API using the newer google-auth library
-            creds = service_account.Credentials.from_service_account_file(
-                self.credentials_path, scopes=self.scope
-            )
-            self.client = gspread.authorize(creds)
-
-            # Test connection by trying to list all spreadsheets in the drive
-            self.client.list_spreadsheet_files()
-
-            return True, "Credentials validated successfully"
-        except Exception as e:
-            return False, f"Validation failed: {str(e)}"
-
-    def show_validation_window(self, parent):
-        """Display a validation window to verify credentials"""
-        if not self.credentials_path:
-            messagebox.showerror("Error", "Please select credentials file first")
-            return False
-
-        validation_window = tk.Toplevel(parent)
-        validation_window.title("Credentials Validation")
-        validation_window.geometry("400x200")
-        validation_window.transient(parent)
-        validation_window.grab_set()
-
-        # Center the window
-        validation_window.update_idletasks()
-        width = validation_window.winfo_width()
-        height = validation_window.winfo_height()
-        x = (validation_window.winfo_screenwidth() // 2) - (width // 2)
-        y = (validation_window.winfo_screenheight() // 2) - (height // 2)
-        validation_window.geometry('{}x{}+{}+{}'.format(width, height, x, y))
-
-        # Add a label
-        ttk.Label(
-            validation_window,
-            text="Validating credentials...",
-            font=("Arial", 12)
-        ).pack(pady=20)
-
-        # Add a progress bar
-        progress = ttk.Progressbar(
-            validation_window,
-            orient="horizontal",
-            length=300,
-            mode="indeterminate"
-        )
-        progress.pack(pady=10)
-        progress.start()
-
-        result_var = tk.StringVar()
-        result_label = ttk.Label(
-            validation_window,
-            textvariable=result_var,
-            font=("Arial", 10)
-        )
-        result_label.pack(pady=10)
-
-        # Validate in a separate function to avoid freezing the UI
-        def validate():
-            is_valid, message = self.validate_credentials()
-            progress.stop()
-            result_var.set(message)
-
-            if is_valid:
-                result_label.config(foreground="green")
-                validation_window.after(2000, validation_window.destroy)
-                return True
-            else:
-                result_label.config(foreground="red")
-                return False
-
-        # Schedule the validation to run after the window is shown
-        validation_window.after(100, validate)
-
-        # Wait for the window to be destroyed
-        parent.wait_window(validation_window)
-
-        return self.client is not None
-
-    def connect(self):
-        """Connect to Google API using validated credentials"""
-        if not self.client:
-            try:
-                creds = service_account.Credentials.from_service_account_file(
-                    self.credentials_path, scopes=self.scope
-                )
-                self.client = gspread.authorize(creds)
-            except Exception as e:
-                raise ConnectionError(f"Failed to connect: {str(e)}")
-        return self.client
-
-
-class GoogleDocumentReader:
-    """Class for reading data from Google Sheets and Google Docs"""
-
-    def __init__(self, google_connection):
-        """
-        Initializes a class instance by setting up the Google connection and preparing
-        the client attribute for later assignment.
-
-        :param google_connection: A connection instance to interact with Google services.
-        :type google_connection: Any
-        """
-        self.connection = google_connection
-        self.client = None
-
-    def connect(self):
-        """
-        Connect to the external service and initialize the client if it has not
-        already been connected.
-
-        This method ensures that the `client` attribute is initialized with an
-        active connection. If the connection is already established, it will not
-        attempt to reconnect or reinitialize the client.
-
-        :return: Returns the initialized client object.
-        :rtype: Any
-        """
-        if not self.client:
-            self.client = self.connection.connect()
-        return self.client
-
-    def read_sheets(self, access_type, identifier):
-        """
-        Reads data from a Google Sheets spreadsheet and returns it as a pandas DataFrame.
-        This function connects to a Google Sheets client and retrieves the data from
-        a specified spreadsheet based on the provided access type (name, key, or URL).
-        It converts the sheet data into a DataFrame for further processing or analysis.
-
-        :param access_type: A string indicating the type of identifier used to access
-            the spreadsheet. Options are "name", "key", or "url".
-        :param identifier: A string representing the value associated with the
-            specified access type. For example, a spreadsheet name for "name",
-            a unique key for "key", or a complete URL for "url".
-        :return: A pandas DataFrame containing the data from the spreadsheet.
-        """
-        client = self.connect()
-
-        if access_type == "name":
-            spreadsheet = client.open(identifier)
-        elif access_type == "key":
-            spreadsheet = client.open_by_key(identifier)
-        elif access_type == "url":
-            spreadsheet = client.open_by_url(identifier)
-        else:
-            raise ValueError("Invalid access type")
-        spreadsheet_data = spreadsheet.sheet1.get(return_type=GridRangeType.ListOfLists)
-        df = pd.DataFrame(spreadsheet_data)
-        return df
-
-    def read_document(self, doc_id):
-        """
-        Read content from a Google Doc
-
-        Args:
-            doc_id: The document ID
-
-        Returns:
-            Document content as text
-        """
-        # Check if Google Docs API is available
-        if not GOOGLE_DOCS_AVAILABLE:
-            raise ValueError(
-                "Google Docs functionality is not available. Please install the 'google-api-python-client' package."
-            )
-
-        # For Google Docs, we need to use the Google Docs API
-        # This requires additional setup with the googleapiclient
-        try:
-            # Create credentials object for Docs API
-            creds = service_account.Credentials.from_service_account_file(
-                self.connection.credentials_path,
-                scopes=['https://www.googleapis.com/auth/documents.readonly']
-            )
 
-            # Build the Docs API client
-            docs_service = build('docs', 'v1', credentials=creds)
+from mi_app.google_sheets import GoogleConnection, GoogleDocumentReader
+from mi_app.pdf_fonts import UNICODE_FAMILY, UnicodeFPDF, find_unicode_font
+from mi_app.pdf_stream import StreamingFPDF
 
-            # Retrieve the document
-            document = docs_service.documents().get(documentId=doc_id).execute()
 
-            # Extract text from the document
-            doc_content = document.get('body').get('content')
-            text_content = self._extract_text_from_doc_content(doc_content)
-
-            # Return as a single "worksheet" with the document content
-            df = pd.DataFrame({'Content': [text_content]})
-            return [('Document', df)]
-
-        except Exception as e:
-            raise ValueError(f"Failed to read Google Doc: {str(e)}")
-
-    def _extract_text_from_doc_content(self, content):
-        """Helper method to extract text from Google Doc content"""
-        text = []
-        for element in content:
-            if 'paragraph' in element:
-                for paragraph_element in element['paragraph']['elements']:
-                    if 'textRun' in paragraph_element:
-                        text.append(paragraph_element['textRun']['content'])
-            elif 'table' in element:
-                # Handle tables
-                for table_row in element['table']['tableRows']:
-                    row_text = []
-                    for cell in table_row['tableCells']:
-                        if 'content' in cell:
-                            cell_text = self._extract_text_from_doc_content(cell['content'])
-                            row_text.append(cell_text)
-                    text.append(' | '.join(row_text))
-            elif 'tableOfContents' in element:
-                text.append('[Table of Contents]')
-        return '\n'.join(text)
+# Sheets with more rows than this are streamed to disk page by page
+STREAMING_ROW_THRESHOLD = 2000
 
 
 class PDFGenerator:
@@ -276,7 +16,11 @@ class PDFGenerator:
 
     def __init__(self):
         self.pdf = None
-    def generate_from_dataframes(self, dataframes, output_path, title=None):
+        # Without an installed Unicode font the core Arial font is used and
+        # text is limited to Latin-1
+        self.font_files = find_unicode_font()
+
+    def generate_from_dataframes(self, dataframes, output_path, title=None, stream=None):
         """
         Generate a PDF file from a list of dataframes
 
@@ -284,26 +28,61 @@ class PDFGenerator:
             dataframes: List of tuples containing (worksheet_name, dataframe)
             output_path: Path to save the PDF file
             title: Optional title for the PDF
+            stream: Write each page to disk as soon as it is complete, so memory
+                use does not grow with the sheet. Defaults to streaming when
+                the sheets hold more than STREAMING_ROW_THRESHOLD rows.
         """
-        self.pdf = FPDF()
-        self.pdf.set_auto_page_break(auto=True, margin=15)
+        if stream is None:
+            stream = sum(len(df) for _, df in dataframes) > STREAMING_ROW_THRESHOLD
+        self.pdf = self._new_pdf(output_path if stream else None)
 
-        # Add title page if title is provided
-        if title:
-            self._add_title_page(title)
+        try:
+            # Add title page if title is provided
+            if title:
+                self._add_title_page(title)
+
+            for sheet_name, df in dataframes:
+                self._add_dataframe_page(sheet_name, df)
+
+            self.pdf.output(output_path)
+        except Exception:
+            if stream:
+                self.pdf.discard()
+            raise
+        return output_path
 
-        for sheet_name, df in dataframes:
-            self._add_dataframe_page(sheet_name, df)
+    def _new_pdf(self, stream_path=None):
+        """Create the FPDF document and register the Unicode font, if any"""
+        pdf = StreamingFPDF(stream_path) if stream_path else UnicodeFPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        if self.font_files:
+            for style, path in self.font_files.items():
+                pdf.add_font(UNICODE_FAMILY, style, path, uni=True)
+        return pdf
+
+    def _set_font(self, style, size):
+        """Select the document font, falling back to a style the font family has"""
+        if not self.font_files:
+            self.pdf.set_font("Arial", style, size)
+        elif style in self.font_files:
+            self.pdf.set_font(UNICODE_FAMILY, style, size)
+        else:
+            self.pdf.set_font(UNICODE_FAMILY, "", size)
 
-        self.pdf.output(output_path)
-        return output_path
+    def _text(self, text):
+        """Make text writable with the selected font"""
+        text = str(text)
+        if self.font_files:
+            return text
+        return text.encode('latin-1', 'replace').decode('latin-1')
 
     def _add_title_page(self, title):
         """Add a title page to the PDF"""
         self.pdf.add_page()
-        self.pdf.set_font("Arial", "B", 24)
+        self._set_font("B", 24)
 
         # Calculate position for centered text
+        title = self._text(title)
         title_w = self.pdf.get_string_width(title)
         self.pdf.set_xy((self.pdf.w - title_w) / 2, self.pdf.h / 3)
 
@@ -311,7 +90,7 @@ class PDFGenerator:
         self.pdf.cell(title_w, 10, title, ln=True, align="C")
 
         # Add date
-        self.pdf.set_font("Arial", "I", 12)
+        self._set_font("I", 12)
         import datetime
         date_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         date_w = self.pdf.get_string_width(date_str)
@@ -321,8 +100,8 @@ class PDFGenerator:
     def _add_dataframe_page(self, sheet_name, df):
         """Add a page with dataframe content"""
         self.pdf.add_page()
-        self.pdf.set_font("Arial", "B", 12)
-        self.pdf.cell(200, 10, f"Sheet: {sheet_name}", ln=True, align="C")
+        self._set_font("B", 12)
+        self.pdf.cell(200, 10, self._text(f"Sheet: {sheet_name}"), ln=True, align="C")
         self.pdf.ln(10)
 
         # Check if this is a document content dataframe (special case)
@@ -331,21 +110,21 @@ class PDFGenerator:
             return
 
         # Regular dataframe handling
-        self.pdf.set_font("Arial", "", 10)
+        self._set_font("", 10)
 
         # Calculate column width based on number of columns
         col_width = self.pdf.w / (len(df.columns) + 1)
 
         # Write headers
         for col in df.columns:
-            self.pdf.cell(col_width, 10, str(col), border=1)
+            self.pdf.cell(col_width, 10, self._text(col), border=1)
         self.pdf.ln()
 
         # Write rows
-        for _, row in df.iterrows():
+        for row in df.itertuples(index=False, name=None):
             for item in row:
                 # Truncate long text to fit in cell
-                text = str(item)
+                text = self._text(item)
                 if len(text) > 30:  # Arbitrary limit to prevent overflow
                     text = text[:27] + "..."
                 self.pdf.cell(col_width, 10, text, border=1)
@@ -353,10 +132,10 @@ class PDFGenerator:
 
     def _add_document_content(self, content):
         """Add document content to the PDF"""
-        self.pdf.set_font("Arial", "", 10)
+        self._set_font("", 10)
 
         # Split content into lines and add them to the PDF
-        lines = content.split('\n')
+        lines = self._text(content).split('\n')
         for line in lines:
             # Check if line is too long and needs to be wrapped
             if self.pdf.get_string_width(line) > self.pdf.w - 20:
@@ -476,17 +255,6 @@ class GoogleToPDFApp:
         )
         docs_radio.pack(side="left", padx=20, pady=10)
 
-        # Disable Google Docs option if the API is not available
-        if not GOOGLE_DOCS_AVAILABLE:
-            docs_radio.configure(state="disabled")
-            docs_warning = ttk.Label(
-                doc_type_frame,
-                text="(Install google-api-python-client to enable)",
-                foreground="red",
-                font=("Arial", 8)
-            )
-            docs_warning.pack(side="left", padx=5, pady=10)
-
         # Access method (for Sheets only)
         self.access_frame = ttk.LabelFrame(main_container, text="Access Method (Sheets Only)")
         self.access_frame.pack(fill="x", pady=10, padx=5)
@@ -622,14 +390,6 @@ class GoogleToPDFApp:
                 access_type = self.access_var.get()
                 self.current_data = self.document_reader.read_sheets(access_type, identifier)
             else:
-                # Check if Google Docs API is available before proceeding
-                if not GOOGLE_DOCS_AVAILABLE:
-                    messagebox.showerror(
-                        "Error",
-                        "Google Docs functionality is not available. Please install the 'google-api-python-client' package."
-                    )
-                    self.status_var.set("Error: Google Docs API not available")
-                    return
                 self.current_data = self.document_reader.read_document(identifier)
 
             if not self.current_data:
@@ -738,14 +498,6 @@ class GoogleToPDFApp:
                 access_type = self.access_var.get()
                 self.current_data = self.document_reader.read_sheets(access_type, identifier)
             else:
-                # Check if Google Docs API is available before proceeding
-                if not GOOGLE_DOCS_AVAILABLE:
-                    messagebox.showerror(
-                        "Error",
-                        "Google Docs functionality is not available. Please install the 'google-api-python-client' package."
-                    )
-                    self.status_var.set("Error: Google Docs API not available")
-                    return
                 self.current_data = self.document_reader.read_document(identifier)
 
             if not self.current_data:
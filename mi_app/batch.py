@@ -0,0 +1,160 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from mi_app.docx_generator import DocumentGenerator
+from mi_app.utils import descriptor_filenames
+
+# pyarrow is optional: without it the job table is pickled once per worker
+ARROW_AVAILABLE = True
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# RAM-backed filesystem used for the shared job table when the OS has one
+SHARED_MEMORY_DIR = '/dev/shm'
+
+# Seconds between checks of the cancel event while documents are rendering
+CANCEL_POLL_INTERVAL = 0.2
+
+# State of a worker process, set once by _init_worker
+_worker = {}
+
+
+def publish_job_table(jobs: pd.DataFrame, directory: str = None) -> str:
+    """Write a job table once to an Arrow IPC file that workers can memory-map.
+
+    The file goes to shared memory (/dev/shm) when available, so attaching to
+    it never touches the disk.
+
+    Args:
+        jobs: Job table as returned by DocumentGenerator.job_table
+        directory: Directory for the file. Defaults to shared memory.
+
+    Returns:
+        str: Path of the published file; the caller removes it when done
+    """
+    table = pa.Table.from_pandas(_as_strings(jobs), preserve_index=False)
+    if directory is None and os.access(SHARED_MEMORY_DIR, os.W_OK):
+        directory = SHARED_MEMORY_DIR
+    fd, path = tempfile.mkstemp(prefix='mi_app_jobs_', suffix='.arrow', dir=directory)
+    with os.fdopen(fd, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return path
+
+
+def attach_job_table(path: str):
+    """Memory-map a published job table without copying it.
+
+    Returns:
+        pyarrow.Table: Table whose buffers point into the mapped file
+    """
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+def generate_descriptors(generator: DocumentGenerator, dataframes: pd.DataFrame, positions, output_dir: str,
+                         max_workers: int = None, cancel_event=None, on_stage=None):
+    """Generate the descriptors of several jobs on a pool of worker processes.
+
+    The job table is published once (see publish_job_table) and each worker
+    attaches to it when it starts. Tasks then carry only a row position and an
+    output path, so dispatch cost and memory stay flat as workers are added.
+
+    Args:
+        generator: DocumentGenerator whose template is used
+        dataframes: Raw sheet as returned by GoogleSheetsReader.read_sheets
+        positions: Row positions in the job table to generate
+        output_dir: Directory receiving one .docx per job, named as
+            descriptor_filenames does
+        max_workers: Number of worker processes. Defaults to the CPU count,
+            capped at the number of documents so small runs start fewer workers.
+        cancel_event: threading.Event that stops the run once set. Documents
+            not started yet are dropped; the ones being rendered are finished
+            and reported, so every file in output_dir is complete.
+        on_stage: Called with the name of each stage of the run as it starts
+
+    Yields:
+        tuple: ``(position, output_path, error)`` as each document finishes,
+            with ``error`` None on success
+    """
+    on_stage = on_stage or (lambda stage: None)
+    positions = list(positions)
+    if max_workers is None:
+        max_workers = max(1, min(len(positions), os.cpu_count() or 1))
+    on_stage("Preparing job table")
+    jobs = generator.job_table(dataframes)
+    header = generator.header_context(dataframes)
+    os.makedirs(output_dir, exist_ok=True)
+
+    table_path = publish_job_table(jobs) if ARROW_AVAILABLE else None
+    shared = table_path if table_path else _as_strings(jobs)
+
+    on_stage("Starting workers")
+    # spawn keeps the workers independent of the Tk main loop in the parent
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(shared, generator.template_path, header)
+    )
+    try:
+        futures = {}
+        # Named over the whole table, so a job keeps its file name whichever jobs are selected
+        names = descriptor_filenames(zip(jobs.iloc[:, 0], jobs.iloc[:, 1]), '.docx')
+        for position in positions:
+            output_path = os.path.join(output_dir, names[position])
+            futures[executor.submit(_render_task, position, output_path)] = (position, output_path)
+        on_stage("Rendering documents")
+        pending = set(futures)
+        cancelled = False
+        while pending:
+            if not cancelled and cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                on_stage("Cancelling")
+                # Running documents cannot be cancelled and are left to finish
+                pending = {future for future in pending if not future.cancel()}
+                continue
+            done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                position, output_path = futures[future]
+                try:
+                    future.result()
+                    yield position, output_path, None
+                except Exception as e:
+                    yield position, output_path, e
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if table_path:
+            os.remove(table_path)
+
+
+def _as_strings(jobs: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a job table to string cells and string column names"""
+    table = jobs.fillna('').astype(str)
+    table.columns = [str(column) for column in table.columns]
+    return table
+
+
+def _init_worker(shared, template_path, header):
+    """Attach the worker to the shared job table (path) or keep the pickled copy"""
+    _worker['jobs'] = attach_job_table(shared) if isinstance(shared, str) else shared
+    generator = DocumentGenerator()
+    generator.template_path = template_path
+    _worker['generator'] = generator
+    _worker['header'] = header
+
+
+def _render_task(position, output_path):
+    """Render the descriptor of one row of the shared job table"""
+    jobs = _worker['jobs']
+    if isinstance(jobs, pd.DataFrame):
+        job_data = jobs.iloc[position].to_dict()
+    else:
+        job_data = jobs.slice(position, 1).to_pylist()[0]
+    _worker['generator'].render_descriptor(_worker['header'], job_data, output_path)
+    return output_path
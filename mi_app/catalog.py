@@ -0,0 +1,395 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from mi_app.docx_generator import DocumentGenerator, IMAGE_FIELDS
+from mi_app.text_generator import OUTPUT_FORMATS, TextGenerator, job_records
+from mi_app.utils import descriptor_filenames, get_cache_dir
+
+# Job fields stored in their own catalog columns; the other text fields are
+# searched together as the job body
+LEVEL_FIELD, TITLE_FIELD, AREA_FIELD = 'n_jerarquico', 'puesto', 'a_trabajo'
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spreadsheets (
+    spreadsheet_id TEXT PRIMARY KEY,
+    name TEXT,
+    revision TEXT NOT NULL,
+    header TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    spreadsheet_id TEXT NOT NULL REFERENCES spreadsheets(spreadsheet_id),
+    position INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    title TEXT NOT NULL,
+    area TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    UNIQUE (spreadsheet_id, position)
+);
+CREATE INDEX IF NOT EXISTS jobs_level ON jobs(level COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS jobs_area ON jobs(area COLLATE NOCASE);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    level, title, area, body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# bm25 weights of the jobs_fts columns: a match in the title ranks first
+SEARCH_WEIGHTS = (2.0, 5.0, 2.0, 1.0)
+
+DEFAULT_SEARCH_LIMIT = 50
+
+
+@dataclass
+class CatalogEntry:
+    """One job of the catalog, as returned by a search"""
+
+    spreadsheet_id: str
+    spreadsheet_name: Optional[str]
+    position: int
+    level: str
+    title: str
+    area: str
+    snippet: str = ''
+
+
+@dataclass
+class SheetRead:
+    """A loaded sheet with the Drive metadata of the revision it was read at"""
+
+    dataframes: pd.DataFrame
+    spreadsheet_id: str
+    info: Optional[dict]
+
+
+class JobCatalog:
+    """
+    Local SQLite catalog of the job tables of every indexed spreadsheet.
+
+    Each spreadsheet is stored with its revision, its header fields and one row
+    per job: level, title and area in their own columns, and the full job
+    context as JSON so descriptors can be rendered straight from the catalog.
+    An FTS5 index over level, title, area and the remaining text fields
+    answers searches across all spreadsheets without any Google API request.
+    Accents are folded, so "area" finds "Área".
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: SQLite database file. Defaults to catalog.sqlite3 in the user
+                cache directory.
+        """
+        self.path = path or os.path.join(get_cache_dir(), 'catalog.sqlite3')
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def revision(self, spreadsheet_id):
+        """Return the indexed revision of a spreadsheet, or None if it is not indexed"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT revision FROM spreadsheets WHERE spreadsheet_id = ?', (spreadsheet_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def index(self, spreadsheet_id, dataframes: pd.DataFrame, revision=None, name=None,
+              generator: DocumentGenerator = None):
+        """
+        Store the job table of a spreadsheet, replacing what was indexed before.
+
+        Args:
+            spreadsheet_id: Key of the spreadsheet
+            dataframes: Raw sheet as returned by GoogleSheetsReader.read_sheets
+            revision: Revision of the sheet (e.g. the Drive file version).
+                Defaults to a digest of the sheet content.
+            name: Display name of the spreadsheet
+            generator: DocumentGenerator used to read the sheet
+
+        Returns:
+            bool: False when that revision was already indexed and nothing changed
+        """
+        revision = revision or content_revision(dataframes)
+        if self.revision(spreadsheet_id) == revision:
+            return False
+
+        generator = generator or DocumentGenerator()
+        header = generator.header_context(dataframes)
+        records = job_records(generator.job_table(dataframes))
+
+        jobs, texts = [], []
+        for position, job_data in enumerate(records):
+            level, title, area = (str(job_data.get(field, '')).strip()
+                                  for field in (LEVEL_FIELD, TITLE_FIELD, AREA_FIELD))
+            if not (level and title):
+                continue
+            body = '\n'.join(
+                str(value) for field, value in job_data.items()
+                if value != '' and field not in (LEVEL_FIELD, TITLE_FIELD, AREA_FIELD) + IMAGE_FIELDS
+            )
+            jobs.append((spreadsheet_id, position, level, title, area, json.dumps(job_data, default=str)))
+            texts.append((level, title, area, body))
+
+        with self._lock, self._db:
+            self._delete(spreadsheet_id)
+            self._db.execute(
+                'INSERT INTO spreadsheets (spreadsheet_id, name, revision, header, indexed_at) VALUES (?, ?, ?, ?, ?)',
+                (spreadsheet_id, name, revision, json.dumps(header, default=str), time.time())
+            )
+            for job, text in zip(jobs, texts):
+                rowid = self._db.execute(
+                    'INSERT INTO jobs (spreadsheet_id, position, level, title, area, fields) VALUES (?, ?, ?, ?, ?, ?)',
+                    job
+                ).lastrowid
+                self._db.execute(
+                    'INSERT INTO jobs_fts (rowid, level, title, area, body) VALUES (?, ?, ?, ?, ?)',
+                    (rowid,) + text
+                )
+        return True
+
+    def refresh(self, reader, spreadsheet_id, generator: DocumentGenerator = None):
+        """
+        Index a spreadsheet unless its current Drive revision is already indexed.
+
+        A revision always means the Drive file version (see drive_revision).
+        It is read before the sheet: an edit made during the read only causes
+        one more refresh later, never old jobs stored under the newer revision.
+        The GUI, which already has the sheet, indexes a read_with_revision
+        result directly instead.
+
+        Args:
+            reader: GoogleSheetsReader of the account that sees the spreadsheet
+            spreadsheet_id: Key of the spreadsheet
+            generator: DocumentGenerator used to read the sheet
+
+        Returns:
+            tuple: ``(revision, indexed)``, with ``indexed`` False when that
+                revision was already in the catalog and the sheet was not read
+        """
+        info = reader.file_info(spreadsheet_id)
+        revision = drive_revision(info)
+        if revision and self.revision(spreadsheet_id) == revision:
+            return revision, False
+        dataframes = reader.read_sheets("key", spreadsheet_id)
+        indexed = self.index(spreadsheet_id, dataframes, revision=revision, name=info.get('name'),
+                             generator=generator)
+        return revision, indexed
+
+    def remove(self, spreadsheet_id):
+        """Drop a spreadsheet and its jobs from the catalog"""
+        with self._lock, self._db:
+            self._delete(spreadsheet_id)
+
+    def search(self, query='', level=None, area=None, spreadsheet_id=None,
+               limit=DEFAULT_SEARCH_LIMIT) -> List[CatalogEntry]:
+        """
+        Find jobs across every indexed spreadsheet.
+
+        Args:
+            query: Free text; every word must match, as a word prefix, in the
+                level, title, area or any text field. Empty lists every job.
+            level: Only jobs at this level hierarchy (case-insensitive)
+            area: Only jobs in this work area (case-insensitive)
+            spreadsheet_id: Only jobs of this spreadsheet
+            limit: Maximum number of results
+
+        Returns:
+            list: CatalogEntry objects, best matches first
+        """
+        conditions, params = [], []
+        for column, value in (('jobs.level', level), ('jobs.area', area)):
+            if value:
+                conditions.append(f'{column} = ? COLLATE NOCASE')
+                params.append(value.strip())
+        if spreadsheet_id:
+            conditions.append('jobs.spreadsheet_id = ?')
+            params.append(spreadsheet_id)
+
+        match = match_query(query)
+        if match:
+            weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+            sql = (
+                "SELECT jobs.spreadsheet_id, spreadsheets.name, jobs.position, jobs.level, jobs.title, jobs.area, "
+                "snippet(jobs_fts, 3, '[', ']', '...', 12) "
+                "FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid "
+                "JOIN spreadsheets USING (spreadsheet_id) "
+                "WHERE jobs_fts MATCH ?" + ''.join(f' AND {condition}' for condition in conditions) +
+                f" ORDER BY bm25(jobs_fts, {weights}) LIMIT ?"
+            )
+            params = [match] + params
+        else:
+            sql = (
+                "SELECT jobs.spreadsheet_id, spreadsheets.name, jobs.position, jobs.level, jobs.title, jobs.area, '' "
+                "FROM jobs JOIN spreadsheets USING (spreadsheet_id)" +
+                (' WHERE ' + ' AND '.join(conditions) if conditions else '') +
+                " ORDER BY jobs.spreadsheet_id, jobs.position LIMIT ?"
+            )
+        with self._lock:
+            rows = self._db.execute(sql, params + [limit]).fetchall()
+        return [CatalogEntry(*row) for row in rows]
+
+    def context(self, spreadsheet_id, position) -> Tuple[dict, dict]:
+        """
+        Return the ``(header, job_data)`` contexts of an indexed job.
+
+        They are the values header_context and job_context returned when the
+        sheet was indexed, ready for DocumentGenerator.render_descriptor or
+        TextGenerator.render.
+
+        Raises:
+            KeyError: If the job is not in the catalog
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT spreadsheets.header, jobs.fields FROM jobs JOIN spreadsheets USING (spreadsheet_id) '
+                'WHERE jobs.spreadsheet_id = ? AND jobs.position = ?',
+                (spreadsheet_id, position)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Job {position} of {spreadsheet_id} is not in the catalog")
+        return json.loads(row[0]), json.loads(row[1])
+
+    def generate(self, entries: Sequence[CatalogEntry], output_dir, fmt='docx', generator=None):
+        """
+        Render descriptors straight from the catalog, without reading any sheet.
+
+        Files go to ``output_dir/<spreadsheet_id>/<level>-<title>.<ext>``, with
+        a counter appended to jobs whose names clash (see descriptor_filenames).
+
+        Args:
+            entries: Jobs to render, e.g. the result of search
+            output_dir: Root directory of the generated files
+            fmt: 'docx', or one of the TextGenerator OUTPUT_FORMATS
+            generator: DocumentGenerator (docx) or TextGenerator to render with
+
+        Yields:
+            tuple: ``(entry, output_path, error)`` with ``error`` None on success
+        """
+        if fmt == 'docx':
+            generator = generator or DocumentGenerator()
+            extension = '.docx'
+        else:
+            generator = generator or TextGenerator()
+            extension = OUTPUT_FORMATS[fmt]
+
+        taken = {}
+        for entry in entries:
+            target_dir = os.path.join(output_dir, entry.spreadsheet_id)
+            name = descriptor_filenames([(entry.level, entry.title)], extension,
+                                        taken.setdefault(entry.spreadsheet_id, set()))[0]
+            output_path = os.path.join(target_dir, name)
+            try:
+                header, job_data = self.context(entry.spreadsheet_id, entry.position)
+                os.makedirs(target_dir, exist_ok=True)
+                if fmt == 'docx':
+                    generator.render_descriptor(header, job_data, output_path)
+                else:
+                    generator.render_descriptor(header, job_data, output_path, fmt)
+                yield entry, output_path, None
+            except Exception as e:
+                yield entry, output_path, e
+
+    def _delete(self, spreadsheet_id):
+        self._db.execute(
+            'DELETE FROM jobs_fts WHERE rowid IN (SELECT id FROM jobs WHERE spreadsheet_id = ?)', (spreadsheet_id,)
+        )
+        self._db.execute('DELETE FROM jobs WHERE spreadsheet_id = ?', (spreadsheet_id,))
+        self._db.execute('DELETE FROM spreadsheets WHERE spreadsheet_id = ?', (spreadsheet_id,))
+
+
+def match_query(text):
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    words = [word.replace('"', '') for word in str(text or '').split()]
+    return ' '.join(f'"{word}"*' for word in words if word)
+
+
+def drive_revision(info):
+    """Revision of a spreadsheet from its Drive metadata (see GoogleSheetsReader.file_info)"""
+    return info.get('version') or info.get('modifiedTime')
+
+
+def read_with_revision(reader, access_type, identifier) -> SheetRead:
+    """
+    Read a spreadsheet, fetching its Drive metadata first as refresh does.
+
+    The sheet can then be indexed under ``drive_revision(read.info)`` without
+    reading it a second time. A failed metadata request leaves ``info`` None
+    instead of failing the read: the catalog only speeds up later searches.
+    """
+    key = reader.spreadsheet_key(access_type, identifier)
+    try:
+        info = reader.file_info(key)
+    except Exception as e:
+        logger.warning("Could not fetch the Drive revision of %s: %s", key, e)
+        info = None
+    return SheetRead(reader.read_sheets(access_type, identifier), key, info)
+
+
+def content_revision(dataframes: pd.DataFrame):
+    """Digest of a sheet's content, used as its revision when Drive gives none"""
+    hashes = pd.util.hash_pandas_object(dataframes.astype(str), index=True).values
+    return 'sha256:' + hashlib.sha256(hashes.tobytes()).hexdigest()[:32]
+
+
+def main():
+    """Command line entry point: python -m mi_app.catalog {index,search,generate} ..."""
+    parser = argparse.ArgumentParser(description="Search and generate descriptors from the local job catalog")
+    parser.add_argument("--catalog", default=None, help="Catalog database (defaults to the user cache)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = commands.add_parser("index", help="Index spreadsheets whose revision changed")
+    index_parser.add_argument("--key", action="append", required=True, help="Spreadsheet key (repeatable)")
+    index_parser.add_argument("--credentials", default=None)
+
+    for command in ("search", "generate"):
+        command_parser = commands.add_parser(command)
+        command_parser.add_argument("query", nargs="?", default="")
+        command_parser.add_argument("--level", default=None)
+        command_parser.add_argument("--area", default=None)
+        command_parser.add_argument("--spreadsheet", default=None)
+        command_parser.add_argument("--limit", type=int, default=DEFAULT_SEARCH_LIMIT)
+    commands.choices["generate"].add_argument("--output-dir", required=True)
+    commands.choices["generate"].add_argument("--format", default="docx", choices=["docx", *OUTPUT_FORMATS])
+    args = parser.parse_args()
+
+    catalog = JobCatalog(args.catalog)
+    if args.command == "index":
+        from mi_app.google_sheets import GoogleConnection, GoogleSheetsReader
+
+        reader = GoogleSheetsReader(GoogleConnection(args.credentials))
+        for key in args.key:
+            revision, indexed = catalog.refresh(reader, key)
+            print(f"{key}: indexed revision {revision}" if indexed else f"{key}: revision {revision} already indexed")
+        return
+
+    entries = catalog.search(args.query, level=args.level, area=args.area,
+                             spreadsheet_id=args.spreadsheet, limit=args.limit)
+    if args.command == "search":
+        for entry in entries:
+            print(f"{entry.spreadsheet_name or entry.spreadsheet_id} #{entry.position}: "
+                  f"{entry.level} / {entry.title} ({entry.area}) {entry.snippet}")
+        return
+
+    for entry, output_path, error in catalog.generate(entries, args.output_dir, args.format):
+        print(f"Failed to generate {output_path}: {error}" if error else output_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import os
+import struct
+import threading
+import time
+import zipfile
+import zlib
+
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+
+# The content types part is built with python-docx's own private helper so
+# the output matches doc.save. If a python-docx release drops it, documents
+# are saved the normal way.
+FAST_SAVE_AVAILABLE = True
+try:
+    from docx.opc.pkgwriter import _ContentTypesItem
+except ImportError:
+    FAST_SAVE_AVAILABLE = False
+
+# Same level zipfile uses, so rendered parts compress as they did with doc.save
+DEFLATE_LEVEL = 6
+
+# Limits of a classic ZIP archive. This writer does not produce ZIP64, so a
+# package past them is handed over to zipfile (through doc.save) instead.
+ZIP_MAX_SIZE = 0xFFFFFFFF
+ZIP_MAX_ENTRIES = 0xFFFF
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_OF_CENTRAL_DIR = struct.Struct('<4s4H2LH')
+_UTF8_FLAG = 0x800
+_ZIP_VERSION = 20
+
+
+class TemplatePackage:
+    """Compressed members of a template .docx, read once per template file.
+
+    For every ZIP member the CRC, the uncompressed size and the compressed
+    bytes are kept, so unchanged parts can be written to a new package without
+    inflating or deflating them again.
+    """
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path):
+        self.members = {}
+        with open(path, 'rb') as f, zipfile.ZipFile(f) as package:
+            for info in package.infolist():
+                f.seek(info.header_offset)
+                header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+                name_length, extra_length = header[9], header[10]
+                f.seek(info.header_offset + _LOCAL_HEADER.size + name_length + extra_length)
+                raw = f.read(info.compress_size)
+                self.members[info.filename] = (info.CRC, info.file_size, info.compress_type, raw)
+
+    @classmethod
+    def load(cls, path):
+        """Return the cached package of ``path``, reloading it if the file changed"""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with cls._lock:
+            package = cls._cache.get(key)
+            if package is None:
+                package = cls._cache[key] = cls(path)
+        return package
+
+    def reusable(self, name, blob, crc):
+        """Return ``(compress_type, raw bytes)`` if the template holds ``blob`` as ``name``"""
+        member = self.members.get(name)
+        if member and member[0] == crc and member[1] == len(blob):
+            return member[2], member[3]
+        return None
+
+
+class _Zip64Required(Exception):
+    """The package is too large for a classic ZIP archive"""
+
+
+class _ReusingZipWriter:
+    """Minimal ZIP writer that copies unchanged members from a template package"""
+
+    def __init__(self, pkg_file, template):
+        self._file = open(pkg_file, 'wb') if isinstance(pkg_file, (str, os.PathLike)) else pkg_file
+        self._owns_file = self._file is not pkg_file
+        self._start = self._file.tell()
+        self._template = template
+        self._entries = []
+        self._dos_time, self._dos_date = _dos_timestamp(time.localtime())
+        self.reused = 0
+
+    def write(self, pack_uri, blob):
+        name = pack_uri.membername
+        crc = zlib.crc32(blob)
+        reusable = self._template.reusable(name, blob, crc)
+        if reusable:
+            method, data = reusable
+            self.reused += 1
+        else:
+            compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+            method, data = zipfile.ZIP_DEFLATED, compressor.compress(blob) + compressor.flush()
+
+        name_bytes = name.encode('utf-8')
+        flags = 0 if name_bytes.isascii() else _UTF8_FLAG
+        offset = self._file.tell()
+        if max(len(blob), len(data), offset) > ZIP_MAX_SIZE or len(self._entries) >= ZIP_MAX_ENTRIES:
+            raise _Zip64Required(name)
+        self._file.write(_LOCAL_HEADER.pack(
+            b'PK\x03\x04', _ZIP_VERSION, flags, method, self._dos_time, self._dos_date,
+            crc, len(data), len(blob), len(name_bytes), 0
+        ))
+        self._file.write(name_bytes)
+        self._file.write(data)
+        self._entries.append((name_bytes, flags, method, crc, len(data), len(blob), offset))
+
+    def close(self):
+        directory_offset = self._file.tell()
+        if directory_offset > ZIP_MAX_SIZE:
+            raise _Zip64Required(CONTENT_TYPES_URI)
+        for name_bytes, flags, method, crc, compressed_size, size, offset in self._entries:
+            self._file.write(_CENTRAL_HEADER.pack(
+                b'PK\x01\x02', _ZIP_VERSION, _ZIP_VERSION, flags, method, self._dos_time, self._dos_date,
+                crc, compressed_size, size, len(name_bytes), 0, 0, 0, 0, 0, offset
+            ))
+            self._file.write(name_bytes)
+        directory_size = self._file.tell() - directory_offset
+        self._file.write(_END_OF_CENTRAL_DIR.pack(
+            b'PK\x05\x06', 0, 0, len(self._entries), len(self._entries),
+            directory_size, directory_offset, 0
+        ))
+        if self._owns_file:
+            self._file.close()
+
+    def discard(self):
+        """Drop everything written so far, so no truncated package is left behind"""
+        if self._owns_file:
+            self._file.close()
+            os.remove(self._file.name)
+        else:
+            self._file.seek(self._start)
+            self._file.truncate()
+
+
+def save_document(doc, output_path, template_path):
+    """Save a rendered DocxTemplate, reusing the template's unchanged parts.
+
+    Styles, theme, fonts, media and any other part that rendering did not
+    change are copied byte-for-byte from the template's compressed data.
+    Only the rendered parts (document, headers, footers, relationships) are
+    compressed again. The result matches ``doc.save(output_path)``.
+
+    Packages that would need ZIP64 (members or offsets past 4 GiB, more
+    than 65535 members) are written by python-docx instead, as is everything
+    when its content types helper is unavailable.
+
+    Args:
+        doc: Rendered DocxTemplate
+        output_path: Path (or binary file object) to write the document to
+        template_path: Path of the .docx the document was loaded from
+
+    Returns:
+        int: Number of parts copied without recompression
+    """
+    if not FAST_SAVE_AVAILABLE:
+        doc.save(output_path)
+        return 0
+
+    doc.pre_processing()
+    package = doc.docx.part.package
+    parts = list(package.parts)
+    for part in parts:
+        part.before_marshal()
+
+    writer = _ReusingZipWriter(output_path, TemplatePackage.load(template_path))
+    try:
+        # Same layout as docx.opc.pkgwriter.PackageWriter.write
+        writer.write(CONTENT_TYPES_URI, _ContentTypesItem.from_parts(parts).blob)
+        writer.write(PACKAGE_URI.rels_uri, package.rels.xml)
+        for part in parts:
+            writer.write(part.partname, part.blob)
+            if len(part.rels):
+                writer.write(part.partname.rels_uri, part.rels.xml)
+        writer.close()
+    except _Zip64Required:
+        writer.discard()
+        doc.docx.save(output_path)
+        writer.reused = 0
+    except BaseException:
+        writer.discard()
+        raise
+
+    doc.post_processing(output_path)
+    doc.is_saved = True
+    return writer.reused
+
+
+def _dos_timestamp(local_time):
+    """Return the (time, date) pair of a struct_time in MS-DOS format"""
+    dos_time = (local_time.tm_hour << 11) | (local_time.tm_min << 5) | (local_time.tm_sec // 2)
+    dos_date = ((local_time.tm_year - 1980) << 9) | (local_time.tm_mon << 5) | local_time.tm_mday
+    return dos_time, dos_date
@@ -1,11 +1,77 @@
+import logging
 import os
-from typing import Optional, Dict, Tuple
+import weakref
+from typing import Optional, Dict, List, Sequence, Tuple
 
 import pandas as pd
-from docxtpl import DocxTemplate
+from docx.shared import Mm
+from docxtpl import DocxTemplate, InlineImage
 
+from mi_app.docx_fastsave import save_document
+from mi_app.image_cache import ImageCache, is_image_link
+from mi_app.manual_template import get_manual_template
 from mi_app.utils import get_default_template_path, clean_data
 
+logger = logging.getLogger(__name__)
+
+# Cell positions (row, column) of the cover page fields in the raw sheet
+EXECUTIVE_SUMMARY_FIELDS = {
+    'author': (5, 42),
+    'review': (6, 42),
+    'release': (7, 42),
+    'version': (3, 42),
+    'date': (9, 42),
+    'state': (8, 42)
+}
+
+# Cell positions (row, column) of the page header fields in the raw sheet
+PAGE_HEADER_FIELDS = {
+    'code': (2, 42),
+    'f_emission': (4, 42)
+}
+
+HEADER_FIELDS = {**EXECUTIVE_SUMMARY_FIELDS, **PAGE_HEADER_FIELDS}
+
+# Template placeholders of the job table columns, in column order
+JOB_FIELDS = (
+    'n_jerarquico',               # Hierarchical level
+    'puesto',                     # Job title
+    'a_trabajo',                  # Work area
+    'p_participa',                # Processes
+    'is_supervisado',             # Supervised by
+    'supervisa_to',               # Supervises
+    'replace_to',                 # Replaces
+    'is_replace',                 # Is replaced by
+    'objective_position',         # Job objective
+    'responsibilities',           # Responsibilities
+    'specific_responsibilities',  # Specific functions
+    'sgi_specific',               # SGI functions
+    'specific_functions',         # RASCI matrix
+    'educations',                 # Education
+    'work_experience',            # Work experience
+    'proactivity',                # Proactivity
+    'oral_expression',            # Oral expression
+    'teamwork',                   # Teamwork
+    'digital_tools',              # Digital tools
+    't_quality_control',          # Quality control
+    'num_geom_skills',            # Numerical skills
+    'project_management',         # Project management
+    'troubleshooting',            # Troubleshooting
+    'change_management',          # Change management
+    'innovation_creativity',      # Innovation
+    'business_skills',            # Business skills
+    'textile_techniques',         # Textile techniques
+    'organigram',                 # Organigram image link (optional column)
+)
+
+# Job fields holding an image link that is embedded as a picture
+IMAGE_FIELDS = ('organigram',)
+
+# Rendered width of the organigram in the document and the pixel width the
+# downloaded image is scaled to (about 150 dpi at that size)
+ORGANIGRAM_WIDTH_MM = 160
+ORGANIGRAM_WIDTH_PX = 945
+
 
 class DocumentGenerator:
     """Generates documents from templates using data from Google Sheets.
@@ -25,6 +91,11 @@ class DocumentGenerator:
         self.default_template_path = get_default_template_path()
         #Todo desactivar la funcionalidad de tomar un templete path
         self.template_path = self.default_template_path
+        self.image_cache = None
+
+        # (weakref to the last sheet, its job table), reused while that snapshot
+        # is alive. Replaced in one assignment so threads never see a mixed pair.
+        self._job_table_memo = None
 
     def set_template(self, template_path: str) -> bool:
         """Set a custom template for document generation.
@@ -51,7 +122,7 @@ class DocumentGenerator:
             job_title: str,
             level_hierarchy: str,
             title: Optional[str] = None,
-
+            job_position: Optional[int] = None,
     ) -> None:
         """Generate a Word document from template using dataframe data.
 
@@ -63,48 +134,204 @@ class DocumentGenerator:
             title: Optional document title
             job_title: Optional job title to filter data
             level_hierarchy: Optional level hierarchy to filter data
+            job_position: Row position of the job in the job table (see
+                job_options). When given, the job is read directly from that
+                row and job_title/level_hierarchy are not searched for.
+
+        Raises:
+            ValueError: If template loading fails
+        """
+        # Define field position mappings
+        field_position_mapping = HEADER_FIELDS
+        print(f"Field position mapping: {field_position_mapping}")
+        ##### clean_data devuelve lo correcto
+        context = clean_data(field_position_mapping, dataframes)
+
+        data_to_generate_pdf = None
+        if job_position is not None:
+            data_to_generate_pdf = self.job_context(self.job_table(dataframes), job_position)
+        # Only process job-specific data if both job_title and level_hierarchy are provided
+        # Check if job_title and level_hierarchy are strings and not empty
+        elif isinstance(job_title, str) and job_title.strip() and isinstance(level_hierarchy, str) and level_hierarchy.strip():
+            # Process data and generate document
+            df_data_general = self.job_table(dataframes)
+            data_to_generate_pdf = self._process_general_data(df_data_general, job_title, level_hierarchy)
+
+        self.render_descriptor(context, data_to_generate_pdf, output_path)
+
+    def header_context(self, dataframes: pd.DataFrame) -> dict:
+        """Return the cover and page header fields of a sheet.
+
+        Args:
+            dataframes: Input dataframe containing raw data
+
+        Returns:
+            dict: Header values keyed by template placeholder
+        """
+        return clean_data(HEADER_FIELDS, dataframes)
+
+    def job_context(self, jobs: pd.DataFrame, position: int) -> dict:
+        """Return the job fields of one row of the job table.
+
+        Fields past the end of the sheet, such as the organigram column of
+        sheets made before it was added, are returned empty.
+
+        Args:
+            jobs: Job table as returned by job_table
+            position: Row position in the job table
+
+        Returns:
+            dict: Job values keyed by template placeholder
+        """
+        row = jobs.iloc[position]
+        return {
+            field: '' if index >= len(row) or pd.isna(row.iloc[index]) else row.iloc[index]
+            for index, field in enumerate(JOB_FIELDS)
+        }
+
+    def render_descriptor(self, header: dict, job_data: Optional[dict], output_path: str) -> None:
+        """Render one descriptor from ready-made header and job contexts and save it.
+
+        Args:
+            header: Header values, see header_context
+            job_data: Job values, see job_context. None renders the cover only.
+            output_path: File path to save the generated document
 
         Raises:
             ValueError: If template loading fails
         """
         try:
             doc = DocxTemplate(self.template_path)
-            print(f'este es el path del templete: {self.template_path}')
         except Exception as e:
             raise ValueError(f"Failed to load template: {str(e)}")
 
-        # Define field position mappings
-        executive_summary = {
-            'author': (5, 42),
-            'review': (6, 42),
-            'release': (7, 42),
-            'version': (3, 42),
-            'date': (9, 42),
-            'state': (8, 42)
-        }
+        context = dict(header)
+        if job_data:
+            # Add the job-specific data to the document context
+            context.update(self._embed_images(doc, dict(job_data)))
 
-        page_header = {
-            'code': (2, 42),
-            'f_emission': (4, 42)
-        }
+        # Render once: a second render would find every placeholder already replaced
+        doc.render(context)
+        # Unchanged template parts are copied as-is instead of being recompressed
+        save_document(doc, output_path, self.template_path)
 
-        field_position_mapping = {**executive_summary, **page_header}
-        print(f"Field position mapping: {field_position_mapping}")
-        ##### clean_data devuelve lo correcto
-        doc.render(clean_data(field_position_mapping, dataframes))
+    def generate_manual(self, dataframes: pd.DataFrame, positions: Sequence[int], output_path: str) -> None:
+        """Generate one consolidated job manual with a section per selected job.
 
-        # Process data and generate document
-        df_data_general = self._process_data(dataframes)
-        print(f"Data to generate PDF para procesar el resto del dato: {df_data_general}")
+        The cover and header fields are rendered once, and the job sections
+        come from a single loop in the manual variant of the template, so the
+        template is loaded and rendered only once for the whole manual.
 
-        # Only process job-specific data if both job_title and level_hierarchy are provided
-        # Check if job_title and level_hierarchy are strings and not empty
-        if isinstance(job_title, str) and job_title.strip() and isinstance(level_hierarchy, str) and level_hierarchy.strip():
-            data_to_generate_pdf = self._process_general_data(df_data_general, job_title, level_hierarchy)
-            # Add the job-specific data to the document context
-            doc.render(data_to_generate_pdf)
+        Args:
+            dataframes: DataFrame containing input data with specific columns/rows
+            positions: Row positions in the job table, in manual order
+            output_path: File path to save the generated manual
+
+        Raises:
+            ValueError: If template loading fails
+        """
+        template_path = get_manual_template(self.template_path, HEADER_FIELDS)
+        try:
+            doc = DocxTemplate(template_path)
+        except Exception as e:
+            raise ValueError(f"Failed to load template: {str(e)}")
+
+        jobs = self.job_table(dataframes)
+        context = self.header_context(dataframes)
+        context['jobs'] = [self._embed_images(doc, self.job_context(jobs, position)) for position in positions]
+
+        doc.render(context)
+        save_document(doc, output_path, template_path)
+
+    def _embed_images(self, doc: DocxTemplate, template_data: dict) -> dict:
+        """Replace the image links of the job data with embedded pictures.
+
+        Images go through the on-disk image cache, so an organigram shared by
+        many positions is downloaded and scaled only once. A link that cannot
+        be downloaded is left in the document as text.
+
+        Args:
+            doc: Template the images are embedded in
+            template_data: Job data with keys matching template placeholders
+
+        Returns:
+            dict: The job data with image links replaced by InlineImage objects
+        """
+        for field in IMAGE_FIELDS:
+            link = template_data.get(field)
+            if not is_image_link(link):
+                continue
+            if self.image_cache is None:
+                self.image_cache = ImageCache()
+            try:
+                image_path = self.image_cache.resized(link, ORGANIGRAM_WIDTH_PX)
+                template_data[field] = InlineImage(doc, image_path, width=Mm(ORGANIGRAM_WIDTH_MM))
+            except Exception as e:
+                logger.warning("Could not embed image for '%s' from %s: %s", field, link, e)
+        return template_data
+
+    def list_jobs(self, dataframes: pd.DataFrame) -> List[Tuple[str, str]]:
+        """List the (level hierarchy, job title) pairs available in a sheet.
 
-        doc.save(output_path)
+        Args:
+            dataframes: Input dataframe containing raw data
+
+        Returns:
+            List[Tuple[str, str]]: One pair per row of the job table
+        """
+        jobs = self.job_table(dataframes)
+        return list(zip(jobs['n_jerarquico'].astype(str), jobs['puesto'].astype(str)))
+
+    def job_options(self, dataframes: pd.DataFrame) -> Dict[Tuple[str, str], int]:
+        """Map each (level hierarchy, job title) of a sheet to its row in the job table.
+
+        Labels are stripped and rows without a level or a title are left out.
+        A repeated pair keeps every row: the second and later occurrences get
+        their number appended to the title, e.g. 'Operario (2)', so each row
+        can still be selected (preflight reports the duplicates).
+
+        Args:
+            dataframes: Input dataframe containing raw data
+
+        Returns:
+            Dict[Tuple[str, str], int]: Row position keyed by (level, title), in sheet order
+        """
+        jobs = self.job_table(dataframes)
+        levels = jobs['n_jerarquico'].fillna('').astype(str).str.strip()
+        titles = jobs['puesto'].fillna('').astype(str).str.strip()
+        options = {}
+        occurrences = {}
+        for position, key in enumerate(zip(levels, titles)):
+            if not all(key):
+                continue
+            level, title = key
+            while key in options:
+                occurrences[(level, title)] = occurrences.get((level, title), 1) + 1
+                key = (level, f"{title} ({occurrences[(level, title)]})")
+            options[key] = position
+        return options
+
+    def job_table(self, dataframes: pd.DataFrame) -> pd.DataFrame:
+        """Return the job table of a sheet with columns named after JOB_FIELDS.
+
+        The table is cached for the loaded snapshot (the same DataFrame
+        object), so generating many documents from one sheet processes it
+        once. Loaded sheets and the returned table are treated as read-only.
+
+        Args:
+            dataframes: Input dataframe containing raw data
+
+        Returns:
+            pd.DataFrame: One row per job, one column per template placeholder
+        """
+        memo = self._job_table_memo
+        if memo is not None and memo[0]() is dataframes:
+            return memo[1]
+
+        jobs = self._process_data(dataframes)
+        jobs = jobs.rename(columns=dict(zip(jobs.columns, JOB_FIELDS)))
+        self._job_table_memo = (weakref.ref(dataframes), jobs)
+        return jobs
 
     def _process_data(self, dataframes: pd.DataFrame) -> pd.DataFrame:
         """Process and combine dataframe sections.
@@ -125,10 +352,11 @@ class DocumentGenerator:
         another_data = dataframes.iloc[11:, 4:]
 
         if base_filter.shape[0] == another_data.shape[0]:
-            return pd.DataFrame({
-                **base_filter.reset_index(drop=True).to_dict('list'),
-                **another_data.reset_index(drop=True).to_dict('list')
-            })
+            # Positional column concatenation, without a round-trip through dicts
+            return pd.concat(
+                [base_filter.reset_index(drop=True), another_data.reset_index(drop=True)],
+                axis=1
+            )
 
         raise ValueError("DataFrames have mismatched lengths after processing")
 
@@ -196,33 +424,8 @@ class DocumentGenerator:
         # Map the row values to template placeholders
         # Based on the template structure and the datasheet columns
         template_data = {
-            'puesto': row.iloc[1] if len(row) > 1 else '',  # Job title
-            'n_jerarquico': row.iloc[0] if len(row) > 0 else '',  # Hierarchical level
-            'a_trabajo': row.iloc[2] if len(row) > 2 else '',  # Work area
-            'p_participa': row.iloc[3] if len(row) > 3 else '',  # Processes
-            'is_supervisado': row.iloc[4] if len(row) > 4 else '',  # Supervised by
-            'supervisa_to': row.iloc[5] if len(row) > 5 else '',  # Supervises
-            'replace_to': row.iloc[6] if len(row) > 6 else '',  # Replaces
-            'is_replace': row.iloc[7] if len(row) > 7 else '',  # Is replaced by
-            'objective_position': row.iloc[8] if len(row) > 8 else '',  # Job objective
-            'responsibilities': row.iloc[9] if len(row) > 9 else '',  # Responsibilities
-            'specific_responsibilities': row.iloc[10] if len(row) > 10 else '',  # Specific functions
-            'sgi_specific': row.iloc[11] if len(row) > 11 else '',  # SGI functions
-            'specific_functions': row.iloc[12] if len(row) > 12 else '',  # RASCI matrix
-            'educations': row.iloc[13] if len(row) > 13 else '',  # Education
-            'work_experience': row.iloc[14] if len(row) > 14 else '',  # Work experience
-            'proactivity': row.iloc[15] if len(row) > 15 else '',  # Proactivity
-            'oral_expression': row.iloc[16] if len(row) > 16 else '',  # Oral expression
-            'teamwork': row.iloc[17] if len(row) > 17 else '',  # Teamwork
-            'digital_tools': row.iloc[18] if len(row) > 18 else '',  # Digital tools
-            't_quality_control': row.iloc[19] if len(row) > 19 else '',  # Quality control
-            'num_geom_skills': row.iloc[20] if len(row) > 20 else '',  # Numerical skills
-            'project_management': row.iloc[21] if len(row) > 21 else '',  # Project management
-            'troubleshooting': row.iloc[22] if len(row) > 22 else '',  # Troubleshooting
-            'change_management': row.iloc[23] if len(row) > 23 else '',  # Change management
-            'innovation_creativity': row.iloc[24] if len(row) > 24 else '',  # Innovation
-            'business_skills': row.iloc[25] if len(row) > 25 else '',  # Business skills
-            'textile_techniques': row.iloc[26] if len(row) > 26 else ''  # Textile techniques
+            field: row.iloc[position] if len(row) > position else ''
+            for position, field in enumerate(JOB_FIELDS)
         }
 
         return template_data
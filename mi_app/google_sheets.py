@@ -1,23 +1,184 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import gspread
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2 import service_account
 import pandas as pd
 import json
 import os
-from gspread.utils import GridRangeType
-from mi_app.utils import validate_json_file, get_credentials_path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from itertools import islice, zip_longest
+from urllib.parse import quote, urlsplit, urlunsplit
+from gspread.utils import GridRangeType, extract_id_from_url
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError
+import numpy as np
+from mi_app.scheduler import RequestScheduler, DEFAULT_REQUESTS_PER_MINUTE, RETRYABLE_STATUS_CODES
+from mi_app.utils import validate_json_file, get_credentials_path, get_scoped_cache_path, atomic_path
+
+# Sheets REST endpoints used by the chunked read: the grid size of the sheets,
+# then one values request per band of rows
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets/{spreadsheet_id}"
+SHEETS_VALUES_URL = SHEETS_API_URL + "/values/{range}"
+SHEETS_GRID_FIELDS = "sheets.properties(title,gridProperties(rowCount,columnCount))"
+
+# Rows fetched per request by the chunked read, and how many of those requests
+# are in flight at once; memory is bounded by the bands in flight
+CHUNK_ROWS = 2000
+BANDS_IN_FLIGHT = 4
+
+# REST endpoint used for Google Docs reads. It is called directly on the shared
+# session, so no discovery document has to be fetched or parsed per read.
+DOCS_API_URL = "https://docs.googleapis.com/v1/documents/{document_id}"
+
+# Drive export of a Google Doc, converted server-side to one of EXPORT_FORMATS
+DRIVE_EXPORT_URL = "https://www.googleapis.com/drive/v3/files/{file_id}/export"
+
+# Drive metadata of a file; version changes on every edit of the spreadsheet
+DRIVE_FILE_URL = "https://www.googleapis.com/drive/v3/files/{file_id}"
+DRIVE_FILE_FIELDS = "id,name,version,modifiedTime"
+
+EXPORT_FORMATS = {
+    "text": "text/plain",
+    "markdown": "text/markdown",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# Nested table levels whose text is requested from the Docs API. Documents
+# with deeper tables are detected and fetched again without a field mask.
+DOCS_TABLE_DEPTH = 3
+
+
+def _docs_content_mask(depth):
+    """Field mask selecting the text runs of a structural content list"""
+    text = "paragraph(elements(textRun(content)))"
+    # Only the presence of a table of contents is reported, not its text
+    mask = f"{text},tableOfContents(content(startIndex))"
+    if depth > 0:
+        mask += f",table(tableRows(tableCells(content({_docs_content_mask(depth - 1)}))))"
+    else:
+        # Tables past the depth limit are only flagged, see _exceeds_table_depth
+        mask += ",table(rows)"
+    return mask
+
+
+def _exceeds_table_depth(content, depth=DOCS_TABLE_DEPTH):
+    """True when a masked content list holds tables nested deeper than ``depth``"""
+    for element in content:
+        if 'table' not in element:
+            continue
+        if depth == 0:
+            return True
+        for table_row in element['table'].get('tableRows', []):
+            for cell in table_row.get('tableCells', []):
+                if _exceeds_table_depth(cell.get('content', []), depth - 1):
+                    return True
+    return False
+
+
+# Partial response mask limited to what _extract_text_from_doc_content walks:
+# paragraph text runs, table cells and the position of tables of contents.
+# Styles, lists, inline objects and named ranges are left out of the response.
+DOCS_FIELDS = f"body(content({_docs_content_mask(DOCS_TABLE_DEPTH)}))"
+
+# Keep-alive pool size of the shared transport; sized for concurrent readers.
+HTTP_POOL_SIZE = 16
+
+# Spreadsheets fetched at the same time by read_many; kept below HTTP_POOL_SIZE
+# so every worker gets a pooled connection.
+FANOUT_WORKERS = 8
+
+# Google APIs only gzip responses when the user agent mentions it
+USER_AGENT = "mi_app (gzip)"
+
+# How long a spreadsheet name keeps resolving to the key found by the last search
+KEY_CACHE_TTL = 24 * 60 * 60
+
+
+class EndpointOverrideAdapter(HTTPAdapter):
+    """
+    Transport adapter that sends every Google API request to another host.
+
+    Only the scheme and host are replaced; the API paths of Sheets, Drive and
+    Docs do not overlap, so a single local server can stand in for all of them
+    (see benchmarks/fake_google_api.py).
+    """
+
+    def __init__(self, api_endpoint, **kwargs):
+        super().__init__(**kwargs)
+        endpoint = urlsplit(api_endpoint)
+        self._scheme, self._netloc = endpoint.scheme, endpoint.netloc
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        request.url = urlunsplit((self._scheme, self._netloc, url.path, url.query, url.fragment))
+        return super().send(request, **kwargs)
+
+
+class _RetryableResponse(Exception):
+    """A quota or server error response, raised so the scheduler retries the request"""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code} for {response.url}")
+        self.response = response
+
+
+class ScheduledSession(AuthorizedSession):
+    """
+    Authorized session that sends every HTTP request through the request scheduler.
+
+    gspread issues several requests per call (spreadsheet metadata, worksheet
+    metadata, values), so the quota is counted here, one token per request,
+    and each request is retried on its own on 429 and 5xx. When the retries
+    are exhausted the last error response is returned, for the caller to
+    raise as it would without the scheduler.
+    """
+
+    def __init__(self, credentials, scheduler, **kwargs):
+        super().__init__(credentials, **kwargs)
+        self.scheduler = scheduler
+
+    def request(self, method, url, *args, **kwargs):
+        def send():
+            response = super(ScheduledSession, self).request(method, url, *args, **kwargs)
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                raise _RetryableResponse(response)
+            return response
+
+        try:
+            return self.scheduler.call(send)
+        except _RetryableResponse as e:
+            return e.response
 
 
 class GoogleConnection:
     """Class for handling Google API connections and credential validation"""
 
-    def __init__(self, credentials_path=None):
+    def __init__(self, credentials_path=None, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 credentials=None, api_endpoint=None):
+        """
+        Args:
+            credentials_path: Service account JSON file
+            requests_per_minute: Request quota shared by every reader
+            credentials: google.auth credentials to use instead of the file,
+                e.g. AnonymousCredentials against a local stand-in server
+            api_endpoint: Base URL (e.g. "http://127.0.0.1:8080") that every
+                Google API request is sent to instead of Google
+        """
         self.credentials_path = credentials_path if credentials_path else get_credentials_path()
+        self.credentials = credentials
+        self.api_endpoint = api_endpoint
         self.client = None
+        self.session = None
+        # Shared by every reader built on this connection so they draw from one quota
+        self.scheduler = RequestScheduler(requests_per_minute)
         self.scope = [
             "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive"
+            "https://www.googleapis.com/auth/drive",
+            "https://www.googleapis.com/auth/documents.readonly"
         ]
 
     def select_credentials(self):
@@ -33,21 +194,19 @@ class GoogleConnection:
 
     def validate_credentials(self):
         """Validate the selected credentials file"""
-        if not self.credentials_path:
+        if not self.credentials and not self.credentials_path:
             return False, "No credentials file selected"
 
         try:
-            # Check if it has the required fields for a service account
-            required_fields = ['client_email', 'private_key', 'project_id']
-            is_valid, message = validate_json_file(self.credentials_path, required_fields)
-            if not is_valid:
-                return False, message
+            if not self.credentials:
+                # Check if it has the required fields for a service account
+                required_fields = ['client_email', 'private_key', 'project_id']
+                is_valid, message = validate_json_file(self.credentials_path, required_fields)
+                if not is_valid:
+                    return False, message
 
             # Try to connect to Google API using the newer google-auth library
-            creds = service_account.Credentials.from_service_account_file(
-                self.credentials_path, scopes=self.scope
-            )
-            self.client = gspread.authorize(creds)
+            self._authorize()
 
             # Test connection by trying to list all spreadsheets in the drive
             self.client.list_spreadsheet_files()
@@ -127,14 +286,132 @@ class GoogleConnection:
         """Connect to Google API using validated credentials"""
         if not self.client:
             try:
-                creds = service_account.Credentials.from_service_account_file(
-                    self.credentials_path, scopes=self.scope
-                )
-                self.client = gspread.authorize(creds)
+                self._authorize()
             except Exception as e:
                 raise ConnectionError(f"Failed to connect: {str(e)}")
         return self.client
 
+    def get_session(self):
+        """Return the shared authorized HTTP session, connecting if needed"""
+        if not self.session:
+            self.connect()
+        return self.session
+
+    def get_json(self, url, params=None):
+        """GET a Google API resource on the shared session, within the quota"""
+        return self._get(url, params).json()
+
+    def get_bytes(self, url, params=None):
+        """GET a raw Google API download (e.g. a Drive export), within the quota"""
+        return self._get(url, params).content
+
+    def _get(self, url, params=None):
+        # The session takes the quota token and retries throttled requests
+        response = self.get_session().get(url, params=params)
+        response.raise_for_status()
+        return response
+
+    def account_scope(self):
+        """
+        Identify whose Drive this connection sees: the account and the API endpoint.
+
+        Caches of Drive lookups are kept per scope, so switching credentials
+        or pointing at a stand-in server never reuses another account's results.
+        """
+        account = None
+        if self.credentials is not None:
+            account = getattr(self.credentials, 'service_account_email', None) or type(self.credentials).__name__
+        elif self.credentials_path and os.path.exists(self.credentials_path):
+            try:
+                with open(self.credentials_path, 'r') as f:
+                    account = json.load(f).get('client_email')
+            except (OSError, json.JSONDecodeError):
+                pass
+        return f"{account or 'unknown'} {self.api_endpoint or 'https://www.googleapis.com'}"
+
+    def _authorize(self):
+        """Build the shared transport and the gspread client that runs on it"""
+        creds = self.credentials or service_account.Credentials.from_service_account_file(
+            self.credentials_path, scopes=self.scope
+        )
+        self.session = self._build_session(creds, self.scheduler, self.api_endpoint)
+        self.client = gspread.authorize(None, session=self.session)
+
+    @staticmethod
+    def _build_session(creds, scheduler, api_endpoint=None):
+        """
+        Create an authorized session with a keep-alive connection pool.
+
+        Every reader issues its requests through this session, so TLS handshakes
+        and token refreshes are paid once per connection instead of once per call,
+        and every request, gspread's included, draws from the scheduler's quota.
+        With ``api_endpoint`` the requests go to that server instead of Google.
+        """
+        session = ScheduledSession(creds, scheduler)
+        if api_endpoint:
+            adapter = EndpointOverrideAdapter(
+                api_endpoint, pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+            )
+        else:
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "Accept-Encoding": "gzip",
+            "User-Agent": USER_AGENT,
+        })
+        return session
+
+
+class SpreadsheetKeyCache:
+    """
+    Persistent spreadsheet name -> key map, so opening by name skips the Drive search.
+
+    Entries expire after ``ttl`` seconds, which bounds how long a name keeps
+    pointing at a spreadsheet that was renamed while another one took its
+    name. Entries whose spreadsheet can no longer be opened are invalidated
+    by the reader.
+
+    Names only mean something for one account on one API endpoint, so each
+    ``scope`` (see GoogleConnection.account_scope) gets its own cache file.
+    """
+
+    def __init__(self, path=None, ttl=KEY_CACHE_TTL, scope=''):
+        self.path = path or get_scoped_cache_path('spreadsheet_keys', scope)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def get(self, name):
+        """Return the cached key of ``name``, or None when unknown or expired"""
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry and time.time() - entry['resolved_at'] < self.ttl:
+            return entry['key']
+        return None
+
+    def put(self, name, key):
+        with self._lock:
+            self._entries[name] = {'key': key, 'resolved_at': time.time()}
+            self._save()
+
+    def invalidate(self, name):
+        with self._lock:
+            if self._entries.pop(name, None) is not None:
+                self._save()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        with atomic_path(self.path) as tmp_path, open(tmp_path, 'w') as f:
+            json.dump(self._entries, f)
+
 
 class GoogleSheetsReader:
     """
@@ -145,16 +422,30 @@ class GoogleSheetsReader:
     by name, key, or URL.
     """
 
-    def __init__(self, google_connection):
+    def __init__(self, google_connection, key_cache=None):
         """
         Initializes a class instance by setting up the Google connection and preparing
         the client attribute for later assignment.
 
         :param google_connection: A connection instance to interact with Google services.
         :type google_connection: GoogleConnection
+        :param key_cache: Name -> key resolutions shared across runs. Defaults to
+            the cache file of the connection's account and endpoint in the
+            user cache directory, opened on first use.
+        :type key_cache: SpreadsheetKeyCache
         """
         self.connection = google_connection
         self.client = None
+        self._key_cache = key_cache
+        self._key_cache_lock = threading.Lock()
+
+    @property
+    def key_cache(self):
+        """Name -> key cache scoped to the connection's account and endpoint"""
+        with self._key_cache_lock:
+            if self._key_cache is None:
+                self._key_cache = SpreadsheetKeyCache(scope=self.connection.account_scope())
+            return self._key_cache
 
     def connect(self):
         """
@@ -189,13 +480,308 @@ class GoogleSheetsReader:
         client = self.connect()
 
         if access_type == "name":
-            spreadsheet = client.open(identifier)
+            spreadsheet = self._open_by_name(identifier)
         elif access_type == "key":
-            spreadsheet = client.open_by_key(identifier)
+            spreadsheet = client.open_by_key(identifier.strip())
         elif access_type == "url":
-            spreadsheet = client.open_by_url(identifier)
+            # The key is part of the URL; no request is needed to find it
+            spreadsheet = client.open_by_key(extract_id_from_url(identifier))
         else:
             raise ValueError("Invalid access type")
         spreadsheet_data = spreadsheet.sheet1.get(return_type=GridRangeType.ListOfLists)
         df = pd.DataFrame(spreadsheet_data)
-        return df
\ No newline at end of file
+        return df
+
+    def read_sheet_chunks(self, access_type, identifier, chunk_rows=CHUNK_ROWS):
+        """
+        Reads the first worksheet in bands of rows and yields each band as a DataFrame.
+
+        One small metadata request gives the sheet title and grid size, then
+        every band is a values request for an A1 row range. Up to
+        BANDS_IN_FLIGHT bands are requested ahead of the one the caller works
+        on and are yielded in sheet order, so processing starts with the first
+        band and overlaps the remaining downloads, and no response or frame
+        larger than one band is ever built.
+
+        Chunks are indexed by their 0-based row in the sheet and have one
+        column per grid column, missing cells as None, so ``pd.concat`` of
+        the chunks holds the values of read_sheets, plus any trailing empty
+        grid columns. Runs of empty rows are attached to the next chunk that
+        has data; trailing empty rows are dropped, as read_sheets drops them.
+
+        :param access_type: "name", "key" or "url", as for read_sheets.
+        :param identifier: The spreadsheet name, key or URL.
+        :param chunk_rows: Number of rows requested per band.
+        :return: Generator of pandas DataFrames.
+        """
+        _, column_count, bands = self._read_bands(access_type, identifier, chunk_rows)
+        columns = pd.RangeIndex(column_count)
+        for start, rows in bands:
+            padded = [row + [None] * (column_count - len(row)) for row in rows]
+            yield pd.DataFrame(padded, index=pd.RangeIndex(start, start + len(rows)), columns=columns)
+
+    def read_sheets_chunked(self, access_type, identifier, chunk_rows=CHUNK_ROWS, on_chunk=None):
+        """
+        Reads the first worksheet band by band into preallocated columns.
+
+        Returns the same DataFrame as read_sheets. The grid size is known
+        before the first band arrives, so one object array per column is
+        allocated up front and each band is copied into it and released. Peak
+        memory is the columns plus one band, instead of the whole response,
+        its list of lists and the frame built from it at the same time.
+
+        :param access_type: "name", "key" or "url", as for read_sheets.
+        :param identifier: The spreadsheet name, key or URL.
+        :param chunk_rows: Number of rows requested per band.
+        :param on_chunk: Called with ``(rows_read, row_count)`` after each band,
+            e.g. to show progress while the next band downloads.
+        :return: A pandas DataFrame containing the data from the spreadsheet.
+        """
+        row_count, column_count, bands = self._read_bands(access_type, identifier, chunk_rows)
+        buffer = [np.full(row_count, None, dtype=object) for _ in range(column_count)]
+        used_rows = used_columns = 0
+        for start, rows in bands:
+            for column, values in zip(buffer, zip_longest(*rows)):
+                column[start:start + len(rows)] = values
+            used_rows = start + len(rows)
+            used_columns = max(used_columns, max(len(row) for row in rows))
+            if on_chunk:
+                on_chunk(used_rows, row_count)
+        return pd.DataFrame({index: column[:used_rows] for index, column in enumerate(buffer[:used_columns])})
+
+    def _read_bands(self, access_type, identifier, chunk_rows):
+        """
+        Start a banded read of the first worksheet.
+
+        :return: ``(row_count, column_count, bands)`` where the counts are the
+            grid size and ``bands`` yields ``(start_row, rows)`` for every run
+            of rows that holds data.
+        """
+        key = self.spreadsheet_key(access_type, identifier)
+        try:
+            title, row_count, column_count = self._first_sheet_grid(key)
+        except HTTPError as e:
+            if access_type != "name" or e.response is None or e.response.status_code not in (403, 404):
+                raise
+            # Deleted or unshared since the name was cached: search for it again
+            self.key_cache.invalidate(identifier)
+            key = self.spreadsheet_key(access_type, identifier)
+            title, row_count, column_count = self._first_sheet_grid(key)
+
+        sheet = "'" + title.replace("'", "''") + "'"
+        last_column = gspread.utils.rowcol_to_a1(1, max(column_count, 1)).rstrip("0123456789")
+
+        def fetch(start):
+            end = min(start + chunk_rows, row_count)
+            a1 = f"{sheet}!A{start + 1}:{last_column}{end}"
+            url = SHEETS_VALUES_URL.format(spreadsheet_id=key, range=quote(a1, safe=""))
+            return self.connection.get_json(url).get('values', [])
+
+        def bands():
+            executor = ThreadPoolExecutor(max_workers=BANDS_IN_FLIGHT)
+            try:
+                starts = iter(range(0, row_count, chunk_rows))
+                in_flight = deque(
+                    (start, executor.submit(fetch, start)) for start in islice(starts, BANDS_IN_FLIGHT)
+                )
+                empty_rows = 0
+                while in_flight:
+                    start, future = in_flight.popleft()
+                    rows = future.result()
+                    # Keep the window full while the caller works on this band
+                    for next_start in islice(starts, 1):
+                        in_flight.append((next_start, executor.submit(fetch, next_start)))
+                    if rows:
+                        # Empty rows before this band's data belong to the sheet
+                        yield start - empty_rows, [[] for _ in range(empty_rows)] + rows
+                        empty_rows = 0
+                    # The API drops the band's trailing empty rows
+                    empty_rows += min(chunk_rows, row_count - start) - len(rows)
+            finally:
+                # Drop the prefetched bands if the caller stops early
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        return row_count, column_count, bands()
+
+    def _first_sheet_grid(self, key):
+        """Return the title, row count and column count of the first worksheet"""
+        metadata = self.connection.get_json(
+            SHEETS_API_URL.format(spreadsheet_id=key), params={'fields': SHEETS_GRID_FIELDS}
+        )
+        properties = metadata['sheets'][0]['properties']
+        grid = properties.get('gridProperties', {})
+        return properties['title'], grid.get('rowCount', 0), grid.get('columnCount', 0)
+
+    def resolve_key(self, name):
+        """
+        Return the key of the spreadsheet called ``name``, searching Drive only on a cache miss.
+
+        :raises gspread.SpreadsheetNotFound: if no spreadsheet has that name.
+        """
+        key = self.key_cache.get(name)
+        if key:
+            return key
+        files = self.connect().list_spreadsheet_files(name)
+        for spreadsheet_file in files:
+            if spreadsheet_file["name"] == name:
+                self.key_cache.put(name, spreadsheet_file["id"])
+                return spreadsheet_file["id"]
+        raise gspread.SpreadsheetNotFound(f"No spreadsheet named {name!r}")
+
+    def spreadsheet_key(self, access_type, identifier):
+        """
+        Return the key of a spreadsheet given as for read_sheets.
+
+        Names go through the key cache, so after read_sheets no request is made.
+        """
+        if access_type == "name":
+            return self.resolve_key(identifier)
+        if access_type == "key":
+            return identifier.strip()
+        if access_type == "url":
+            return extract_id_from_url(identifier)
+        raise ValueError("Invalid access type")
+
+    def file_info(self, key):
+        """
+        Return the Drive metadata of a spreadsheet: id, name, version and modifiedTime.
+
+        A single small request, so callers can tell whether a spreadsheet
+        changed before reading its values.
+        """
+        return self.connection.get_json(DRIVE_FILE_URL.format(file_id=key), params={'fields': DRIVE_FILE_FIELDS})
+
+    def _open_by_name(self, name):
+        """Open a spreadsheet by name through the key cache"""
+        client = self.connect()
+        cached = self.key_cache.get(name) is not None
+        try:
+            return client.open_by_key(self.resolve_key(name))
+        except (gspread.SpreadsheetNotFound, PermissionError):
+            if not cached:
+                raise
+            # Deleted or unshared since it was cached: search for the name again
+            self.key_cache.invalidate(name)
+            return client.open_by_key(self.resolve_key(name))
+
+    def read_many(self, access_type, identifiers, max_workers=FANOUT_WORKERS):
+        """
+        Reads several spreadsheets concurrently over the shared client.
+
+        Results are yielded as soon as each spreadsheet is loaded, so the total
+        time is close to the slowest read rather than the sum of all of them.
+        A failing spreadsheet does not stop the others: its error is yielded
+        in place of the data.
+
+        :param access_type: "name", "key" or "url", applied to every identifier.
+        :param identifiers: Iterable of spreadsheet identifiers.
+        :param max_workers: Maximum number of spreadsheets read at the same time.
+        :return: Generator of ``(identifier, dataframe, error)`` tuples where
+            exactly one of ``dataframe`` and ``error`` is None.
+        """
+        # Authorize once up front so the workers share one client and session
+        self.connect()
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(self.read_sheets, access_type, identifier): identifier
+                for identifier in identifiers
+            }
+            for future in as_completed(futures):
+                identifier = futures[future]
+                try:
+                    yield identifier, future.result(), None
+                except Exception as e:
+                    yield identifier, None, e
+        finally:
+            # Drop the pending reads if the caller stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class GoogleDocumentReader(GoogleSheetsReader):
+    """
+    Class for reading data from Google Sheets and Google Docs.
+
+    Google Docs are fetched through the Docs REST API on the session shared
+    with the Sheets client, so consecutive reads reuse pooled connections.
+    """
+
+    def read_document(self, doc_id, mode="structure"):
+        """
+        Read content from a Google Doc
+
+        Args:
+            doc_id: The document ID
+            mode: "structure" walks the Docs API document structure; "text" and
+                "markdown" let Drive export the text server-side, which avoids
+                downloading and parsing the much larger structure.
+
+        Returns:
+            Document content as text
+        """
+        try:
+            if mode in ("text", "markdown"):
+                # Drive prefixes text exports with a byte order mark
+                text_content = self.export_document(doc_id, mode).decode('utf-8-sig')
+                return [('Document', pd.DataFrame({'Content': [text_content]}))]
+            if mode != "structure":
+                raise ValueError(f"Invalid read mode: {mode}")
+
+            # Retrieve the document
+            url = DOCS_API_URL.format(document_id=doc_id)
+            document = self.connection.get_json(url, params={'fields': DOCS_FIELDS})
+            if _exceeds_table_depth(document.get('body').get('content')):
+                # The mask cut off deeply nested tables: fetch the whole document
+                document = self.connection.get_json(url)
+
+            # Extract text from the document
+            doc_content = document.get('body').get('content')
+            text_content = self._extract_text_from_doc_content(doc_content)
+
+            # Return as a single "worksheet" with the document content
+            df = pd.DataFrame({'Content': [text_content]})
+            return [('Document', df)]
+
+        except Exception as e:
+            raise ValueError(f"Failed to read Google Doc: {str(e)}")
+
+    def export_document(self, doc_id, export_format):
+        """
+        Export a Google Doc through the Drive export endpoint.
+
+        Args:
+            doc_id: The document ID
+            export_format: One of EXPORT_FORMATS ("text", "markdown" or "docx")
+
+        Returns:
+            bytes: The exported file
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid export format: {export_format}")
+        return self.connection.get_bytes(
+            DRIVE_EXPORT_URL.format(file_id=doc_id),
+            params={'mimeType': EXPORT_FORMATS[export_format]}
+        )
+
+    def _extract_text_from_doc_content(self, content):
+        """Helper method to extract text from Google Doc content"""
+        text = []
+        # Masked responses omit empty objects, hence the .get() lookups
+        for element in content:
+            if 'paragraph' in element:
+                for paragraph_element in element['paragraph'].get('elements', []):
+                    if 'textRun' in paragraph_element:
+                        text.append(paragraph_element['textRun'].get('content', ''))
+            elif 'table' in element:
+                # Handle tables
+                for table_row in element['table'].get('tableRows', []):
+                    row_text = []
+                    for cell in table_row.get('tableCells', []):
+                        if 'content' in cell:
+                            cell_text = self._extract_text_from_doc_content(cell['content'])
+                            row_text.append(cell_text)
+                    text.append(' | '.join(row_text))
+            elif 'tableOfContents' in element:
+                text.append('[Table of Contents]')
+        return '\n'.join(text)
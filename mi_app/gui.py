@@ -1,10 +1,29 @@
+import importlib
+import logging
+import queue
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
-from mi_app.google_sheets import GoogleConnection, GoogleSheetsReader
-from mi_app.docx_generator import DocumentGenerator
+from mi_app.progress import ProgressPanel, ProgressTracker
+from mi_app.utils import get_default_template_path, looks_like_spreadsheet
+
+logger = logging.getLogger(__name__)
+
+# Modules that pull in pandas, gspread, google-auth and docxtpl/lxml. They are
+# imported on first use, and warmed in the background once the window is shown.
+HEAVY_MODULES = ("mi_app.google_sheets", "mi_app.docx_generator")
+
+# Milliseconds between refreshes of the progress panel during a batch run
+PROGRESS_POLL_MS = 100
+
+# Milliseconds the identifier must stay unchanged before it is prefetched
+PREFETCH_DELAY_MS = 400
+
+# Milliseconds between checks of the spreadsheet read started by Generate
+READ_POLL_MS = 50
 
 
 class GoogleToDocApp:
@@ -31,12 +50,26 @@ class GoogleToDocApp:
         self.root.configure(padx=20, pady=20, bg="lightblue")
         # self.root.iconbitmap("assets/icon.ico")-> agregar el icono de la empresa
 
-        # Initialize components
-        self.connection = GoogleConnection()
+        # Initialize components (created lazily, see the properties below)
+        self._connection = None
         self.sheets_reader = None
-        self.doc_generator = DocumentGenerator()
+        self._doc_generator = None
+        self._catalog = None
         self.current_data = []
 
+        # Spreadsheet read started while the identifier is typed (see _prefetch)
+        self._prefetcher = None
+        self._prefetch_after = None
+        # Spreadsheet read started by Generate, polled from the Tk loop
+        self._pending_read = None
+        # Catalog updates run one at a time, off the Tk thread
+        self._index_executor = None
+
+        # Batch generation state, set while a run is in progress
+        self._batch_events = None
+        self._batch_cancel = None
+        self._batch_tracker = None
+
         # UI variables
         self.access_var = tk.StringVar(value="url")
         self.identifier_var = tk.StringVar()
@@ -44,16 +77,63 @@ class GoogleToDocApp:
         self.title_var = tk.StringVar()
         self.job_title_var = tk.StringVar()
         self.level_hierarchy_var = tk.StringVar()
-        self.template_path_var = tk.StringVar(value=self.doc_generator.default_template_path)
+        self.template_path_var = tk.StringVar(value=get_default_template_path())
 
         # Lists for dropdown values
         self.job_titles = []
         self.level_hierarchies = []
+        # Row position in the job table of each (level hierarchy, job title)
+        self.job_positions = {}
+        # Work area of each of those rows, for selecting jobs by area
+        self.job_areas = {}
 
         # Setup UI
         self._setup_styles()
         self._configure_ui_layout()
 
+        # Start loading the spreadsheet as soon as a complete identifier is entered
+        self.identifier_var.trace_add("write", self._schedule_prefetch)
+        self.access_var.trace_add("write", self._schedule_prefetch)
+
+        # Import the heavy dependencies once the window has been painted
+        self.root.after_idle(self._warm_dependencies)
+
+    @property
+    def connection(self):
+        """Google connection, created on first use"""
+        if self._connection is None:
+            from mi_app.google_sheets import GoogleConnection
+            self._connection = GoogleConnection()
+        return self._connection
+
+    @property
+    def doc_generator(self):
+        """Document generator, created on first use"""
+        if self._doc_generator is None:
+            from mi_app.docx_generator import DocumentGenerator
+            self._doc_generator = DocumentGenerator()
+        return self._doc_generator
+
+    @property
+    def catalog(self):
+        """Local job catalog, opened on first use"""
+        if self._catalog is None:
+            from mi_app.catalog import JobCatalog
+            self._catalog = JobCatalog()
+        return self._catalog
+
+    def _warm_dependencies(self):
+        """Import the heavy modules in a background thread"""
+        def warm():
+            for module_name in HEAVY_MODULES:
+                try:
+                    importlib.import_module(module_name)
+                except ImportError:
+                    # Reported properly when the module is actually needed
+                    pass
+
+        threading.Thread(target=warm, daemon=True).start()
+
     def _setup_styles(self):
         """Setup custom styles for the UI"""
         style = ttk.Style()
@@ -219,6 +299,9 @@ class GoogleToDocApp:
         )
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
+        # Progress of batch generations, shown while a run is in progress
+        self.progress_panel = ProgressPanel(main_container, on_cancel=self._cancel_batch)
+
     def _hide_job_fields(self):
         """Hide job title and level hierarchy fields"""
         self.job_title_label.grid_remove()
@@ -249,8 +332,17 @@ class GoogleToDocApp:
             return
 
         if self.connection.show_validation_window(self.root):
+            from functools import partial
+            from mi_app.catalog import read_with_revision
+            from mi_app.google_sheets import GoogleSheetsReader
+            from mi_app.prefetch import SheetPrefetcher
             self.sheets_reader = GoogleSheetsReader(self.connection)
+            # Reads carry their Drive revision, so the catalog can index them as loaded
+            self._prefetcher = SheetPrefetcher(self.sheets_reader,
+                                               read=partial(read_with_revision, self.sheets_reader))
             self.status_var.set("Credentials validated successfully")
+            # The identifier may have been pasted before validating
+            self._schedule_prefetch()
         else:
             self.status_var.set("Credentials validation failed")
 
@@ -291,13 +383,13 @@ class GoogleToDocApp:
                 # Job title and level hierarchy should already be validated before calling this method
 
                 # Generate document with all available parameters
-                # print(f"this is the la data total {self.current_data}"
                 self.doc_generator.generate_from_dataframes_title_page(
                     self.current_data,
                     file_path,
                     job_title,
                     level_hierarchy,
                     title,
+                    job_position=self.job_positions.get((level_hierarchy, job_title)),
                 )
 
                 self.status_var.set("Document generated successfully")
@@ -323,19 +415,44 @@ class GoogleToDocApp:
             )
             return
 
-        try:
-            self.status_var.set("Processing spreadsheet...")
+        if self._pending_read is not None:
+            # The spreadsheet is still being read for the previous click
+            return
+
+        self.status_var.set("Processing spreadsheet...")
+        # Get data from Google Sheets without blocking the Tk loop
+        access_type = self.access_var.get()
+        self._pending_read = self._prefetcher.read(access_type, identifier)
+        self._wait_for_spreadsheet(access_type, identifier)
 
-            # Get data from Google Sheets
-            access_type = self.access_var.get()
-            self.current_data = self.sheets_reader.read_sheets(access_type, identifier)
+    def _wait_for_spreadsheet(self, access_type, identifier):
+        """Poll the spreadsheet read, then check it and open the selection window"""
+        if not self._pending_read.done():
+            self.root.after(READ_POLL_MS, self._wait_for_spreadsheet, access_type, identifier)
+            return
+        future, self._pending_read = self._pending_read, None
+
+        try:
+            read = future.result()
+            self.current_data = read.dataframes
 
             if self.current_data is None or self.current_data.empty:
                 messagebox.showwarning("Warning", "No data found in the spreadsheet")
                 return
 
+            # Check the whole sheet before anything is generated
+            from mi_app.preflight import preflight
+            report = preflight(self.current_data, self.doc_generator)
+            if not report.can_generate:
+                self.status_var.set("Spreadsheet failed the preflight check")
+                messagebox.showerror("Error", f"The spreadsheet cannot be processed:\n\n{report.summary()}")
+                return
+            if not report.ok:
+                messagebox.showwarning("Warning", f"The spreadsheet has problems:\n\n{report.summary()}")
+
             # Extract job titles and level hierarchies from the data
             self._extract_job_data_from_dataframe()
+            self._index_in_catalog(read)
 
             # Show the job fields now that data is loaded
             self._show_job_fields()
@@ -348,11 +465,60 @@ class GoogleToDocApp:
             self.status_var.set(f"Error: {str(e)}")
             messagebox.showerror("Error", f"An error occurred: {e}")
 
+    def _index_in_catalog(self, read):
+        """Index the loaded spreadsheet in the local job catalog, in the background.
+
+        The sheet already read is indexed under the Drive revision fetched
+        with it (see read_with_revision); nothing is downloaded again.
+        """
+        if read.info is None:
+            # Already logged by read_with_revision; the next load indexes it
+            return
+        if self._index_executor is None:
+            self._index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog")
+        dataframes, generator = read.dataframes, self.doc_generator
+
+        def index():
+            from mi_app.catalog import drive_revision
+            # Opened here too, so a broken catalog file is reported like any other failure
+            return self.catalog.index(read.spreadsheet_id, dataframes, revision=drive_revision(read.info),
+                                      name=read.info.get('name'), generator=generator)
+
+        self._wait_for_index(self._index_executor.submit(index))
+
+    def _wait_for_index(self, future):
+        """Poll a catalog update and report its failure in the status bar"""
+        if not future.done():
+            self.root.after(READ_POLL_MS, self._wait_for_index, future)
+            return
+        error = future.exception()
+        if error is not None:
+            # The catalog only speeds up later searches; generation goes on without it
+            logger.warning("Could not index the spreadsheet in the job catalog: %s", error)
+            self.status_var.set(f"Job catalog not updated: {error}")
+
+    def _schedule_prefetch(self, *args):
+        """Debounce edits of the identifier before prefetching it"""
+        if self._prefetch_after is not None:
+            self.root.after_cancel(self._prefetch_after)
+        if self._prefetcher is not None:
+            # A read for an identifier that is no longer entered is thrown away
+            self._prefetcher.invalidate(self.access_var.get(), self.identifier_var.get())
+        self._prefetch_after = self.root.after(PREFETCH_DELAY_MS, self._prefetch)
+
+    def _prefetch(self):
+        """Start reading the entered spreadsheet in the background"""
+        self._prefetch_after = None
+        access_type = self.access_var.get()
+        identifier = self.identifier_var.get()
+        if self._prefetcher is not None and looks_like_spreadsheet(access_type, identifier):
+            self._prefetcher.request(access_type, identifier)
+
     def _show_selection_window(self):
-        """Show a window for selecting job title and level hierarchy"""
+        """Show a window for selecting the jobs to generate descriptors for"""
         selection_window = tk.Toplevel(self.root)
-        selection_window.title("Select Categories")
-        selection_window.geometry("600x300")
+        selection_window.title("Select Jobs")
+        selection_window.geometry("700x520")
         selection_window.transient(self.root)
         selection_window.grab_set()  # Make the window modal
 
@@ -363,100 +529,234 @@ class GoogleToDocApp:
         # Add instructions
         ttk.Label(
             content_frame,
-            text="Select Job Title and Level Hierarchy to generate the document:",
+            text="Select the jobs to generate descriptors for:",
             font=("Arial", 12)
-        ).pack(pady=(0, 20))
+        ).pack(pady=(0, 10))
 
-        # Add job title dropdown
-        job_frame = ttk.Frame(content_frame)
-        job_frame.pack(fill="x", pady=5)
+        # One entry per job, in sheet order; the list index maps to the row position
+        options = list(self.job_positions.items())
 
-        ttk.Label(job_frame, text="Job Title:", width=15).pack(side="left")
-        job_combobox = ttk.Combobox(
-            job_frame,
-            width=40,
-            values=self.job_titles
+        # Quick selection by level hierarchy or work area
+        filter_frame = ttk.Frame(content_frame)
+        filter_frame.pack(fill="x", pady=5)
+
+        ttk.Label(filter_frame, text="Level Hierarchy:").pack(side="left")
+        level_combobox = ttk.Combobox(filter_frame, width=18, state="readonly", values=self.level_hierarchies)
+        level_combobox.pack(side="left", padx=5)
+
+        ttk.Label(filter_frame, text="Work Area:").pack(side="left", padx=(10, 0))
+        area_combobox = ttk.Combobox(
+            filter_frame, width=18, state="readonly",
+            values=list(dict.fromkeys(area for area in self.job_areas.values() if area))
         )
-        job_combobox.pack(side="left", padx=5, fill="x", expand=True)
+        area_combobox.pack(side="left", padx=5)
 
-        # Add level hierarchy dropdown
-        level_frame = ttk.Frame(content_frame)
-        level_frame.pack(fill="x", pady=5)
+        # Job list
+        list_frame = ttk.Frame(content_frame)
+        list_frame.pack(fill="both", expand=True, pady=5)
 
-        ttk.Label(level_frame, text="Level Hierarchy:", width=15).pack(side="left")
-        level_combobox = ttk.Combobox(
-            level_frame,
-            width=40,
-            values=self.level_hierarchies
+        job_listbox = tk.Listbox(list_frame, selectmode=tk.EXTENDED, exportselection=False)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=job_listbox.yview)
+        job_listbox.configure(yscrollcommand=scrollbar.set)
+        job_listbox.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        for (level, title), position in options:
+            area = self.job_areas.get(position, '')
+            job_listbox.insert(tk.END, f"{level} - {title}" + (f"  ({area})" if area else ""))
+
+        count_var = tk.StringVar()
+
+        def update_count(event=None):
+            count_var.set(f"{len(job_listbox.curselection())} of {len(options)} jobs selected")
+
+        def select_where(matches):
+            # Add the matching jobs to the current selection
+            for index, ((level, title), position) in enumerate(options):
+                if matches(level, position):
+                    job_listbox.selection_set(index)
+            update_count()
+
+        def select_all():
+            job_listbox.selection_set(0, tk.END)
+            update_count()
+
+        def clear_selection():
+            job_listbox.selection_clear(0, tk.END)
+            update_count()
+
+        level_combobox.bind(
+            "<<ComboboxSelected>>",
+            lambda event: select_where(lambda level, position: level == level_combobox.get())
         )
-        level_combobox.pack(side="left", padx=5, fill="x", expand=True)
+        area_combobox.bind(
+            "<<ComboboxSelected>>",
+            lambda event: select_where(lambda level, position: self.job_areas.get(position) == area_combobox.get())
+        )
+        job_listbox.bind("<<ListboxSelect>>", update_count)
+
+        selection_frame = ttk.Frame(content_frame)
+        selection_frame.pack(fill="x", pady=5)
+        ttk.Button(selection_frame, text="Select All", command=select_all).pack(side="left")
+        ttk.Button(selection_frame, text="Clear", command=clear_selection).pack(side="left", padx=5)
+        ttk.Label(selection_frame, textvariable=count_var).pack(side="right")
+        update_count()
+
+        manual_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            content_frame,
+            text="Also build a consolidated manual of the selected jobs",
+            variable=manual_var
+        ).pack(anchor="w", pady=5)
 
         # Add a button frame
         button_frame = ttk.Frame(content_frame)
-        button_frame.pack(pady=20)
+        button_frame.pack(pady=10)
 
         def on_generate():
-            job_title = job_combobox.get()
-            level_hierarchy = level_combobox.get()
-
-            if not job_title or not level_hierarchy:
+            selected = [options[index] for index in job_listbox.curselection()]
+            if not selected:
                 messagebox.showwarning(
                     "Warning",
-                    "Please select both Job Title and Level Hierarchy before generating the document.",
+                    "Please select at least one job before generating the documents.",
                     parent=selection_window
                 )
                 return
 
-            # Set the values in the main window variables
-            self.job_title_var.set(job_title)
-            self.level_hierarchy_var.set(level_hierarchy)
+            if len(selected) == 1 and not manual_var.get():
+                # A single descriptor keeps the save dialog, so the file can be named
+                (level_hierarchy, job_title), _ = selected[0]
+                self.job_title_var.set(job_title)
+                self.level_hierarchy_var.set(level_hierarchy)
+                selection_window.destroy()
+                self._save_document()
+                return
 
-            # Close the selection window
+            output_dir = filedialog.askdirectory(
+                title="Select the folder for the descriptors",
+                parent=selection_window
+            )
+            if not output_dir:
+                return
             selection_window.destroy()
-
-            # Generate the document
-            self._save_document()
+            manual_path = os.path.join(output_dir, "manual.docx") if manual_var.get() else None
+            self._start_batch([position for _, position in selected], output_dir, manual_path=manual_path)
 
         ttk.Button(
             button_frame,
-            text="Generate Document",
+            text="Generate Selected...",
             command=on_generate,
             style="Generate.TButton"
-        ).pack(pady=10)
+        ).pack(side="left", padx=5, pady=10)
+
+    def _start_batch(self, positions, output_dir, manual_path=None):
+        """Generate the descriptors of several jobs in the background.
+
+        With ``manual_path`` the consolidated manual of the same jobs is built
+        once the descriptors are done, unless the run was cancelled.
+        """
+        if self._batch_cancel is not None:
+            messagebox.showwarning("Warning", "A generation is already running")
+            return
+
+        from mi_app.batch import generate_descriptors
+
+        positions = list(positions)
+        events = queue.Queue()
+        cancel_event = threading.Event()
+        data = self.current_data
+        generator = self.doc_generator
+
+        def run():
+            error = None
+            try:
+                results = generate_descriptors(
+                    generator, data, positions, output_dir,
+                    cancel_event=cancel_event,
+                    on_stage=lambda stage: events.put(('stage', stage))
+                )
+                for _, output_path, failure in results:
+                    events.put(('document', os.path.basename(output_path), failure))
+                if manual_path and not cancel_event.is_set():
+                    events.put(('stage', "Building manual"))
+                    generator.generate_manual(data, positions, manual_path)
+            except Exception as e:
+                error = e
+            events.put(('end', error))
+
+        self._batch_events = events
+        self._batch_cancel = cancel_event
+        self._batch_tracker = ProgressTracker(total=len(positions))
+        self.progress_panel.reset()
+        self.progress_panel.refresh(self._batch_tracker)
+        self.progress_panel.pack(fill="x", pady=10, padx=5)
+        self.status_var.set(f"Generating {len(positions)} documents...")
+
+        threading.Thread(target=run, daemon=True).start()
+        self.root.after(PROGRESS_POLL_MS, self._poll_batch)
+
+    def _poll_batch(self):
+        """Apply the events of the running batch to the progress panel"""
+        tracker = self._batch_tracker
+        finished, error = False, None
+        while True:
+            try:
+                event = self._batch_events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'stage':
+                tracker.set_stage(event[1])
+            elif event[0] == 'document':
+                tracker.record(event[1], event[2])
+            else:
+                finished, error = True, event[1]
+
+        if not finished:
+            self.progress_panel.refresh(tracker)
+            self.root.after(PROGRESS_POLL_MS, self._poll_batch)
+            return
+
+        cancelled = self._batch_cancel.is_set()
+        self.progress_panel.finish(tracker, cancelled=cancelled)
+        self._batch_events = self._batch_cancel = None
+
+        written = tracker.done - len(tracker.failures)
+        if error is not None:
+            self.status_var.set(f"Error generating documents: {error}")
+            messagebox.showerror("Error", f"Failed to generate documents: {error}")
+        elif cancelled:
+            self.status_var.set(f"Generation cancelled, {written} documents kept")
+        elif tracker.failures:
+            self.status_var.set(f"{written} documents generated, {len(tracker.failures)} failed")
+            messagebox.showwarning("Warning", f"{len(tracker.failures)} of {tracker.total} documents failed")
+        else:
+            self.status_var.set(f"{written} documents generated")
+            messagebox.showinfo("Success", f"{written} documents generated successfully")
+
+    def _cancel_batch(self):
+        """Stop the running batch; documents already written are kept"""
+        if self._batch_cancel is not None:
+            self._batch_cancel.set()
+            self.status_var.set("Cancelling generation...")
 
     def _update_label(self):
         btn_selected = self.access_var.get()
         self.identifier_label.config(text=f"Spreadsheet by {btn_selected}: ")
 
     def _extract_job_data_from_dataframe(self):
-        """Extract job titles and level hierarchies from the dataframe with unique identifiers."""
+        """Extract job titles and level hierarchies from the job table, keyed by row position."""
         if self.current_data is None:
             return
 
-        # Get the first two columns only
-        df_filter = self.current_data.iloc[:, :2].copy()
-        df_filter = df_filter.replace('', pd.NA).replace(' ', pd.NA).dropna(how='all')
-
-        if df_filter.shape[1] > 1:
-            # Create unique identifiers for each row including the row index
-            job_titles = []
-            level_hierarchies = []
-
-            for idx, row in df_filter.iterrows():
-                job_title = str(row.iloc[0]).strip()
-                level_hierarchy = str(row.iloc[1]).strip()
-
-                if job_title and level_hierarchy and job_title.lower() != 'nan' and level_hierarchy.lower() != 'nan':
-                    # Create unique identifier with original index
-                    unique_job_title = f"{job_title} (Row {idx})"
-                    unique_level_hierarchy = f"{level_hierarchy} (Row {idx})"
-
-                    job_titles.append(unique_job_title)
-                    level_hierarchies.append(unique_level_hierarchy)
+        # The (level, title) pair is the selection key; it maps straight to the job's row
+        self.job_positions = self.doc_generator.job_options(self.current_data)
+        areas = self.doc_generator.job_table(self.current_data)['a_trabajo'].fillna('').astype(str).str.strip()
+        self.job_areas = {position: areas.iloc[position] for position in self.job_positions.values()}
 
-            # Remove duplicates while preserving order
-            self.job_titles = list(dict.fromkeys(job_titles))
-            self.level_hierarchies = list(dict.fromkeys(level_hierarchies))
+        # Remove duplicates while preserving order
+        self.job_titles = list(dict.fromkeys(title for _, title in self.job_positions))
+        self.level_hierarchies = list(dict.fromkeys(level for level, _ in self.job_positions))
+        self._update_comboboxes()
 
         return self.job_titles, self.level_hierarchies
         # self.job_titles = []
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+import requests
+
+from mi_app.utils import atomic_path, get_cache_dir
+
+# Pillow is optional: without it images are embedded at their original size
+IMAGE_RESIZE_AVAILABLE = True
+try:
+    from PIL import Image
+except ImportError:
+    IMAGE_RESIZE_AVAILABLE = False
+
+# Upper bound of the on-disk cache (originals and resized variants together)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+DOWNLOAD_TIMEOUT = 30
+
+# Drive share links point to a viewer page; this is the direct download form
+DRIVE_FILE_LINK = re.compile(r'https://drive\.google\.com/(?:file/d/|open\?id=)([\w-]+)')
+DRIVE_DOWNLOAD_URL = "https://drive.google.com/uc?export=download&id={file_id}"
+
+# Leading bytes of the picture formats Word can embed. A link that answers
+# with anything else (a Drive sign-in or virus-scan page, say) is rejected
+# before it reaches the cache.
+IMAGE_SIGNATURES = (
+    b'\x89PNG\r\n\x1a\n',    # PNG
+    b'\xff\xd8\xff',         # JPEG
+    b'GIF87a', b'GIF89a',    # GIF
+    b'BM',                   # BMP
+    b'II*\x00', b'MM\x00*',  # TIFF
+)
+
+
+class ImageCache:
+    """
+    Content-addressed, LRU-evicted on-disk cache of linked images.
+
+    Downloaded images are stored under the SHA-256 of their bytes, so the same
+    picture linked from several URLs is stored once. Resized variants are
+    cached next to the originals. Every hit refreshes the file's modification
+    time, and the least recently used files are evicted once the cache grows
+    beyond ``max_bytes``.
+
+    index.json maps each URL to its digest and each digest to the pixel width
+    of the image, so an image that needs no scaling is not opened again. The
+    worker processes of a batch share the file and merge their entries into it.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, session=None):
+        self.cache_dir = cache_dir or get_cache_dir('images')
+        self.blobs_dir = os.path.join(self.cache_dir, 'blobs')
+        self.variants_dir = os.path.join(self.cache_dir, 'variants')
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+        self.max_bytes = max_bytes
+        self.session = session or requests.Session()
+        self._lock = threading.Lock()
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.variants_dir, exist_ok=True)
+        self._index = self._load_index()
+        # Entries added by this instance since the index file was last written
+        self._changes = {'urls': {}, 'widths': {}}
+
+    def fetch(self, url):
+        """Return the path of the cached original image, downloading it if needed"""
+        with self._lock:
+            digest = self._index['urls'].get(url)
+        if digest:
+            path = os.path.join(self.blobs_dir, digest)
+            if os.path.exists(path) and _is_image_file(path):
+                _touch(path)
+                return path
+
+        response = self.session.get(_download_url(url), timeout=DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        content = response.content
+        if not is_image_content(content):
+            content_type = response.headers.get('Content-Type', 'unknown type')
+            raise ValueError(f"{url} did not return an image ({content_type})")
+        digest = hashlib.sha256(content).hexdigest()
+        path = os.path.join(self.blobs_dir, digest)
+        if os.path.exists(path):
+            _touch(path)
+        else:
+            _write_atomic(path, content)
+
+        self._record('urls', url, digest)
+        self._evict()
+        return path
+
+    def resized(self, url, width_px):
+        """
+        Return the path of the image scaled down to ``width_px`` pixels wide.
+
+        Images already narrower than ``width_px`` and environments without
+        Pillow get the original file.
+        """
+        original = self.fetch(url)
+        if not IMAGE_RESIZE_AVAILABLE:
+            return original
+
+        digest = os.path.basename(original)
+        with self._lock:
+            width = self._index['widths'].get(digest)
+        if width is not None and width <= width_px:
+            return original
+
+        variant = os.path.join(self.variants_dir, f"{digest}_{width_px}.png")
+        if os.path.exists(variant):
+            _touch(variant)
+            return variant
+
+        with Image.open(original) as image:
+            if width is None:
+                self._record('widths', digest, image.width)
+            if image.width <= width_px:
+                return original
+            height = max(1, round(image.height * width_px / image.width))
+            scaled = image.resize((width_px, height), Image.LANCZOS)
+            with atomic_path(variant) as tmp_path:
+                scaled.save(tmp_path, format='PNG', optimize=True)
+        self._evict()
+        return variant
+
+    def _record(self, section, key, value):
+        """Add an entry to the index and write it out"""
+        with self._lock:
+            self._index[section][key] = value
+            self._changes[section][key] = value
+            self._save_index()
+
+    def _evict(self):
+        """Delete the least recently used files until the cache fits in max_bytes"""
+        entries = []
+        for directory in (self.blobs_dir, self.variants_dir):
+            for entry in os.scandir(directory):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _load_index(self):
+        index = {'urls': {}, 'widths': {}}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    stored = json.load(f)
+                for section in index:
+                    index[section].update(stored.get(section, {}))
+            except (OSError, json.JSONDecodeError, AttributeError, TypeError, ValueError):
+                pass
+        return index
+
+    def _save_index(self):
+        # Other processes may have written the file since it was loaded: their
+        # entries are read back just before the replace and kept
+        index = self._load_index()
+        for section, changes in self._changes.items():
+            index[section].update(changes)
+        _write_atomic(self.index_path, json.dumps(index).encode('utf-8'))
+        self._index = index
+        self._changes = {'urls': {}, 'widths': {}}
+
+
+def is_image_link(value):
+    """True when a cell value looks like a link that can be embedded"""
+    return isinstance(value, str) and value.strip().lower().startswith(('http://', 'https://'))
+
+
+def is_image_content(content):
+    """True when ``content`` starts like one of the embeddable picture formats"""
+    return content.startswith(IMAGE_SIGNATURES)
+
+
+def _is_image_file(path):
+    with open(path, 'rb') as f:
+        return is_image_content(f.read(16))
+
+
+def _download_url(url):
+    match = DRIVE_FILE_LINK.match(url.strip())
+    if match:
+        return DRIVE_DOWNLOAD_URL.format(file_id=match.group(1))
+    return url.strip()
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_atomic(path, content):
+    with atomic_path(path) as tmp_path, open(tmp_path, 'wb') as f:
+        f.write(content)
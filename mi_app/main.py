@@ -1,3 +1,4 @@
+import multiprocessing
 import tkinter as tk
 from mi_app.gui import GoogleToDocApp
 
@@ -8,4 +9,6 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Needed by the document worker processes in the PyInstaller build
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
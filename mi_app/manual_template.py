@@ -0,0 +1,163 @@
+import hashlib
+import os
+import re
+import zipfile
+
+from docx.oxml.ns import qn
+from lxml import etree
+
+from mi_app.utils import atomic_path, get_cache_dir
+
+# Text of the heading paragraph that opens the per-job part of the descriptor
+# template. That paragraph must sit directly in the document body: it and
+# every following body element, up to the section properties, are repeated
+# once per job.
+JOB_SECTION_HEADING = 'DESCRIPTOR DE CARGO'
+
+PLACEHOLDER = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# Bumped whenever the derivation changes, so variants cached by an older
+# version are not reused
+MANUAL_VERSION = 2
+
+LOOP_START = (
+    '{%p for job in jobs %}',
+    '{%p if not loop.first %}',
+    None,  # Page break
+    '{%p endif %}',
+)
+LOOP_END = ('{%p endfor %}',)
+
+W_P, W_R, W_T = qn('w:p'), qn('w:r'), qn('w:t')
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+
+def get_manual_template(template_path, header_fields):
+    """Return the path of the job-manual variant of a descriptor template.
+
+    The variant wraps the job section of the template in a
+    ``{%p for job in jobs %}`` loop and turns its job placeholders into
+    ``{{job.<name>}}``, so a whole manual is rendered in one pass. It is
+    derived once per template content and cached on disk.
+
+    Args:
+        template_path: Descriptor template (.docx)
+        header_fields: Placeholders rendered once for the whole manual
+
+    Raises:
+        ValueError: If the template has no job section heading directly in
+            the document body
+    """
+    with open(template_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    manual_path = os.path.join(get_cache_dir('templates'), f"manual{MANUAL_VERSION}_{digest}.docx")
+    if os.path.exists(manual_path):
+        return manual_path
+
+    with atomic_path(manual_path) as tmp_path:
+        with zipfile.ZipFile(template_path) as source, zipfile.ZipFile(tmp_path, 'w') as target:
+            for info in source.infolist():
+                data = source.read(info.filename)
+                if info.filename == 'word/document.xml':
+                    data = _loop_job_section(data, set(header_fields))
+                target.writestr(info, data, compress_type=info.compress_type)
+    return manual_path
+
+
+def _loop_job_section(document_xml, header_fields):
+    """Wrap the job section of document.xml in a loop over ``jobs``"""
+    root = etree.fromstring(document_xml)
+    body = root.find(qn('w:body'))
+    heading = next((child for child in body if child.tag == W_P and _is_heading(child)), None)
+    if heading is None:
+        nested = any(_is_heading(paragraph) for paragraph in body.iter(W_P))
+        if nested:
+            raise ValueError(f"The '{JOB_SECTION_HEADING}' heading of the template must be a paragraph "
+                             "of the document body, not inside a table, text box or content control")
+        raise ValueError(f"The template has no '{JOB_SECTION_HEADING}' section to repeat")
+
+    # The body's own section properties are its last child and stay outside the loop
+    children = list(body)
+    end = len(children) - 1 if children[-1].tag == qn('w:sectPr') else len(children)
+    section = children[children.index(heading):end]
+
+    def to_job_field(match):
+        name = match.group(1)
+        return match.group(0) if name in header_fields else f'{{{{job.{name}}}}}'
+
+    for element in section:
+        # iter() includes the element itself when it is a paragraph
+        for paragraph in element.iter(W_P):
+            _replace_placeholders(paragraph, to_job_field)
+
+    for text in LOOP_START:
+        heading.addprevious(_paragraph(text))
+    for text in LOOP_END:
+        section[-1].addnext(_paragraph(text))
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _is_heading(paragraph):
+    return ''.join(_paragraph_texts(paragraph)).strip() == JOB_SECTION_HEADING
+
+
+def _paragraph_texts(paragraph):
+    """Text values of the w:t elements of a paragraph, excluding nested paragraphs"""
+    return [text.text or '' for text in _text_elements(paragraph)]
+
+
+def _text_elements(paragraph):
+    return [text for text in paragraph.iter(W_T) if next(text.iterancestors(W_P)) is paragraph]
+
+
+def _replace_placeholders(paragraph, replace):
+    """Apply ``replace`` to every placeholder of a paragraph, even one split across runs.
+
+    Word often splits ``{{ name }}`` over several runs (spell checking,
+    partial formatting), so the runs' texts are matched as one string. A
+    placeholder spanning several runs is moved whole into its first run and
+    removed from the others, keeping that run's formatting.
+    """
+    elements = _text_elements(paragraph)
+    texts = [element.text or '' for element in elements]
+    spans = []
+    offset = 0
+    for text in texts:
+        spans.append((offset, offset + len(text)))
+        offset += len(text)
+
+    def locate(position):
+        """Return (element index, offset within it) of a character of the merged text"""
+        for index, (start, end) in enumerate(spans):
+            if start <= position < end:
+                return index, position - start
+
+    # Last match first, so the offsets of earlier matches stay valid
+    for match in reversed(list(PLACEHOLDER.finditer(''.join(texts)))):
+        replacement = replace(match)
+        first, first_offset = locate(match.start())
+        last, last_offset = locate(match.end() - 1)
+        if first == last:
+            if replacement == match.group(0):
+                continue
+            text = texts[first]
+            texts[first] = text[:first_offset] + replacement + text[last_offset + 1:]
+        else:
+            texts[first] = texts[first][:first_offset] + replacement
+            for index in range(first + 1, last):
+                texts[index] = ''
+            texts[last] = texts[last][last_offset + 1:]
+        for index in range(first, last + 1):
+            elements[index].text = texts[index]
+            elements[index].set(XML_SPACE, 'preserve')
+
+
+def _paragraph(text):
+    """Return a plain paragraph holding ``text``, or a page break when ``text`` is None"""
+    paragraph = etree.Element(W_P)
+    run = etree.SubElement(paragraph, W_R)
+    if text is None:
+        etree.SubElement(run, qn('w:br')).set(qn('w:type'), 'page')
+    else:
+        etree.SubElement(run, W_T).text = text
+    return paragraph
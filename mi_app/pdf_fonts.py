@@ -0,0 +1,228 @@
+import hashlib
+import os
+import pickle
+import re
+import threading
+import types
+
+from fpdf import FPDF
+from fpdf.ttfonts import TTFontFile
+
+from mi_app.utils import atomic_path, get_cache_dir
+
+# Family name the Unicode font is registered under in every UnicodeFPDF
+UNICODE_FAMILY = "Unicode"
+
+# TrueType fonts with full Latin coverage, in order of preference. Each entry
+# maps an FPDF style to a file name; the first directory holding the regular
+# style of an entry wins.
+FONT_CANDIDATES = (
+    {'': "DejaVuSans.ttf", 'B': "DejaVuSans-Bold.ttf", 'I': "DejaVuSans-Oblique.ttf"},
+    {'': "arial.ttf", 'B': "arialbd.ttf", 'I': "ariali.ttf"},
+    {'': "Arial.ttf", 'B': "Arial Bold.ttf", 'I': "Arial Italic.ttf"},
+    {'': "LiberationSans-Regular.ttf", 'B': "LiberationSans-Bold.ttf", 'I': "LiberationSans-Italic.ttf"},
+)
+
+FONT_DIRS = (
+    os.environ.get('MI_APP_FONT_DIR', ''),
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu",
+    "/usr/share/fonts/TTF",
+    "/usr/share/fonts/truetype/liberation",
+    os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), "Fonts"),
+    "/Library/Fonts",
+    "/System/Library/Fonts/Supplemental",
+)
+
+def find_unicode_font():
+    """
+    Locate a TrueType font family usable for Spanish text.
+
+    Returns:
+        dict: FPDF style -> font file path, or None when no candidate is installed
+    """
+    for candidate in FONT_CANDIDATES:
+        for directory in FONT_DIRS:
+            if not directory or not os.path.exists(os.path.join(directory, candidate[''])):
+                continue
+            return {
+                style: os.path.join(directory, name)
+                for style, name in candidate.items()
+                if os.path.exists(os.path.join(directory, name))
+            }
+    return None
+
+
+class UnicodeFPDF(FPDF):
+    """
+    FPDF whose TrueType fonts are parsed once and cached on disk.
+
+    PyFPDF parses the whole font file in ``add_font`` to get its metrics and
+    again in ``output`` to build the embedded subset. Here the metrics are
+    kept in memory, shared by every instance of the process, and pickled to
+    the cache directory for later runs. Subsets are cached on disk as well,
+    keyed by the font file and the characters used, so the same document
+    content never parses the font again.
+    """
+
+    _metrics = {}
+    _metrics_lock = threading.Lock()
+
+    def add_font(self, family, style='', fname='', uni=False):
+        if not uni:
+            return super().add_font(family, style, fname, uni)
+
+        family = family.lower()
+        style = style.upper()
+        if style == 'IB':
+            style = 'BI'
+        fontkey = family + style
+        if fontkey in self.fonts:
+            return
+
+        font_dict, cache_path = self._load_metrics(fname, fontkey)
+        # Digits are always part of the subset when page numbers are aliased
+        first_chars = 57 if hasattr(self, 'str_alias_nb_pages') else 32
+        self.fonts[fontkey] = {
+            'i': len(self.fonts) + 1, 'type': font_dict['type'],
+            'name': font_dict['name'], 'desc': font_dict['desc'],
+            'up': font_dict['up'], 'ut': font_dict['ut'],
+            'cw': font_dict['cw'],
+            'ttffile': font_dict['ttffile'], 'fontkey': fontkey,
+            'subset': _Subset(range(first_chars)), 'unifilename': cache_path,
+        }
+        self.font_files[fontkey] = {'length1': font_dict['originalsize'], 'type': "TTF",
+                                    'ttffile': font_dict['ttffile']}
+        self.font_files[fname] = {'type': "TTF"}
+
+    def _putfonts(self):
+        _putfonts_with_cached_subsets(self)
+
+    @classmethod
+    def _load_metrics(cls, ttf_path, fontkey):
+        """Return ``(font_dict, cache_path)`` from memory, disk or the font file itself"""
+        key = _font_key(ttf_path)
+        cache_path = os.path.join(get_cache_dir('fonts'), f"{key}.pkl")
+        with cls._metrics_lock:
+            font_dict = cls._metrics.get(key)
+        if font_dict is not None:
+            return font_dict, cache_path
+
+        font_dict = _read_pickle(cache_path)
+        if font_dict is None:
+            font_dict = _parse_metrics(ttf_path, fontkey)
+            _write_pickle(cache_path, font_dict)
+        with cls._metrics_lock:
+            cls._metrics[key] = font_dict
+        return font_dict, cache_path
+
+
+class _Subset(list):
+    """Character subset of a font with O(1) membership tests.
+
+    FPDF appends every character it writes to the subset, repeats included,
+    and tests membership for every code point of the font when writing the
+    width table. Repeats are dropped here, so the subset stays as small as
+    the set of distinct characters however much text is written.
+    """
+
+    def __init__(self, chars=()):
+        super().__init__(dict.fromkeys(chars))
+        self._members = set(self)
+
+    def append(self, char):
+        if char not in self._members:
+            super().append(char)
+            self._members.add(char)
+
+    def __contains__(self, char):
+        return char in self._members
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._members = set(self)
+
+
+class _CachedSubsetFontFile(TTFontFile):
+    """TTFontFile whose subsets are cached on disk by font file and characters"""
+
+    def makeSubset(self, file, subset):
+        digest = hashlib.sha256(f"{_font_key(file)}:{list(subset)}".encode('utf-8')).hexdigest()[:32]
+        cache_path = os.path.join(get_cache_dir('fonts', 'subsets'), f"{digest}.pkl")
+        cached = _read_pickle(cache_path)
+        if cached is not None:
+            stream, self.codeToGlyph, self.maxUni = cached
+            return stream
+
+        stream = super().makeSubset(file, subset)
+        _write_pickle(cache_path, (stream, self.codeToGlyph, self.maxUni))
+        return stream
+
+
+def _with_cached_subsets(putfonts):
+    """Return a copy of FPDF._putfonts that builds font subsets with _CachedSubsetFontFile.
+
+    _putfonts looks TTFontFile up in the globals of fpdf.fpdf on every call.
+    The copy runs the same code against a private copy of those globals, so
+    the fpdf module itself is never patched and other FPDF instances and
+    threads are unaffected.
+    """
+    namespace = dict(putfonts.__globals__, TTFontFile=_CachedSubsetFontFile)
+    return types.FunctionType(putfonts.__code__, namespace, putfonts.__name__,
+                              putfonts.__defaults__, putfonts.__closure__)
+
+
+_putfonts_with_cached_subsets = _with_cached_subsets(FPDF._putfonts)
+
+
+def _font_key(ttf_path):
+    """Identify a font file by path and content version"""
+    stat = os.stat(ttf_path)
+    identity = f"{os.path.abspath(ttf_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:32]
+
+
+def _parse_metrics(ttf_path, fontkey):
+    """Parse a TrueType file into the font dict FPDF.add_font builds"""
+    ttf = TTFontFile()
+    ttf.getMetrics(ttf_path)
+    desc = {
+        'Ascent': int(round(ttf.ascent, 0)),
+        'Descent': int(round(ttf.descent, 0)),
+        'CapHeight': int(round(ttf.capHeight, 0)),
+        'Flags': ttf.flags,
+        'FontBBox': "[%s %s %s %s]" % tuple(int(round(value, 0)) for value in ttf.bbox[:4]),
+        'ItalicAngle': int(ttf.italicAngle),
+        'StemV': int(round(ttf.stemV, 0)),
+        'MissingWidth': int(round(ttf.defaultWidth, 0)),
+    }
+    return {
+        'name': re.sub('[ ()]', '', ttf.fullName),
+        'type': 'TTF',
+        'desc': desc,
+        'up': round(ttf.underlinePosition),
+        'ut': round(ttf.underlineThickness),
+        'ttffile': ttf_path,
+        'fontkey': fontkey,
+        'originalsize': os.stat(ttf_path).st_size,
+        'cw': ttf.charWidths,
+    }
+
+
+def _read_pickle(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _write_pickle(path, value):
+    try:
+        with atomic_path(path) as tmp_path, open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # A read-only cache only costs the parse on the next run
+        pass
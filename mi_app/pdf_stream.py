@@ -0,0 +1,168 @@
+import os
+import zlib
+
+from fpdf.php import sprintf
+
+from mi_app.pdf_fonts import UnicodeFPDF
+
+
+class StreamingFPDF(UnicodeFPDF):
+    """
+    FPDF that writes every page to disk as soon as the page is finished.
+
+    PyFPDF keeps the content of all pages in memory and serializes the whole
+    document in ``output()``. Here each finished page is compressed and
+    written straight to the output file with its page object, then dropped,
+    so memory stays bounded by one page no matter how long the document is.
+    Object numbers are the ones FPDF assigns (page ``n`` is object
+    ``1 + 2n``), and the page tree, fonts and images are written at the end
+    as usual, so the file is laid out exactly like a regular FPDF output.
+
+    The document is written to ``<output_path>.part`` and moved into place
+    when it is closed. ``alias_nb_pages`` is not supported, since earlier
+    pages are already on disk when the page count becomes known.
+
+    The overridden methods mirror PyFPDF 1.7.2, the version pinned in
+    requirements.txt; tests/test_pdf_stream.py compares the output with it.
+    """
+
+    def __init__(self, output_path, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.output_path = output_path
+        self._part_path = f"{output_path}.part"
+        self._sink = None
+        # Bytes already written to the sink; object offsets count from the file start
+        self._written = 0
+
+    def alias_nb_pages(self, alias='{nb}'):
+        self.error('alias_nb_pages is not supported when streaming pages to disk')
+
+    def output(self, name='', dest=''):
+        """Finish the document; pages are already in ``output_path``"""
+        if name and os.path.abspath(name) != os.path.abspath(self.output_path):
+            self.error('A streamed PDF can only be written to its own output_path')
+        if self.state < 3:
+            self.close()
+        return ''
+
+    def discard(self):
+        """Drop a document that will not be finished, removing the partial file"""
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        if os.path.exists(self._part_path):
+            os.remove(self._part_path)
+        self.state = 3
+
+    def _endpage(self):
+        super()._endpage()
+        self._put_page(self.page)
+        # The page is on disk; keep an empty placeholder so page numbers stay valid
+        self.pages[self.page] = ''
+
+    def _newobj(self):
+        self.n += 1
+        self.offsets[self.n] = self._written + len(self.buffer)
+        self._out(str(self.n) + ' 0 obj')
+
+    def _put_page(self, n):
+        """Write page ``n`` and its content stream, as FPDF._putpages does"""
+        if self._sink is None:
+            self._sink = open(self._part_path, 'wb')
+            self._putheader()
+
+        w_pt, h_pt = (self.fw_pt, self.fh_pt) if self.def_orientation == 'P' else (self.fh_pt, self.fw_pt)
+        self._newobj()
+        self._out('<</Type /Page')
+        self._out('/Parent 1 0 R')
+        if n in self.orientation_changes:
+            self._out(sprintf('/MediaBox [0 0 %.2f %.2f]', h_pt, w_pt))
+        self._out('/Resources 2 0 R')
+        if self.page_links and n in self.page_links:
+            annots = '/Annots ['
+            for pl in self.page_links[n]:
+                rect = sprintf('%.2f %.2f %.2f %.2f', pl[0], pl[1], pl[0] + pl[2], pl[1] - pl[3])
+                annots += '<</Type /Annot /Subtype /Link /Rect [' + rect + '] /Border [0 0 0] '
+                if isinstance(pl[4], str):
+                    annots += '/A <</S /URI /URI ' + self._textstring(pl[4]) + '>>>>'
+                else:
+                    link = self.links[pl[4]]
+                    h = w_pt if link[0] in self.orientation_changes else h_pt
+                    annots += sprintf('/Dest [%d 0 R /XYZ 0 %.2f null]>>', 1 + 2 * link[0], h - link[1] * self.k)
+            self._out(annots + ']')
+        if self.pdf_version > '1.3':
+            self._out('/Group <</Type /Group /S /Transparency /CS /DeviceRGB>>')
+        self._out('/Contents ' + str(self.n + 1) + ' 0 R>>')
+        self._out('endobj')
+
+        if self.compress:
+            content = zlib.compress(self.pages[n].encode('latin1'))
+            stream_filter = '/Filter /FlateDecode '
+        else:
+            content = self.pages[n]
+            stream_filter = ''
+        self._newobj()
+        self._out('<<' + stream_filter + '/Length ' + str(len(content)) + '>>')
+        self._putstream(content)
+        self._out('endobj')
+        self._flush()
+
+    def _putpages(self):
+        # Pages are already written; only the page tree is left
+        w_pt, h_pt = (self.fw_pt, self.fh_pt) if self.def_orientation == 'P' else (self.fh_pt, self.fw_pt)
+        self.offsets[1] = self._written + len(self.buffer)
+        self._out('1 0 obj')
+        self._out('<</Type /Pages')
+        self._out('/Kids [' + ''.join(f"{3 + 2 * i} 0 R " for i in range(self.page)) + ']')
+        self._out('/Count ' + str(self.page))
+        self._out(sprintf('/MediaBox [0 0 %.2f %.2f]', w_pt, h_pt))
+        self._out('>>')
+        self._out('endobj')
+
+    def _putresources(self):
+        self._putfonts()
+        self._putimages()
+        self.offsets[2] = self._written + len(self.buffer)
+        self._out('2 0 obj')
+        self._out('<<')
+        self._putresourcedict()
+        self._out('>>')
+        self._out('endobj')
+
+    def _enddoc(self):
+        self._putpages()
+        self._putresources()
+        self._newobj()
+        self._out('<<')
+        self._putinfo()
+        self._out('>>')
+        self._out('endobj')
+        self._newobj()
+        self._out('<<')
+        self._putcatalog()
+        self._out('>>')
+        self._out('endobj')
+        xref_offset = self._written + len(self.buffer)
+        self._out('xref')
+        self._out('0 ' + str(self.n + 1))
+        self._out('0000000000 65535 f ')
+        for i in range(1, self.n + 1):
+            self._out(sprintf('%010d 00000 n ', self.offsets[i]))
+        self._out('trailer')
+        self._out('<<')
+        self._puttrailer()
+        self._out('>>')
+        self._out('startxref')
+        self._out(xref_offset)
+        self._out('%%EOF')
+        self.state = 3
+        self._flush()
+        self._sink.close()
+        os.replace(self._part_path, self.output_path)
+
+    def _flush(self):
+        """Move the serialized objects from the buffer to the output file"""
+        data = self.buffer.encode('latin1')
+        self._sink.write(data)
+        self._written += len(data)
+        self.buffer = ''
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Reads that can run at once. A read the user has moved away from cannot be
+# stopped once it is on the wire, so the next identifier gets a thread of its
+# own instead of queueing behind it.
+READ_WORKERS = 3
+
+
+class SheetPrefetcher:
+    """
+    Reads a spreadsheet in the background before it is asked for.
+
+    Only the latest request is kept: a new identifier replaces the previous
+    one, whose result is thrown away (a read already on the wire finishes,
+    but nobody waits for it). ``take`` hands the prefetched read over only
+    when it is for exactly the identifier being loaded, and ``read`` falls
+    back to a new background read otherwise.
+
+    Reads call ``read(access_type, identifier)``, ``reader.read_sheets`` by
+    default; the Futures hold whatever it returns.
+    """
+
+    def __init__(self, reader, read=None):
+        self.reader = reader
+        self._read = read or reader.read_sheets
+        self._executor = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="prefetch")
+        self._key = None
+        self._future = None
+
+    def request(self, access_type, identifier):
+        """Start reading ``identifier`` unless that read is already under way"""
+        key = (access_type, identifier.strip())
+        if key == self._key:
+            return
+        self.discard()
+        self._key = key
+        self._future = self._executor.submit(self._read, access_type, key[1])
+
+    def take(self, access_type, identifier):
+        """
+        Return the Future of a prefetched read of ``identifier`` and forget it.
+
+        Returns:
+            Future or None: None when nothing was prefetched for this identifier
+        """
+        if self._key != (access_type, identifier.strip()):
+            return None
+        future = self._future
+        self._key = self._future = None
+        return future
+
+    def read(self, access_type, identifier):
+        """
+        Return a Future of the read of ``identifier``, reusing the prefetched one.
+
+        A prefetch that was cancelled or already failed is replaced by a new
+        read, so a transient error while typing is not reported.
+        """
+        future = self.take(access_type, identifier)
+        if future is None or future.cancelled() or (future.done() and future.exception() is not None):
+            future = self._executor.submit(self._read, access_type, identifier.strip())
+        return future
+
+    def invalidate(self, access_type, identifier):
+        """Drop the current prefetch if it is for anything but ``identifier``"""
+        if self._key is not None and self._key != (access_type, identifier.strip()):
+            self.discard()
+
+    def discard(self):
+        """Drop the current prefetch, cancelling it if it has not started"""
+        if self._future is not None:
+            self._future.cancel()
+        self._key = self._future = None
@@ -0,0 +1,127 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import pandas as pd
+
+from mi_app.docx_generator import DocumentGenerator, HEADER_FIELDS
+from mi_app.sheet_diff import JobKey
+
+# Job fields that must hold a value for a descriptor to make sense
+REQUIRED_JOB_FIELDS = ('n_jerarquico', 'puesto', 'a_trabajo', 'objective_position', 'responsibilities')
+
+# Raw sheet layout, mirrored from DocumentGenerator._process_data: level and
+# title start at row 10 in columns 2-3, the job details at row 11 in column 4.
+KEY_FIRST_ROW = 10
+DATA_FIRST_ROW = 11
+KEY_COLUMNS = slice(2, 4)
+
+
+@dataclass
+class PreflightReport:
+    """Problems found in a sheet before any document is generated.
+
+    Row numbers are 0-based positions in the raw sheet, as loaded. Only
+    misaligned rows stop a run; the other problems are warnings. Duplicated
+    jobs still get their own descriptor, since jobs are generated by position.
+    """
+
+    missing_header_cells: List[str] = field(default_factory=list)
+    misaligned_rows: List[int] = field(default_factory=list)
+    duplicate_keys: Dict[JobKey, List[int]] = field(default_factory=dict)
+    empty_required_fields: Dict[str, List[int]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True when no problem was found"""
+        return not (self.missing_header_cells or self.misaligned_rows
+                    or self.duplicate_keys or self.empty_required_fields)
+
+    @property
+    def can_generate(self) -> bool:
+        """False when the job table cannot be built"""
+        return not self.misaligned_rows
+
+    def summary(self) -> str:
+        """Return a human readable list of the problems"""
+        lines = []
+        if self.missing_header_cells:
+            lines.append(f"Missing header cells: {', '.join(self.missing_header_cells)}")
+        if self.misaligned_rows:
+            lines.append(f"Rows without level or job title: {_rows(self.misaligned_rows)}")
+        for (level, title), rows in self.duplicate_keys.items():
+            lines.append(f"Duplicated job '{level} / {title}' at rows {_rows(rows)}")
+        for name, rows in self.empty_required_fields.items():
+            lines.append(f"Empty '{name}' at rows {_rows(rows)}")
+        return '\n'.join(lines) if lines else "No problems found"
+
+
+def preflight(dataframes: pd.DataFrame, generator: DocumentGenerator = None,
+              required_fields: Sequence[str] = REQUIRED_JOB_FIELDS) -> PreflightReport:
+    """Check a whole sheet in one vectorized pass before a batch run.
+
+    Args:
+        dataframes: Raw sheet as returned by GoogleSheetsReader.read_sheets
+        generator: DocumentGenerator used to extract the job table
+        required_fields: Job fields that must not be empty
+
+    Returns:
+        PreflightReport: Every problem found, grouped by kind
+    """
+    generator = generator or DocumentGenerator()
+    report = PreflightReport(missing_header_cells=_missing_header_cells(dataframes))
+
+    key_rows, data_rows = _section_rows(dataframes)
+    if len(key_rows) != len(data_rows) or (key_rows != data_rows).any():
+        # The job details would be paired with the wrong level/title
+        report.misaligned_rows = sorted(set(key_rows).symmetric_difference(data_rows))
+        return report
+
+    jobs = generator.job_table(dataframes).fillna('').astype(str)
+    jobs.index = data_rows
+
+    keys = pd.DataFrame({
+        'level': jobs.iloc[:, 0].str.strip().str.lower(),
+        'title': jobs.iloc[:, 1].str.strip().str.lower(),
+    })
+    duplicated = keys[keys.duplicated(keep=False)]
+    for key, rows in duplicated.groupby(['level', 'title']).groups.items():
+        report.duplicate_keys[key] = rows.tolist()
+
+    present = [name for name in required_fields if name in jobs.columns]
+    empty = jobs[present].apply(lambda column: column.str.strip() == '')
+    for name in present:
+        rows = empty.index[empty[name].to_numpy()]
+        if len(rows):
+            report.empty_required_fields[name] = rows.tolist()
+    # Columns missing from the sheet altogether are empty for every job
+    for name in required_fields:
+        if name not in jobs.columns and len(jobs):
+            report.empty_required_fields[name] = jobs.index.tolist()
+    return report
+
+
+def _missing_header_cells(dataframes: pd.DataFrame) -> List[str]:
+    """Return the header fields whose cell is empty or outside the sheet"""
+    missing = []
+    rows, cols = dataframes.shape
+    for name, (row, col) in HEADER_FIELDS.items():
+        if row >= rows or col >= cols:
+            missing.append(name)
+            continue
+        value = dataframes.iloc[row, col]
+        if pd.isna(value) or not str(value).strip():
+            missing.append(name)
+    return missing
+
+
+def _section_rows(dataframes: pd.DataFrame) -> Tuple[pd.Index, pd.Index]:
+    """Return the raw rows holding a level/title pair and the rows holding job details"""
+    keys = dataframes.iloc[KEY_FIRST_ROW:, KEY_COLUMNS].replace('', pd.NA).replace(' ', pd.NA)
+    key_rows = keys.index[keys.notna().all(axis=1).to_numpy()]
+    data_rows = dataframes.index[DATA_FIRST_ROW:]
+    return key_rows, data_rows
+
+
+def _rows(rows: List[int], limit: int = 10) -> str:
+    shown = ', '.join(str(row) for row in rows[:limit])
+    return shown + (f" (+{len(rows) - limit} more)" if len(rows) > limit else '')
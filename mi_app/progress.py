@@ -0,0 +1,124 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+
+# Number of recent completions the throughput is measured over
+RATE_WINDOW = 20
+
+
+class ProgressTracker:
+    """
+    Counts the documents of a generation run and derives throughput and ETA.
+
+    The rate is measured over the last RATE_WINDOW completions, so it follows
+    the workers once they are warm instead of being dragged down by start-up.
+    """
+
+    def __init__(self, total=0):
+        self.total = total
+        self.done = 0
+        self.failures = []
+        self.stage = "Waiting"
+        self.started = time.monotonic()
+        self._completions = []
+
+    def set_stage(self, stage):
+        self.stage = stage
+
+    def record(self, label, error=None):
+        """Count one finished document; ``error`` is None on success"""
+        self.done += 1
+        if error is not None:
+            self.failures.append((label, error))
+        self._completions.append(time.monotonic())
+        del self._completions[:-RATE_WINDOW]
+
+    @property
+    def rate(self):
+        """Documents per second, or 0.0 before two documents are done"""
+        if len(self._completions) < 2:
+            elapsed = time.monotonic() - self.started
+            return self.done / elapsed if self.done and elapsed > 0 else 0.0
+        span = self._completions[-1] - self._completions[0]
+        return (len(self._completions) - 1) / span if span > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Seconds left at the current rate, or None when unknown"""
+        rate = self.rate
+        if not rate:
+            return None
+        return (self.total - self.done) / rate
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+
+class ProgressPanel(ttk.LabelFrame):
+    """
+    Progress bar, throughput, ETA, stage and failures of a generation run.
+
+    The panel only displays a ProgressTracker; the caller updates the tracker
+    from the Tk thread and calls refresh(). ``on_cancel`` is called when the
+    Cancel button is pressed.
+    """
+
+    def __init__(self, parent, on_cancel=None, **kwargs):
+        super().__init__(parent, text="Progress", **kwargs)
+        self.on_cancel = on_cancel
+        self.stage_var = tk.StringVar(value="")
+        self.counts_var = tk.StringVar(value="")
+        self.rate_var = tk.StringVar(value="")
+
+        ttk.Label(self, textvariable=self.stage_var).grid(row=0, column=0, columnspan=2, sticky="w", padx=5)
+        self.bar = ttk.Progressbar(self, mode="determinate")
+        self.bar.grid(row=1, column=0, sticky="ew", padx=5, pady=5)
+        self.cancel_button = ttk.Button(self, text="Cancel", command=self._cancel)
+        self.cancel_button.grid(row=1, column=1, padx=5, pady=5)
+        ttk.Label(self, textvariable=self.counts_var).grid(row=2, column=0, sticky="w", padx=5)
+        ttk.Label(self, textvariable=self.rate_var).grid(row=2, column=1, sticky="e", padx=5)
+
+        self.failures_list = tk.Listbox(self, height=3)
+        self.failures_list.grid(row=3, column=0, columnspan=2, sticky="ew", padx=5, pady=(5, 0))
+        self.columnconfigure(0, weight=1)
+
+    def refresh(self, tracker):
+        """Show the current state of ``tracker``"""
+        self.stage_var.set(f"Stage: {tracker.stage}")
+        self.bar.configure(maximum=max(tracker.total, 1), value=tracker.done)
+        self.counts_var.set(
+            f"{tracker.done} / {tracker.total} documents, {len(tracker.failures)} failed"
+        )
+        eta = tracker.eta
+        eta_text = _format_seconds(eta) if eta is not None else "--"
+        self.rate_var.set(f"{tracker.rate:.1f} docs/s, ETA {eta_text}")
+
+        shown = self.failures_list.size()
+        for label, error in tracker.failures[shown:]:
+            self.failures_list.insert(tk.END, f"{label}: {error}")
+
+    def finish(self, tracker, cancelled=False):
+        """Freeze the panel once the run is over"""
+        tracker.set_stage(
+            f"Cancelled after {_format_seconds(tracker.elapsed)}" if cancelled
+            else f"Finished in {_format_seconds(tracker.elapsed)}"
+        )
+        self.refresh(tracker)
+        self.cancel_button.configure(state="disabled")
+
+    def reset(self):
+        self.failures_list.delete(0, tk.END)
+        self.cancel_button.configure(state="normal", text="Cancel")
+
+    def _cancel(self):
+        self.cancel_button.configure(state="disabled", text="Cancelling...")
+        if self.on_cancel:
+            self.on_cancel()
+
+
+def _format_seconds(seconds):
+    seconds = int(round(seconds))
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
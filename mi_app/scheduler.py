@@ -0,0 +1,116 @@
+import random
+import threading
+import time
+from collections import deque
+
+# Google answers with these codes when a quota is exhausted or a backend is
+# temporarily unavailable; any other error is returned to the caller at once.
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Default per-user read quota of the Sheets and Drive APIs
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        """
+        Args:
+            rate_per_minute: Number of tokens added to the bucket every minute
+            capacity: Maximum burst size. Defaults to the per-minute rate.
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity else rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RequestScheduler:
+    """
+    Schedules Google API calls within the configured quota.
+
+    Every call first takes a token from a bucket sized to the quota, so bulk
+    jobs run at the highest sustainable rate. Calls rejected with 429 or a 5xx
+    status are retried with exponential backoff and full jitter.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, max_retries=5,
+                 base_delay=1.0, max_delay=64.0):
+        self.bucket = TokenBucket(requests_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.failures = 0
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run ``func(*args, **kwargs)`` once the quota allows it.
+
+        Raises:
+            Exception: The last error raised by ``func`` when it is not retryable
+                or the retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            self._record_request()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if _status_code(e) not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    with self._lock:
+                        self.failures += 1
+                    raise
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            time.sleep(random.uniform(0, delay))
+
+    def requests_per_minute(self):
+        """Return the number of requests sent during the last 60 seconds"""
+        with self._lock:
+            self._trim(time.monotonic())
+            return len(self._sent)
+
+    def metrics(self):
+        """Return a snapshot of the scheduler counters"""
+        return {
+            'requests_per_minute': self.requests_per_minute(),
+            'retries': self.retries,
+            'failures': self.failures,
+        }
+
+    def _record_request(self):
+        now = time.monotonic()
+        with self._lock:
+            self._sent.append(now)
+            self._trim(now)
+
+    def _trim(self, now):
+        while self._sent and now - self._sent[0] > 60:
+            self._sent.popleft()
+
+
+def _status_code(error):
+    """Return the HTTP status carried by a gspread or requests error, if any"""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
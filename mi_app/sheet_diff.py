@@ -0,0 +1,134 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from mi_app.docx_generator import DocumentGenerator, HEADER_FIELDS
+
+JobKey = Tuple[str, str]
+
+# JobKey plus the occurrence of that key in the sheet (0 for the first row)
+RowKey = Tuple[str, str, int]
+
+
+@dataclass
+class SheetDiff:
+    """Differences between two snapshots of the same job descriptor sheet.
+
+    Jobs are identified by their normalized (level hierarchy, job title) key
+    and the occurrence of that key, so rows sharing a key are compared with
+    the row at the same occurrence in the other snapshot instead of being
+    dropped.
+    """
+
+    added: List[RowKey] = field(default_factory=list)
+    removed: List[RowKey] = field(default_factory=list)
+    modified: Dict[RowKey, List[str]] = field(default_factory=dict)
+    header_changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    # Job table position of every row of the new snapshot
+    positions: Dict[RowKey, int] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        """True when both snapshots hold the same data"""
+        return not (self.added or self.removed or self.modified or self.header_changes)
+
+    @property
+    def jobs_to_render(self) -> List[int]:
+        """Job table positions, in the new snapshot, of the descriptors that are out of date.
+
+        These are the added and modified jobs, or every job when the header
+        changed, ready to be passed to generate_descriptors.
+        """
+        if self.header_changes:
+            return sorted(self.positions.values())
+        return sorted(self.positions[key] for key in list(self.added) + list(self.modified))
+
+    def report(self) -> str:
+        """Return a human readable change report"""
+        lines = []
+        for name, (old, new) in self.header_changes.items():
+            lines.append(f"~ header {name}: {old!r} -> {new!r}")
+        for key in self.added:
+            lines.append(f"+ {_label(key)}")
+        for key in self.removed:
+            lines.append(f"- {_label(key)}")
+        for key, columns in self.modified.items():
+            lines.append(f"~ {_label(key)}: {', '.join(columns)}")
+        return '\n'.join(lines) if lines else "No changes"
+
+
+def keyed_job_table(jobs: pd.DataFrame) -> pd.DataFrame:
+    """Index a job table by its normalized (level, title) key and occurrence.
+
+    Values are turned into strings with missing cells as '' so they compare
+    cleanly. Rows repeating a key are numbered in sheet order (0, 1, ...), so
+    every row keeps a unique index entry.
+    """
+    table = jobs.fillna('').astype(str)
+    levels = table.iloc[:, 0].str.strip().str.lower()
+    titles = table.iloc[:, 1].str.strip().str.lower()
+    occurrences = pd.DataFrame({'level': levels, 'title': titles}).groupby(['level', 'title']).cumcount()
+    table.index = pd.MultiIndex.from_arrays([levels, titles, occurrences], names=['level', 'title', 'occurrence'])
+    return table
+
+
+def diff_snapshots(old: pd.DataFrame, new: pd.DataFrame, generator: DocumentGenerator = None) -> SheetDiff:
+    """Compare two loaded sheets row by row.
+
+    The comparison is done on whole aligned frames, so it stays in the
+    milliseconds range for sheets with thousands of rows.
+
+    Args:
+        old: Previously loaded raw sheet
+        new: Newly loaded raw sheet
+        generator: DocumentGenerator used to extract the job tables
+
+    Returns:
+        SheetDiff: Added, removed and modified jobs plus header cell changes
+    """
+    generator = generator or DocumentGenerator()
+    old_jobs = keyed_job_table(generator.job_table(old))
+    new_jobs = keyed_job_table(generator.job_table(new))
+
+    diff = SheetDiff(
+        added=new_jobs.index.difference(old_jobs.index, sort=False).tolist(),
+        removed=old_jobs.index.difference(new_jobs.index, sort=False).tolist(),
+        header_changes=_diff_header(old, new),
+        positions=dict(zip(new_jobs.index, range(len(new_jobs)))),
+    )
+
+    common = old_jobs.index.intersection(new_jobs.index, sort=False)
+    columns = old_jobs.columns.union(new_jobs.columns, sort=False)
+    before = old_jobs.reindex(index=common, columns=columns, fill_value='')
+    after = new_jobs.reindex(index=common, columns=columns, fill_value='')
+
+    changed = before.ne(after)
+    changed_rows = changed.any(axis=1).to_numpy()
+    column_names = [str(column) for column in columns]
+    for key, mask in zip(common[changed_rows], changed.to_numpy()[changed_rows]):
+        diff.modified[key] = [name for name, is_changed in zip(column_names, mask) if is_changed]
+    return diff
+
+
+def _label(key: RowKey) -> str:
+    level, title, occurrence = key
+    return f"{level} / {title}" + (f" (#{occurrence + 1})" if occurrence else "")
+
+
+def _diff_header(old: pd.DataFrame, new: pd.DataFrame) -> Dict[str, Tuple[Any, Any]]:
+    """Compare the cover and page header cells of two sheets"""
+    changes = {}
+    for name, (row, col) in HEADER_FIELDS.items():
+        before, after = _cell(old, row, col), _cell(new, row, col)
+        if before != after:
+            changes[name] = (before, after)
+    return changes
+
+
+def _cell(dataframes: pd.DataFrame, row: int, col: int) -> str:
+    """Return a cell as a string, '' when it is empty or outside the sheet"""
+    if row >= dataframes.shape[0] or col >= dataframes.shape[1]:
+        return ''
+    value = dataframes.iloc[row, col]
+    return '' if pd.isna(value) else str(value)
@@ -0,0 +1,212 @@
+import os
+import re
+from typing import Optional, Sequence
+
+import pandas as pd
+from jinja2 import Environment
+from markupsafe import Markup, escape
+
+from mi_app.docx_generator import DocumentGenerator, IMAGE_FIELDS, JOB_FIELDS
+from mi_app.image_cache import is_image_link
+from mi_app.utils import descriptor_filenames, get_markdown_template_path
+
+# markdown is optional: without it only Markdown output is available
+MARKDOWN_AVAILABLE = True
+try:
+    import markdown
+except ImportError:
+    MARKDOWN_AVAILABLE = False
+
+# File extension of each output format
+OUTPUT_FORMATS = {
+    'markdown': '.md',
+    'html': '.html',
+}
+
+# Python-Markdown extensions needed by the descriptor template (tables)
+MARKDOWN_EXTENSIONS = ('tables', 'sane_lists')
+
+# Jinja expressions and statements, kept out of the Markdown conversion
+JINJA_TAG = re.compile(r'{{.*?}}|{%.*?%}', re.DOTALL)
+
+
+class TextGenerator:
+    """Renders descriptors as Markdown or HTML from templete_base.md.
+
+    The Markdown template uses the same placeholders as the DOCX template and
+    is compiled by Jinja once per output format, so rendering a descriptor is a
+    string substitution: no zip archive or XML is involved. Sheet processing
+    (header fields and job table) is shared with DocumentGenerator, so both
+    outputs carry the same values.
+
+    For HTML the template itself is converted once with the optional
+    ``markdown`` package, placeholders left intact, and the values are
+    rendered into that HTML as escaped plain text with line breaks kept. The
+    per-file cost is then the same as for Markdown. The result is an HTML
+    fragment, ready to be embedded in a wiki page.
+
+    In Markdown, values have their pipes escaped and their line breaks turned
+    into ``<br>``, so a multi-line cell stays inside its table row.
+    """
+
+    def __init__(self, template_path: Optional[str] = None,
+                 doc_generator: Optional[DocumentGenerator] = None) -> None:
+        """Initialize the TextGenerator.
+
+        Args:
+            template_path: Markdown template. Defaults to templete_base.md.
+            doc_generator: DocumentGenerator used to read the sheet. A new one
+                is created when not given.
+        """
+        self.template_path = template_path or get_markdown_template_path()
+        self.doc_generator = doc_generator or DocumentGenerator()
+        # Compiled template of each output format, built on first use
+        self._templates = {}
+
+    def render(self, header: dict, job_data: Optional[dict], fmt: str = 'markdown') -> str:
+        """Render one descriptor to a string.
+
+        Args:
+            header: Header values, see DocumentGenerator.header_context
+            job_data: Job values, see DocumentGenerator.job_context. None
+                renders the cover only.
+            fmt: 'markdown' or 'html'
+
+        Returns:
+            str: The rendered descriptor
+        """
+        template = self._template(fmt)
+        context = dict(header)
+        if job_data:
+            context.update(_link_images(job_data, fmt))
+        return template.render(context)
+
+    def render_descriptor(self, header: dict, job_data: Optional[dict], output_path: str,
+                          fmt: Optional[str] = None) -> None:
+        """Render one descriptor and save it.
+
+        Args:
+            header: Header values, see DocumentGenerator.header_context
+            job_data: Job values, see DocumentGenerator.job_context
+            output_path: File path to save the descriptor
+            fmt: 'markdown' or 'html'. Defaults to the format matching the
+                extension of output_path, or Markdown.
+        """
+        if fmt is None:
+            fmt = 'html' if output_path.lower().endswith(('.html', '.htm')) else 'markdown'
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(header, job_data, fmt))
+
+    def generate_descriptors(self, dataframes: pd.DataFrame, positions: Sequence[int], output_dir: str,
+                             fmt: str = 'markdown'):
+        """Write the descriptors of several jobs, one file per job.
+
+        The sheet is processed once and every job row is turned into its
+        context in a single pass over the job table, so the per-file cost is
+        the template render and the write.
+
+        Args:
+            dataframes: Raw sheet as returned by GoogleSheetsReader.read_sheets
+            positions: Row positions in the job table to generate
+            output_dir: Directory receiving one file per job, named as
+                descriptor_filenames does
+            fmt: 'markdown' or 'html'
+
+        Yields:
+            tuple: ``(position, output_path)`` as each file is written
+        """
+        extension = OUTPUT_FORMATS[fmt]
+        jobs = self.doc_generator.job_table(dataframes)
+        header = self.doc_generator.header_context(dataframes)
+        records = job_records(jobs)
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Named over the whole table, so a job keeps its file name whichever jobs are selected
+        names = descriptor_filenames(((record['n_jerarquico'], record['puesto']) for record in records), extension)
+        for position in positions:
+            job_data = records[position]
+            output_path = os.path.join(output_dir, names[position])
+            self.render_descriptor(header, job_data, output_path, fmt)
+            yield position, output_path
+
+    def _template(self, fmt: str):
+        """Return the compiled template of an output format"""
+        template = self._templates.get(fmt)
+        if template is not None:
+            return template
+
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {fmt}")
+        if fmt == 'html' and not MARKDOWN_AVAILABLE:
+            raise ValueError("HTML output requires the 'markdown' package")
+
+        try:
+            with open(self.template_path, encoding='utf-8') as f:
+                source = f.read()
+        except OSError as e:
+            raise ValueError(f"Failed to load template: {str(e)}")
+
+        if fmt == 'html':
+            environment = Environment(finalize=_html_value)
+            source = _markdown_to_html(source)
+        else:
+            environment = Environment(keep_trailing_newline=True, finalize=_markdown_value)
+        template = environment.from_string(source)
+        self._templates[fmt] = template
+        return template
+
+
+def job_records(jobs: pd.DataFrame) -> list:
+    """Return the context of every row of the job table, as job_context would.
+
+    Args:
+        jobs: Job table as returned by DocumentGenerator.job_table
+
+    Returns:
+        list: One dict of job values per row, keyed by template placeholder
+    """
+    jobs = jobs.iloc[:, :len(JOB_FIELDS)].astype(object)
+    # Sheets without the trailing optional columns get them empty
+    jobs = jobs.reindex(columns=list(JOB_FIELDS))
+    return jobs.where(jobs.notna(), '').to_dict('records')
+
+
+def _markdown_to_html(source: str) -> str:
+    """Convert a Markdown template to an HTML template, leaving Jinja tags untouched"""
+    tags = []
+
+    def protect(match):
+        tags.append(match.group(0))
+        return f"JINJATAG{len(tags) - 1}X"
+
+    html = markdown.markdown(JINJA_TAG.sub(protect, source), extensions=list(MARKDOWN_EXTENSIONS))
+    return re.sub(r'JINJATAG(\d+)X', lambda match: tags[int(match.group(1))], html)
+
+
+def _html_value(value):
+    """Render a sheet value as HTML text: escaped, with its line breaks kept"""
+    if isinstance(value, Markup):
+        return value
+    return escape(value).replace('\n', Markup('<br>\n'))
+
+
+def _markdown_value(value):
+    """Render a sheet value as Markdown text that cannot break the table row it sits in"""
+    if isinstance(value, Markup):
+        return value
+    text = str(value).replace('\r\n', '\n').replace('\r', '\n')
+    return text.replace('|', '\\|').replace('\n', '<br>')
+
+
+def _link_images(job_data: dict, fmt: str) -> dict:
+    """Turn the image links of the job data into images of the output format"""
+    job_data = dict(job_data)
+    for field in IMAGE_FIELDS:
+        link = job_data.get(field)
+        if not is_image_link(link):
+            continue
+        if fmt == 'html':
+            job_data[field] = Markup('<img src="{}" alt="{}">').format(link.strip(), field)
+        else:
+            job_data[field] = Markup(f"![{field}]({link.strip()})")
+    return job_data
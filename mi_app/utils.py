@@ -1,16 +1,107 @@
 import os
+import re
 import json
 import datetime
-import pandas as pd
+import hashlib
+import threading
+from contextlib import contextmanager
 # Path utilities
 def get_default_template_path():
     """Return the path to the default template file"""
     return os.path.join('mi_app', 'template', 'default_templete.docx')
 
+def get_markdown_template_path():
+    """Return the path to the Markdown descriptor template"""
+    return os.path.join('mi_app', 'template', 'templete_base.md')
+
 def get_credentials_path():
     """Return the path to the credentials file"""
     return 'credentials.json'
 
+def get_cache_dir(*parts):
+    """Return (and create) the per-user cache directory, or a subdirectory of it"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'mi_app', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_scoped_cache_path(name, scope):
+    """
+    Return ``<cache dir>/<name>_<digest>.json`` for a GoogleConnection.account_scope.
+
+    Drive state only means something for one account on one API endpoint, so
+    each scope gets its own file.
+    """
+    digest = hashlib.sha256(scope.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(get_cache_dir(), f'{name}_{digest}.json')
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yield a temporary path next to ``path`` and move it into place once written.
+
+    The temporary name is unique per process and thread, so concurrent writers
+    never share a partial file and readers see the old file or the new one.
+    The temporary file is removed if writing fails.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def safe_filename(text):
+    """Turn a free-text value (e.g. a job title) into a safe file name"""
+    cleaned = re.sub(r'[^\w\- ]+', '', str(text), flags=re.UNICODE).strip()
+    return re.sub(r'\s+', '_', cleaned) or 'document'
+
+def descriptor_filenames(jobs, extension, taken=None):
+    """
+    Return the file name of each job's descriptor: '<level>-<title><extension>'.
+
+    Jobs that would share a name (repeated rows, or values that only differ in
+    case or in characters safe_filename drops) get '_2', '_3'... in order, so
+    no descriptor overwrites another one written to the same folder.
+
+    :param jobs: ``(level, title)`` pairs
+    :param extension: File extension, with its dot
+    :param taken: Case-folded names already used in the folder; updated in place
+    """
+    taken = set() if taken is None else taken
+    names = []
+    for level, title in jobs:
+        stem = f"{safe_filename(level)}-{safe_filename(title)}"
+        name, count = f"{stem}{extension}", 1
+        while name.casefold() in taken:
+            count += 1
+            name = f"{stem}_{count}{extension}"
+        taken.add(name.casefold())
+        names.append(name)
+    return names
+
+# Shapes of complete spreadsheet identifiers, used before reading ahead
+SPREADSHEET_URL = re.compile(r'https://docs\.google\.com/spreadsheets/d/[\w-]{20,}')
+SPREADSHEET_KEY = re.compile(r'[\w-]{25,}')
+
+
+def looks_like_spreadsheet(access_type, identifier):
+    """
+    Cheap local check that an identifier is complete enough to be worth opening.
+
+    Only URLs and keys are recognized; names can be anything, so they never
+    look complete while being typed.
+    """
+    identifier = identifier.strip()
+    if access_type == "url":
+        return SPREADSHEET_URL.match(identifier) is not None
+    if access_type == "key":
+        return SPREADSHEET_KEY.fullmatch(identifier) is not None
+    return False
+
+
 # Validation utilities
 def validate_json_file(file_path, required_fields=None):
     """
@@ -53,6 +144,8 @@ def clean_data(data_fields: dict, dataframes) -> dict:
         dict: A cleaned dictionary with field names as keys and corresponding values from dataframes,
               where NaN values are replaced with empty strings.
     """
+    import pandas as pd
+
     cleaned_data = {
         field: '' if pd.isna(dataframes.iloc[row, col]) else dataframes.iloc[row, col]
         for field, (row, col) in data_fields.items()
@@ -0,0 +1,213 @@
+import argparse
+import json
+import logging
+import os
+import threading
+
+from mi_app.batch import generate_descriptors
+from mi_app.preflight import preflight
+from mi_app.sheet_diff import diff_snapshots
+from mi_app.utils import atomic_path, get_scoped_cache_path
+
+DRIVE_CHANGES_URL = "https://www.googleapis.com/drive/v3/changes"
+DRIVE_START_PAGE_TOKEN_URL = DRIVE_CHANGES_URL + "/startPageToken"
+
+# Only the ids are needed to decide what to regenerate, so the feed is read
+# with a minimal field mask and nothing is downloaded until a file changes.
+CHANGES_FIELDS = "nextPageToken,newStartPageToken,changes(fileId,removed)"
+CHANGES_PAGE_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class DriveChangesWatcher:
+    """
+    Watches registered spreadsheets through the Google Drive changes feed.
+
+    Each poll asks Drive for the changes since the saved page token, which costs
+    one small request however many spreadsheets are registered. Callbacks run
+    only for the registered spreadsheets that actually changed. The page token
+    is persisted so a restarted watcher resumes where it stopped, together with
+    the spreadsheets whose callback failed: those are retried on every poll
+    until their callback succeeds, even though the token has moved past them.
+    """
+
+    def __init__(self, google_connection, state_path=None, interval=15):
+        """
+        Args:
+            google_connection: GoogleConnection used for the Drive requests
+            state_path: JSON file storing the page token. Defaults to a file in
+                the user cache directory for the connection's account and
+                endpoint, so another account never resumes from this token.
+            interval: Seconds between two polls
+        """
+        self.connection = google_connection
+        self.state_path = state_path or get_scoped_cache_path('drive_changes', google_connection.account_scope())
+        self.interval = interval
+        self.callbacks = {}
+        self.page_token = None
+        # Changed spreadsheets whose callback has not succeeded yet
+        self.pending = set()
+
+    def register(self, spreadsheet_key, callback):
+        """Call ``callback(spreadsheet_key)`` whenever the spreadsheet changes"""
+        self.callbacks[spreadsheet_key] = callback
+
+    def poll_once(self):
+        """
+        Read the pending changes and run the callbacks of the changed spreadsheets.
+
+        Spreadsheets whose callback failed on an earlier poll are run again.
+
+        Returns:
+            set: Keys of the registered spreadsheets regenerated by this poll
+        """
+        if self.page_token is None:
+            self._load_state()
+
+        changed = {key for key in self.pending if key in self.callbacks}
+        page_token = self.page_token
+        next_token = self.page_token
+        while page_token:
+            response = self.connection.get_json(DRIVE_CHANGES_URL, params={
+                'pageToken': page_token,
+                'fields': CHANGES_FIELDS,
+                'pageSize': CHANGES_PAGE_SIZE,
+                'spaces': 'drive',
+            })
+            for change in response.get('changes', []):
+                file_id = change.get('fileId')
+                if file_id in self.callbacks and not change.get('removed'):
+                    changed.add(file_id)
+
+            if 'newStartPageToken' in response:
+                next_token = response['newStartPageToken']
+                page_token = None
+            else:
+                page_token = response.get('nextPageToken')
+
+        # Regenerate before saving the token so a crash replays the changes;
+        # failures are saved with the token and retried on the next poll
+        regenerated, failed = set(), set()
+        for spreadsheet_key in changed:
+            try:
+                self.callbacks[spreadsheet_key](spreadsheet_key)
+                regenerated.add(spreadsheet_key)
+            except Exception:
+                logger.exception("Regeneration failed for %s; retrying on the next poll", spreadsheet_key)
+                failed.add(spreadsheet_key)
+
+        self.page_token = next_token
+        self.pending = failed
+        self._save_state()
+        return regenerated
+
+    def run(self, stop_event=None):
+        """Poll until ``stop_event`` is set (or forever when it is not given)"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            try:
+                regenerated = self.poll_once()
+                if regenerated:
+                    logger.info("Regenerated: %s", ', '.join(sorted(regenerated)))
+            except Exception:
+                logger.exception("Polling the Drive changes feed failed")
+            stop_event.wait(self.interval)
+
+    def _load_state(self):
+        """Load the saved page token and pending spreadsheets, or start from the current state of Drive"""
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            if state.get('page_token'):
+                self.page_token = state['page_token']
+                self.pending = set(state.get('pending', []))
+                return
+        self.page_token = self.connection.get_json(DRIVE_START_PAGE_TOKEN_URL)['startPageToken']
+        self.pending = set()
+        self._save_state()
+
+    def _save_state(self):
+        with atomic_path(self.state_path) as tmp_path, open(tmp_path, 'w') as f:
+            json.dump({'page_token': self.page_token, 'pending': sorted(self.pending)}, f)
+
+
+def regenerate_descriptors(reader, generator, spreadsheet_key, output_dir, snapshots=None):
+    """
+    Regenerate the job descriptors of a spreadsheet into ``output_dir/<key>/``.
+
+    The sheet is checked with the preflight pass first, so a bad row stops the
+    run before any document is written.
+
+    With ``snapshots``, a dict of the last sheet regenerated per spreadsheet,
+    only the descriptors the sheet diff reports as out of date are rendered
+    (see SheetDiff.jobs_to_render). The dict is updated once every descriptor
+    succeeded; spreadsheets without a snapshot are regenerated in full.
+
+    Returns:
+        list: Paths of the generated documents
+
+    Raises:
+        RuntimeError: If any descriptor failed; the others are still written,
+            and the watcher retries the spreadsheet on its next poll.
+    """
+    dataframes = reader.read_sheets("key", spreadsheet_key)
+    report = preflight(dataframes, generator)
+    if not report.can_generate:
+        raise ValueError(f"Preflight failed:\n{report.summary()}")
+    if not report.ok:
+        logger.warning("Preflight warnings for %s:\n%s", spreadsheet_key, report.summary())
+
+    target_dir = os.path.join(output_dir, spreadsheet_key)
+    previous = snapshots.get(spreadsheet_key) if snapshots is not None else None
+    if previous is None:
+        positions = range(len(generator.job_table(dataframes)))
+    else:
+        positions = diff_snapshots(previous, dataframes, generator).jobs_to_render
+
+    paths, failures = [], 0
+    # Nothing out of date (e.g. only a job was removed): no worker pool is started
+    results = generate_descriptors(generator, dataframes, positions, target_dir) if positions else []
+    for position, path, error in results:
+        if error:
+            logger.error("Failed to generate %s: %s", path, error)
+            failures += 1
+        else:
+            paths.append(path)
+    if failures:
+        raise RuntimeError(f"{failures} of {len(positions)} descriptors failed for {spreadsheet_key}")
+    if snapshots is not None:
+        snapshots[spreadsheet_key] = dataframes
+    return paths
+
+
+def main():
+    """Command line entry point: python -m mi_app.watcher --key KEY --output-dir DIR"""
+    from mi_app.docx_generator import DocumentGenerator
+    from mi_app.google_sheets import GoogleConnection, GoogleSheetsReader
+
+    parser = argparse.ArgumentParser(description="Regenerate descriptors when spreadsheets change")
+    parser.add_argument("--key", action="append", required=True, help="Spreadsheet key to watch (repeatable)")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--credentials", default=None)
+    parser.add_argument("--interval", type=float, default=15)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    connection = GoogleConnection(args.credentials)
+    reader = GoogleSheetsReader(connection)
+    generator = DocumentGenerator()
+    watcher = DriveChangesWatcher(connection, interval=args.interval)
+    # Sheets regenerated so far, so later edits only re-render the jobs they touch
+    snapshots = {}
+
+    def on_change(spreadsheet_key):
+        regenerate_descriptors(reader, generator, spreadsheet_key, args.output_dir, snapshots)
+
+    for key in args.key:
+        watcher.register(key, on_change)
+    watcher.run()
+
+
+if __name__ == "__main__":
+    main()
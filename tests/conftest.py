@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS = os.path.join(ROOT, 'benchmarks')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCHMARKS)
+
+# Cells of the header block written by make_sheet, as (row, column, value)
+HEADER_CELLS = [(2, 42, 'COD-1'), (3, 42, 'v1'), (4, 42, '2025-01-01'), (5, 42, 'Ana'),
+                (6, 42, 'Luis'), (7, 42, 'Eva'), (8, 42, 'Borrador'), (9, 42, '2025-02-02')]
+
+
+def make_sheet(jobs=5, cols=45):
+    """Build a raw sheet shaped like the descriptor workbook: header block, jobs from row 11"""
+    rows = [[''] * cols for _ in range(11 + jobs)]
+    for row, col, value in HEADER_CELLS:
+        rows[row][col] = value
+    for i in range(jobs):
+        row = rows[11 + i]
+        row[2], row[3] = f'Nivel {i % 3}', f'Cargo {i}'
+        for col in range(4, 29):
+            row[col] = f'valor {i}-{col}'
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(autouse=True)
+def isolated_environment(tmp_path, monkeypatch):
+    """Run from the repository root (template paths are relative) with a private cache"""
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def sheet():
+    return make_sheet()
@@ -0,0 +1,66 @@
+import os
+import threading
+
+import pandas as pd
+from docx import Document
+
+from mi_app import batch
+from mi_app.batch import attach_job_table, generate_descriptors, publish_job_table
+from mi_app.docx_generator import DocumentGenerator
+from tests.conftest import make_sheet
+
+
+def test_published_table_attaches_with_the_same_content(tmp_path):
+    jobs = DocumentGenerator().job_table(make_sheet(20))
+    path = publish_job_table(jobs, directory=str(tmp_path))
+    try:
+        table = attach_job_table(path)
+        assert table.num_rows == 20
+        pd.testing.assert_frame_equal(table.to_pandas(), batch._as_strings(jobs))
+        assert table.slice(3, 1).to_pylist()[0]['puesto'] == 'Cargo 3'
+    finally:
+        os.remove(path)
+
+
+def test_descriptors_are_rendered_by_the_worker_pool(tmp_path):
+    generator = DocumentGenerator()
+    sheet = make_sheet(3)
+    results = list(generate_descriptors(generator, sheet, range(3), str(tmp_path), max_workers=2))
+
+    assert sorted(position for position, _, _ in results) == [0, 1, 2]
+    assert all(error is None for _, _, error in results)
+    for _, path, _ in results:
+        text = '\n'.join(paragraph.text for paragraph in Document(path).paragraphs)
+        assert 'Cargo' in text
+    # The shared table is removed once the run is over
+    if os.path.isdir(batch.SHARED_MEMORY_DIR):
+        assert not [name for name in os.listdir(batch.SHARED_MEMORY_DIR) if name.startswith('mi_app_jobs_')]
+
+
+def test_without_arrow_the_job_table_is_pickled(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, 'ARROW_AVAILABLE', False)
+    results = list(generate_descriptors(DocumentGenerator(), make_sheet(2), range(2), str(tmp_path), max_workers=1))
+    assert [error for _, _, error in results] == [None, None]
+
+
+def test_cancelled_runs_only_report_complete_documents(tmp_path):
+    cancel = threading.Event()
+    cancel.set()
+    stages = []
+    results = list(generate_descriptors(DocumentGenerator(), make_sheet(6), range(6), str(tmp_path),
+                                        max_workers=1, cancel_event=cancel, on_stage=stages.append))
+
+    assert 'Cancelling' in stages
+    assert len(results) < 6
+    for _, path, error in results:
+        assert error is None and os.path.exists(path)
+
+
+def test_jobs_with_the_same_name_get_separate_files(tmp_path):
+    sheet = make_sheet(3)
+    sheet.iloc[12, 2:4] = sheet.iloc[11, 2:4]  # Second job repeats the first one's level and title
+    results = list(generate_descriptors(DocumentGenerator(), sheet, range(3), str(tmp_path), max_workers=1))
+
+    paths = sorted(path for _, path, _ in results)
+    assert len(set(paths)) == 3
+    assert sorted(os.listdir(tmp_path)) == ['Nivel_0-Cargo_0.docx', 'Nivel_0-Cargo_0_2.docx', 'Nivel_2-Cargo_2.docx']
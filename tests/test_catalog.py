@@ -0,0 +1,105 @@
+import os
+
+import pytest
+from fake_google_api import FakeGoogleAPI, Fixtures
+from google.auth.credentials import AnonymousCredentials
+
+from mi_app.catalog import JobCatalog, drive_revision, read_with_revision
+from mi_app.google_sheets import GoogleConnection, GoogleSheetsReader
+from tests.conftest import make_sheet
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = JobCatalog(str(tmp_path / 'catalog.sqlite3'))
+    yield catalog
+    catalog.close()
+
+
+def test_jobs_with_the_same_name_get_separate_files(catalog, tmp_path):
+    sheet = make_sheet(3)
+    sheet.iloc[12, 2:4] = sheet.iloc[11, 2:4]
+    catalog.index('hoja-a', sheet)
+    catalog.index('hoja-b', make_sheet(1))
+
+    output_dir = tmp_path / 'out'
+    results = list(catalog.generate(catalog.search(), str(output_dir), fmt='markdown'))
+    assert all(error is None for _, _, error in results)
+    assert sorted(os.listdir(output_dir / 'hoja-a')) == [
+        'Nivel_0-Cargo_0.md', 'Nivel_0-Cargo_0_2.md', 'Nivel_2-Cargo_2.md'
+    ]
+    # Names only need to be unique within a spreadsheet's folder
+    assert os.listdir(output_dir / 'hoja-b') == ['Nivel_0-Cargo_0.md']
+
+
+@pytest.fixture
+def api():
+    with FakeGoogleAPI(Fixtures.synthetic(1, jobs=3)) as api:
+        yield api
+
+
+@pytest.fixture
+def reader(api):
+    connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url, requests_per_minute=6000)
+    return GoogleSheetsReader(connection)
+
+
+def test_refresh_indexes_each_drive_revision_once(catalog, api, reader):
+    key = next(iter(api.fixtures.spreadsheets))
+    assert catalog.refresh(reader, key) == ('1', True)
+    assert catalog.revision(key) == '1'
+    assert [entry.title for entry in catalog.search(spreadsheet_id=key)] == ['Cargo 0', 'Cargo 1', 'Cargo 2']
+    assert catalog.search(spreadsheet_id=key)[0].spreadsheet_name == 'Descriptores 0'
+
+    reads = api.stats['spreadsheet_metadata']
+    assert catalog.refresh(reader, key) == ('1', False)
+    assert api.stats['spreadsheet_metadata'] == reads  # The sheet was not read again
+
+    api.fixtures.touch(key)
+    assert catalog.refresh(reader, key) == ('2', True)
+
+
+def test_refresh_reads_the_revision_before_the_sheet(catalog):
+    class EditedWhileRead:
+        """Reader whose spreadsheet is edited between the metadata and the values"""
+        version = 1
+
+        def file_info(self, key):
+            return {'id': key, 'name': 'Hoja', 'version': str(self.version)}
+
+        def read_sheets(self, access_type, key):
+            self.version += 1
+            return make_sheet(2)
+
+    reader = EditedWhileRead()
+    assert catalog.refresh(reader, 'hoja') == ('1', True)
+    # The edit is picked up by the next refresh
+    assert catalog.refresh(reader, 'hoja') == ('2', True)
+
+
+def test_a_read_is_indexed_without_reading_the_sheet_again(catalog, api, reader):
+    key = next(iter(api.fixtures.spreadsheets))
+    read = read_with_revision(reader, 'url', f"https://docs.google.com/spreadsheets/d/{key}/edit")
+    assert read.spreadsheet_id == key and read.info['name'] == 'Descriptores 0'
+
+    reads = api.stats['spreadsheet_metadata']
+    assert catalog.index(key, read.dataframes, revision=drive_revision(read.info), name=read.info['name'])
+    assert api.stats['spreadsheet_metadata'] == reads
+    assert catalog.refresh(reader, key) == ('1', False)
+
+
+def test_a_read_survives_a_failed_drive_request():
+    class NoDrive:
+        sheet = make_sheet(2)
+
+        def spreadsheet_key(self, access_type, identifier):
+            return identifier
+
+        def file_info(self, key):
+            raise PermissionError("Drive API disabled")
+
+        def read_sheets(self, access_type, identifier):
+            return self.sheet
+
+    read = read_with_revision(NoDrive(), 'key', 'hoja')
+    assert read.info is None and read.dataframes is NoDrive.sheet
@@ -0,0 +1,83 @@
+import io
+import os
+import zipfile
+
+import pytest
+from docx import Document
+from docxtpl import DocxTemplate
+
+from mi_app import docx_fastsave
+from mi_app.docx_fastsave import save_document
+from mi_app.docx_generator import DocumentGenerator
+from tests.conftest import make_sheet
+
+
+@pytest.fixture
+def rendered():
+    """A rendered descriptor template and the path it was loaded from"""
+    generator = DocumentGenerator()
+    sheet = make_sheet(1)
+    context = generator.header_context(sheet)
+    context.update(generator.job_context(generator.job_table(sheet), 0))
+    doc = DocxTemplate(generator.template_path)
+    doc.render(context)
+    return doc, generator.template_path
+
+
+def members(package):
+    with zipfile.ZipFile(package) as archive:
+        assert archive.testzip() is None
+        return [(info.filename, archive.read(info)) for info in archive.infolist()]
+
+
+def test_fast_save_matches_a_normal_save(tmp_path, rendered):
+    doc, template_path = rendered
+    fast, normal = tmp_path / 'fast.docx', tmp_path / 'normal.docx'
+
+    assert save_document(doc, str(fast), template_path) > 0
+    doc.docx.save(str(normal))
+
+    assert members(fast) == members(normal)
+    text = '\n'.join(paragraph.text for paragraph in Document(str(fast)).paragraphs)
+    assert 'Cargo 0' in text
+
+
+def test_fast_save_writes_to_file_objects(rendered):
+    doc, template_path = rendered
+    buffer = io.BytesIO()
+    save_document(doc, buffer, template_path)
+    buffer.seek(0)
+    assert Document(buffer).paragraphs
+
+
+def test_packages_needing_zip64_are_saved_by_python_docx(tmp_path, rendered, monkeypatch):
+    doc, template_path = rendered
+    normal = tmp_path / 'normal.docx'
+    doc.docx.save(str(normal))
+    # Pretend the largest part is past the classic ZIP limit
+    monkeypatch.setattr(docx_fastsave, 'ZIP_MAX_SIZE', 64 * 1024)
+
+    output = tmp_path / 'large.docx'
+    assert save_document(doc, str(output), template_path) == 0
+    assert members(output) == members(normal)
+
+
+def test_failed_saves_leave_no_partial_file(tmp_path, rendered, monkeypatch):
+    doc, template_path = rendered
+
+    def broken(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(docx_fastsave.zlib, 'compressobj', broken)
+    output = tmp_path / 'broken.docx'
+    with pytest.raises(OSError):
+        save_document(doc, str(output), template_path)
+    assert not os.path.exists(output)
+
+
+def test_without_the_content_types_helper_documents_are_saved_normally(tmp_path, rendered, monkeypatch):
+    doc, template_path = rendered
+    monkeypatch.setattr(docx_fastsave, 'FAST_SAVE_AVAILABLE', False)
+    output = tmp_path / 'plain.docx'
+    assert save_document(doc, str(output), template_path) == 0
+    assert Document(str(output)).paragraphs
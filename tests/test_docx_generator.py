@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+from mi_app.docx_generator import DocumentGenerator
+from tests.conftest import make_sheet
+
+
+def reference_job_table(dataframes):
+    """The job table as the dict-based _process_data built it before memoization"""
+    base_filter = dataframes.iloc[10:, 2:4].replace('', pd.NA).replace(' ', pd.NA).dropna()
+    another_data = dataframes.iloc[11:, 4:]
+    return pd.DataFrame({
+        **base_filter.reset_index(drop=True).to_dict('list'),
+        **another_data.reset_index(drop=True).to_dict('list')
+    })
+
+
+def test_job_table_matches_the_dict_based_construction():
+    sheet = make_sheet(20)
+    processed = DocumentGenerator()._process_data(sheet)
+    pd.testing.assert_frame_equal(processed, reference_job_table(sheet), check_dtype=False)
+
+
+def test_job_table_is_reused_for_the_same_snapshot():
+    generator = DocumentGenerator()
+    sheet = make_sheet()
+    assert generator.job_table(sheet) is generator.job_table(sheet)
+
+
+def test_the_cached_table_is_already_renamed(monkeypatch):
+    generator = DocumentGenerator()
+    sheet = make_sheet()
+    jobs = generator.job_table(sheet)
+    assert list(jobs.columns[:3]) == ['n_jerarquico', 'puesto', 'a_trabajo']
+    monkeypatch.setattr(pd.DataFrame, 'rename', lambda *args, **kwargs: pytest.fail('renamed again'))
+    assert generator.job_table(sheet) is jobs
+
+
+def test_the_memo_is_a_single_snapshot_and_table_pair():
+    generator = DocumentGenerator()
+    sheet = make_sheet()
+    jobs = generator.job_table(sheet)
+    snapshot, table = generator._job_table_memo
+    assert snapshot() is sheet and table is jobs
+
+
+def test_a_new_snapshot_is_processed_again():
+    generator = DocumentGenerator()
+    first = generator.job_table(make_sheet(3))
+    second = generator.job_table(make_sheet(4))
+    assert len(first) == 3
+    assert len(second) == 4
+
+
+def test_mismatched_sections_raise():
+    sheet = make_sheet()
+    sheet.iloc[12, 3] = ''
+    with pytest.raises(ValueError, match='mismatched lengths'):
+        DocumentGenerator().job_table(sheet)
+
+
+def test_job_context_maps_columns_to_placeholders():
+    generator = DocumentGenerator()
+    context = generator.job_context(generator.job_table(make_sheet()), 2)
+    assert context['n_jerarquico'] == 'Nivel 2'
+    assert context['puesto'] == 'Cargo 2'
+    assert context['a_trabajo'] == 'valor 2-4'
@@ -0,0 +1,237 @@
+import json
+import time
+
+import pandas as pd
+import pytest
+from fake_google_api import FakeGoogleAPI, FaultInjector, Fixtures
+from google.auth.credentials import AnonymousCredentials
+
+from mi_app.google_sheets import (DOCS_FIELDS, DOCS_TABLE_DEPTH, GoogleConnection, GoogleDocumentReader,
+                                  GoogleSheetsReader, SpreadsheetKeyCache, _exceeds_table_depth)
+
+LATENCY_MS = 100
+
+
+@pytest.fixture
+def fixtures():
+    return Fixtures.synthetic(6, jobs=2)
+
+
+@pytest.fixture
+def reader(fixtures):
+    with FakeGoogleAPI(fixtures, faults=FaultInjector(latency_ms=LATENCY_MS)) as api:
+        connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url,
+                                      requests_per_minute=6000)
+        yield GoogleSheetsReader(connection)
+
+
+def test_read_many_yields_every_spreadsheet(fixtures, reader):
+    keys = list(fixtures.spreadsheets)
+    results = {identifier: (df, error) for identifier, df, error in reader.read_many("key", keys)}
+
+    assert set(results) == set(keys)
+    for df, error in results.values():
+        assert error is None
+        assert df.iloc[11, 3] == 'Cargo 0'
+
+
+def test_read_many_reports_errors_per_identifier(fixtures, reader):
+    good = next(iter(fixtures.spreadsheets))
+    results = {identifier: (df, error) for identifier, df, error in reader.read_many("key", [good, "missing"])}
+
+    assert results[good][1] is None
+    assert results["missing"][0] is None
+    assert isinstance(results["missing"][1], Exception)
+
+
+def test_read_many_overlaps_the_reads(fixtures, reader):
+    keys = list(fixtures.spreadsheets)
+    reader.read_sheets("key", keys[0])  # Authorize and warm the connection pool
+
+    start = time.perf_counter()
+    reader.read_sheets("key", keys[0])
+    serial = (time.perf_counter() - start) * len(keys)
+
+    start = time.perf_counter()
+    assert len(list(reader.read_many("key", keys))) == len(keys)
+    assert time.perf_counter() - start < serial / 2
+
+
+def test_key_cache_is_scoped_by_account_and_endpoint(tmp_path):
+    def credentials(account):
+        path = tmp_path / f'{account}.json'
+        path.write_text(json.dumps({'client_email': f'{account}@proyecto.iam.gserviceaccount.com'}))
+        return str(path)
+
+    first = GoogleConnection(credentials_path=credentials('uno'))
+    other_endpoint = GoogleConnection(credentials_path=credentials('uno'), api_endpoint='http://127.0.0.1:9')
+    other_account = GoogleConnection(credentials_path=credentials('dos'))
+
+    assert 'uno@proyecto.iam.gserviceaccount.com' in first.account_scope()
+    caches = [SpreadsheetKeyCache(scope=connection.account_scope())
+              for connection in (first, other_endpoint, other_account)]
+    assert len({cache.path for cache in caches}) == 3
+
+    caches[0].put('Descriptores', 'key-uno')
+    assert SpreadsheetKeyCache(scope=first.account_scope()).get('Descriptores') == 'key-uno'
+    assert caches[1].get('Descriptores') is None
+    assert SpreadsheetKeyCache(scope=other_account.account_scope()).get('Descriptores') is None
+
+
+def test_readers_on_different_endpoints_resolve_names_separately(fixtures):
+    key, spreadsheet = next(iter(fixtures.spreadsheets.items()))
+    with FakeGoogleAPI(fixtures) as first, FakeGoogleAPI(fixtures) as second:
+        for api in (first, second, first):
+            connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url,
+                                          requests_per_minute=6000)
+            assert GoogleSheetsReader(connection).resolve_key(spreadsheet['title']) == key
+        # The second endpoint searched Drive itself; the first one reused its own cache
+        assert first.stats['list_files'] == second.stats['list_files'] == 1
+
+
+def test_key_cache_entries_expire_and_can_be_invalidated(tmp_path):
+    path = str(tmp_path / 'keys.json')
+    cache = SpreadsheetKeyCache(path=path, ttl=60)
+    cache.put('Vieja', 'key-vieja')
+    cache.put('Nueva', 'key-nueva')
+    cache.invalidate('Nueva')
+    assert SpreadsheetKeyCache(path=path).get('Nueva') is None
+    assert SpreadsheetKeyCache(path=path, ttl=0).get('Vieja') is None
+    assert SpreadsheetKeyCache(path=path, ttl=60).get('Vieja') == 'key-vieja'
+
+
+CHUNK_ROWS = 5
+
+
+def banded_rows():
+    """23 rows x 6 columns with empty rows at, across and after band boundaries of CHUNK_ROWS"""
+    rows = [[''] * 6 for _ in range(23)]
+    rows[0][:2] = ['a', 'b']
+    rows[2][0] = 'c'          # Rows 3-9 are empty: the end of band 0 and all of band 1
+    rows[10] = ['x', '', '', '', '', 'z']
+    rows[14][1] = 'fin de banda'
+    rows[16][3] = 'd'         # Row 15 opens band 3 empty
+    rows[19][0] = 'e'         # Rows 20-22, a short last band, are empty
+    return rows
+
+
+def cells(df):
+    """Cell values with every missing cell as None, whatever dtype pandas inferred"""
+    df = df.astype(object)
+    return df.where(df.notna(), None)
+
+
+@pytest.fixture
+def banded(fixtures):
+    fixtures.spreadsheets['banded'] = {'title': 'Hoja de bandas', 'sheets': {'Hoja de bandas': banded_rows()}}
+    fixtures.spreadsheets['empty'] = {'title': 'Vacía', 'sheets': {'Vacía': [[''] * 3] * 4}}
+    return fixtures
+
+
+def test_chunked_read_matches_the_plain_read(banded, reader):
+    progress = []
+    chunked = reader.read_sheets_chunked('key', 'banded', chunk_rows=CHUNK_ROWS,
+                                         on_chunk=lambda *counts: progress.append(counts))
+
+    pd.testing.assert_frame_equal(chunked, reader.read_sheets('key', 'banded'))
+    assert chunked.shape == (20, 6)
+    assert chunked.iloc[10, 5] == 'z' and pd.isna(chunked.iloc[5, 0])
+    assert progress == [(3, 23), (15, 23), (20, 23)]
+
+
+def test_chunks_keep_sheet_rows_and_skip_empty_bands(banded, reader):
+    chunks = list(reader.read_sheet_chunks('key', 'banded', chunk_rows=CHUNK_ROWS))
+
+    # Band 1 holds no data, so its rows open the chunk of band 2
+    assert [(chunk.index[0], chunk.index[-1]) for chunk in chunks] == [(0, 2), (3, 14), (15, 19)]
+    assert all(list(chunk.columns) == list(range(6)) for chunk in chunks)
+    combined = pd.concat(chunks)
+    pd.testing.assert_frame_equal(cells(combined), cells(reader.read_sheets('key', 'banded')))
+    assert combined.loc[14, 1] == 'fin de banda'
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 4, 23, 100])
+def test_any_band_size_gives_the_same_frame(banded, reader, chunk_rows):
+    pd.testing.assert_frame_equal(reader.read_sheets_chunked('key', 'banded', chunk_rows=chunk_rows),
+                                  reader.read_sheets('key', 'banded'))
+
+
+def test_an_empty_sheet_reads_as_an_empty_frame(banded, reader):
+    assert list(reader.read_sheet_chunks('key', 'empty', chunk_rows=2)) == []
+    assert reader.read_sheets_chunked('key', 'empty', chunk_rows=2).empty
+
+
+def cell(*content):
+    return {'content': list(content)}
+
+
+def table(*cells):
+    return {'table': {'rows': 1, 'tableRows': [{'tableCells': list(cells)}]}}
+
+
+def paragraph(text):
+    return {'paragraph': {'elements': [{'textRun': {'content': text}}]}}
+
+
+def nested_tables(depth, text='deep'):
+    """A table nested ``depth`` levels deep, holding ``text`` in its innermost cell"""
+    content = paragraph(text)
+    for _ in range(depth):
+        content = table(cell(content))
+    return content
+
+
+class RecordingConnection:
+    """Serve a masked and a full document and record the requested field masks"""
+
+    def __init__(self, masked, full):
+        self.documents = {True: masked, False: full}
+        self.requests = []
+
+    def get_json(self, url, params=None):
+        masked = bool(params and 'fields' in params)
+        self.requests.append(masked)
+        return {'body': {'content': self.documents[masked]}}
+
+
+def test_docs_mask_skips_the_table_of_contents_text():
+    assert 'tableOfContents(content(startIndex))' in DOCS_FIELDS
+    assert 'tableOfContents(content(paragraph' not in DOCS_FIELDS
+
+
+def test_tables_past_the_mask_depth_are_detected():
+    assert not _exceeds_table_depth([nested_tables(DOCS_TABLE_DEPTH)])
+    assert _exceeds_table_depth([nested_tables(DOCS_TABLE_DEPTH + 1)])
+
+
+def test_documents_within_the_depth_limit_are_read_once():
+    content = [paragraph('Intro\n'), nested_tables(DOCS_TABLE_DEPTH), {'tableOfContents': {'content': []}}]
+    connection = RecordingConnection(content, None)
+    text = GoogleDocumentReader(connection).read_document('doc')[0][1].iloc[0, 0]
+    assert connection.requests == [True]
+    assert text == 'Intro\n\ndeep\n[Table of Contents]'
+
+
+def test_deeper_tables_fall_back_to_a_full_fetch():
+    # The masked response only flags the innermost table, without its text
+    masked = [nested_tables(DOCS_TABLE_DEPTH, text='')]
+    innermost = masked[0]
+    for _ in range(DOCS_TABLE_DEPTH):
+        innermost = innermost['table']['tableRows'][0]['tableCells'][0]['content'][0]
+    innermost.clear()
+    innermost['table'] = {'rows': 1}
+
+    connection = RecordingConnection(masked, [nested_tables(DOCS_TABLE_DEPTH + 1)])
+    text = GoogleDocumentReader(connection).read_document('doc')[0][1].iloc[0, 0]
+    assert connection.requests == [True, False]
+    assert text == 'deep'
+
+
+def test_text_exports_drop_the_byte_order_mark():
+    class ExportConnection:
+        def get_bytes(self, url, params=None):
+            return '\ufeffPrimera línea\n'.encode('utf-8')
+
+    for mode in ('text', 'markdown'):
+        text = GoogleDocumentReader(ExportConnection()).read_document('doc', mode=mode)[0][1].iloc[0, 0]
+        assert text == 'Primera línea\n'
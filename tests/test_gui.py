@@ -0,0 +1,133 @@
+import logging
+import os
+import threading
+
+import pytest
+
+from mi_app import gui
+from mi_app.catalog import SheetRead
+from mi_app.docx_generator import DocumentGenerator
+from mi_app.gui import GoogleToDocApp
+from tests.conftest import make_sheet
+
+
+class FakeRoot:
+    """Tk root whose after() callbacks are run by the test"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback, *args):
+        self.callbacks.append((callback, args))
+
+    def run(self):
+        while self.callbacks:
+            callback, args = self.callbacks.pop(0)
+            callback(*args)
+
+
+class FakeVar:
+    def __init__(self, value=''):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeCatalog:
+    def __init__(self, error=None):
+        self.error = error
+        self.release = threading.Event()
+        self.indexed = []
+
+    def index(self, spreadsheet_id, dataframes, revision=None, name=None, generator=None):
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        self.indexed.append((spreadsheet_id, dataframes, revision, name))
+        return True
+
+    def refresh(self, reader, spreadsheet_id, generator=None):
+        pytest.fail("the GUI must not read the spreadsheet again")
+
+
+class RecordingGenerator(DocumentGenerator):
+    """Renders the descriptors and keeps the job fields each one was given"""
+
+    def __init__(self):
+        super().__init__()
+        self.rendered = {}
+
+    def render_descriptor(self, header, job_data, output_path):
+        super().render_descriptor(header, job_data, output_path)
+        self.rendered[os.path.basename(output_path)] = job_data
+
+
+def make_app(catalog):
+    """An app with just the state used by catalog indexing, without a Tk window"""
+    app = GoogleToDocApp.__new__(GoogleToDocApp)
+    app.root = FakeRoot()
+    app.status_var = FakeVar("Spreadsheet processed successfully")
+    app._doc_generator = object()
+    app._catalog = catalog
+    app._index_executor = None
+    return app
+
+
+def test_the_loaded_sheet_is_indexed_off_the_tk_thread():
+    catalog = FakeCatalog()
+    app = make_app(catalog)
+    sheet = make_sheet()
+    app._index_in_catalog(SheetRead(sheet, 'hoja', {'name': 'Descriptores', 'version': '7'}))
+    # The Tk thread returned while the update is still blocked
+    assert catalog.indexed == []
+    catalog.release.set()
+    app.root.run()
+    assert catalog.indexed == [('hoja', sheet, '7', 'Descriptores')]
+    assert app.status_var.value == "Spreadsheet processed successfully"
+
+
+def test_a_read_without_drive_revision_is_not_indexed():
+    catalog = FakeCatalog()
+    app = make_app(catalog)
+    app._index_in_catalog(SheetRead(make_sheet(), 'hoja', None))
+    assert app._index_executor is None and app.root.callbacks == []
+
+
+def test_indexing_failures_reach_the_status_bar_and_the_log(caplog):
+    catalog = FakeCatalog(error=OSError("database is locked"))
+    catalog.release.set()
+    app = make_app(catalog)
+    with caplog.at_level(logging.WARNING, logger='mi_app.gui'):
+        app._index_in_catalog(SheetRead(make_sheet(), 'hoja', {'version': '7'}))
+        app.root.run()
+    assert app.status_var.value == "Job catalog not updated: database is locked"
+    assert "database is locked" in caplog.text
+
+
+def test_a_duplicated_job_is_saved_from_its_own_row(tmp_path, monkeypatch):
+    sheet = make_sheet(3)
+    sheet.iloc[13, 2:4] = sheet.iloc[11, 2:4]  # Job 2 repeats job 0's level and title
+    generator = RecordingGenerator()
+    app = make_app(FakeCatalog())
+    app._doc_generator = generator
+    app.current_data = sheet
+    app.title_var, app.job_title_var, app.level_hierarchy_var = FakeVar(), FakeVar(), FakeVar()
+    app.job_positions = generator.job_options(sheet)  # As _extract_job_data_from_dataframe sets it
+    assert list(app.job_positions) == [('Nivel 0', 'Cargo 0'), ('Nivel 1', 'Cargo 1'), ('Nivel 0', 'Cargo 0 (2)')]
+
+    monkeypatch.setattr(gui.messagebox, 'showinfo', lambda *args, **kwargs: None)
+    monkeypatch.setattr(gui.messagebox, 'showerror', lambda title, message: pytest.fail(message))
+    for level, title in app.job_positions:
+        name = f"{title}.docx"
+        monkeypatch.setattr(gui.filedialog, 'asksaveasfilename', lambda **kwargs: str(tmp_path / name))
+        app.level_hierarchy_var.set(level)
+        app.job_title_var.set(title)
+        app._save_document()
+
+    areas = {name: job['a_trabajo'] for name, job in generator.rendered.items()}
+    assert areas == {'Cargo 0.docx': 'valor 0-4', 'Cargo 1.docx': 'valor 1-4', 'Cargo 0 (2).docx': 'valor 2-4'}
+    assert app.status_var.value == "Document generated successfully"
@@ -0,0 +1,171 @@
+import io
+import logging
+import os
+
+import pytest
+from docx import Document
+from PIL import Image
+
+from mi_app import image_cache as image_cache_module
+from mi_app.docx_generator import DocumentGenerator, JOB_FIELDS
+from mi_app.image_cache import ImageCache
+from tests.conftest import make_sheet
+
+DRIVE_PAGE = b'<!DOCTYPE html><html><body>Sign in to continue</body></html>'
+
+
+def png_bytes(width=40, height=20, color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, content, content_type):
+        self.content = content
+        self.headers = {'Content-Type': content_type}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Serve fixed bodies by URL and record every download"""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        content = self.bodies[url]
+        return FakeResponse(content, 'image/png' if content.startswith(b'\x89PNG') else 'text/html')
+
+
+@pytest.fixture
+def session():
+    return FakeSession({
+        'https://example.com/a.png': png_bytes(),
+        'https://example.com/same-as-a.png': png_bytes(),
+        'https://example.com/wide.png': png_bytes(width=2000, height=1000),
+        'https://example.com/page': DRIVE_PAGE,
+    })
+
+
+def test_images_are_downloaded_once_and_stored_by_content(tmp_path, session):
+    cache = ImageCache(cache_dir=str(tmp_path), session=session)
+    first = cache.fetch('https://example.com/a.png')
+    assert cache.fetch('https://example.com/a.png') == first
+    assert cache.fetch('https://example.com/same-as-a.png') == first
+    assert session.requested == ['https://example.com/a.png', 'https://example.com/same-as-a.png']
+    assert len(os.listdir(cache.blobs_dir)) == 1
+
+
+def test_non_image_responses_are_rejected_before_caching(tmp_path, session):
+    cache = ImageCache(cache_dir=str(tmp_path), session=session)
+    with pytest.raises(ValueError, match='did not return an image'):
+        cache.fetch('https://example.com/page')
+    assert os.listdir(cache.blobs_dir) == []
+    assert 'https://example.com/page' not in cache._index['urls']
+
+
+def test_a_cached_non_image_is_downloaded_again(tmp_path, session):
+    cache = ImageCache(cache_dir=str(tmp_path), session=session)
+    path = cache.fetch('https://example.com/a.png')
+    with open(path, 'wb') as f:
+        f.write(DRIVE_PAGE)
+    assert cache.fetch('https://example.com/a.png') == path
+    assert len(session.requested) == 2
+
+
+def test_wide_images_are_scaled_down(tmp_path, session):
+    cache = ImageCache(cache_dir=str(tmp_path), session=session)
+    with Image.open(cache.resized('https://example.com/wide.png', 500)) as image:
+        assert image.size == (500, 250)
+    assert cache.resized('https://example.com/a.png', 500) == cache.fetch('https://example.com/a.png')
+
+
+def test_narrow_images_are_not_opened_again(tmp_path, session, monkeypatch):
+    ImageCache(cache_dir=str(tmp_path), session=session).resized('https://example.com/a.png', 500)
+
+    opened = []
+    original_open = image_cache_module.Image.open
+    monkeypatch.setattr(image_cache_module.Image, 'open', lambda *args: opened.append(args) or original_open(*args))
+    cache = ImageCache(cache_dir=str(tmp_path), session=session)
+    assert cache.resized('https://example.com/a.png', 500) == cache.fetch('https://example.com/a.png')
+    assert cache.resized('https://example.com/a.png', 40) == cache.fetch('https://example.com/a.png')
+    assert opened == []
+
+
+def test_instances_sharing_a_directory_keep_each_others_entries(tmp_path, session):
+    # Like two batch worker processes, each loading the index before the other writes
+    first = ImageCache(cache_dir=str(tmp_path), session=session)
+    second = ImageCache(cache_dir=str(tmp_path), session=session)
+    first.fetch('https://example.com/a.png')
+    second.resized('https://example.com/wide.png', 500)
+
+    session.requested.clear()
+    reloaded = ImageCache(cache_dir=str(tmp_path), session=session)
+    reloaded.fetch('https://example.com/a.png')
+    reloaded.fetch('https://example.com/wide.png')
+    assert session.requested == []
+    assert set(reloaded._index['widths'].values()) == {2000}
+
+
+def test_without_pillow_the_original_is_used(tmp_path, session, monkeypatch):
+    monkeypatch.setattr(image_cache_module, 'IMAGE_RESIZE_AVAILABLE', False)
+    cache = ImageCache(cache_dir=str(tmp_path), session=session)
+    assert cache.resized('https://example.com/wide.png', 500) == cache.fetch('https://example.com/wide.png')
+    with pytest.raises(ValueError):
+        cache.resized('https://example.com/page', 500)
+
+
+def test_least_recently_used_files_are_evicted(tmp_path, session):
+    cache = ImageCache(cache_dir=str(tmp_path), session=session)
+    old = cache.fetch('https://example.com/a.png')
+    os.utime(old, (0, 0))
+    new = cache.fetch('https://example.com/wide.png')
+    cache.max_bytes = os.path.getsize(new) + 1
+    cache._evict()
+    assert not os.path.exists(old)
+    assert os.path.exists(new)
+
+
+def test_broken_image_link_is_rendered_as_text(tmp_path, session, caplog):
+    generator = DocumentGenerator()
+    generator.image_cache = ImageCache(cache_dir=str(tmp_path / 'images'), session=session)
+    sheet = make_sheet(1)
+    header = generator.header_context(sheet)
+    job_data = generator.job_context(generator.job_table(sheet), 0)
+    job_data['organigram'] = 'https://example.com/page'
+    output = str(tmp_path / 'descriptor.docx')
+
+    with caplog.at_level(logging.WARNING, logger='mi_app.docx_generator'):
+        generator.render_descriptor(header, job_data, output)
+
+    assert 'Could not embed image' in caplog.text
+    assert not Document(output).inline_shapes
+
+
+def test_valid_image_link_is_embedded(tmp_path, session):
+    generator = DocumentGenerator()
+    generator.image_cache = ImageCache(cache_dir=str(tmp_path / 'images'), session=session)
+    sheet = make_sheet(1)
+    job_data = generator.job_context(generator.job_table(sheet), 0)
+    job_data['organigram'] = 'https://example.com/a.png'
+    output = str(tmp_path / 'descriptor.docx')
+
+    generator.render_descriptor(generator.header_context(sheet), job_data, output)
+    assert len(Document(output).inline_shapes) == 1
+
+
+def test_sheets_without_the_organigram_column_render(tmp_path):
+    generator = DocumentGenerator()
+    sheet = make_sheet(1)
+    jobs = generator.job_table(sheet).iloc[:, :len(JOB_FIELDS) - 1]
+    job_data = generator.job_context(jobs, 0)
+    assert job_data['organigram'] == ''
+
+    output = str(tmp_path / 'descriptor.docx')
+    generator.render_descriptor(generator.header_context(sheet), job_data, output)
+    assert os.path.exists(output)
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+from tests.conftest import ROOT
+
+# Same list as benchmarks/bench_import_time.py: none may load before the window exists
+HEAVY_MODULES = ("pandas", "gspread", "google.auth", "docxtpl", "lxml")
+
+
+def loaded_after_import(module):
+    """Import ``module`` in a fresh interpreter and return the heavy modules it loaded"""
+    probe = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def test_gui_import_defers_heavy_dependencies():
+    assert loaded_after_import("mi_app.gui") == []
+
+
+def test_gui_heavy_modules_are_importable():
+    from mi_app import gui
+
+    for module in gui.HEAVY_MODULES:
+        __import__(module)
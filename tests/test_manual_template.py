@@ -0,0 +1,87 @@
+import os
+
+import pytest
+from docx import Document
+from lxml import etree
+
+from mi_app.docx_generator import DocumentGenerator
+from mi_app.manual_template import _loop_job_section, get_manual_template
+from tests.conftest import make_sheet
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def document(*body):
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{W}"><w:body>{"".join(body)}<w:sectPr/></w:body></w:document>').encode()
+
+
+def p(*runs):
+    return '<w:p>' + ''.join(f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>' for text in runs) + '</w:p>'
+
+
+def body_texts(xml):
+    root = etree.fromstring(xml)
+    return [''.join(paragraph.itertext()) for paragraph in root.iter(f'{{{W}}}p')]
+
+
+def test_job_section_is_wrapped_in_a_loop():
+    xml = _loop_job_section(document(p('{{ code }}'), p('DESCRIPTOR DE CARGO'), p('{{ puesto }}')), {'code'})
+    assert body_texts(xml) == [
+        '{{ code }}',
+        '{%p for job in jobs %}', '{%p if not loop.first %}', '', '{%p endif %}',
+        'DESCRIPTOR DE CARGO', '{{job.puesto}}',
+        '{%p endfor %}',
+    ]
+    # The section properties stay the last child of the body
+    assert etree.fromstring(xml)[0][-1].tag == f'{{{W}}}sectPr'
+
+
+def test_heading_and_placeholders_split_across_runs_are_found():
+    xml = _loop_job_section(document(
+        p(' DESCRIPTOR', ' DE ', 'CARGO'),
+        p('Cargo: {', '{ pue', 'sto }', '} en {{a_trabajo}}.'),
+        p('{{ code', ' }}'),
+    ), {'code'})
+    texts = body_texts(xml)
+    assert 'Cargo: {{job.puesto}} en {{job.a_trabajo}}.' in texts
+    assert '{{ code }}' in texts
+    # The placeholder is moved whole into the first run
+    root = etree.fromstring(xml)
+    runs = [text.text for text in root.iter(f'{{{W}}}t')]
+    assert 'Cargo: {{job.puesto}}' in runs
+
+
+def test_placeholders_in_tables_of_the_section_are_converted():
+    table = f'<w:tbl><w:tr><w:tc>{p("{{ responsibilities }}")}</w:tc></w:tr></w:tbl>'
+    xml = _loop_job_section(document(p('DESCRIPTOR DE CARGO'), table), set())
+    assert '{{job.responsibilities}}' in body_texts(xml)
+
+
+def test_missing_heading_is_reported():
+    with pytest.raises(ValueError, match="no 'DESCRIPTOR DE CARGO' section"):
+        _loop_job_section(document(p('DESCRIPTORES DE CARGO')), set())
+
+
+def test_heading_inside_a_table_is_rejected():
+    table = f'<w:tbl><w:tr><w:tc>{p("DESCRIPTOR DE CARGO")}</w:tc></w:tr></w:tbl>'
+    with pytest.raises(ValueError, match='must be a paragraph of the document body'):
+        _loop_job_section(document(table), set())
+
+
+def test_manual_of_the_default_template_repeats_each_job(tmp_path):
+    generator = DocumentGenerator()
+    output = str(tmp_path / 'manual.docx')
+    generator.generate_manual(make_sheet(3), [0, 2], output)
+
+    text = '\n'.join(paragraph.text for paragraph in Document(output).paragraphs)
+    assert text.count('DESCRIPTOR DE CARGO') == 2
+    assert 'Cargo 0' in text and 'Cargo 2' in text and 'Cargo 1' not in text
+
+
+def test_manual_template_is_derived_once(tmp_path):
+    template_path = DocumentGenerator().template_path
+    first = get_manual_template(template_path, ['code'])
+    modified = os.path.getmtime(first)
+    assert get_manual_template(template_path, ['code']) == first
+    assert os.path.getmtime(first) == modified
@@ -0,0 +1,86 @@
+import io
+import threading
+
+import fpdf.fpdf
+import pytest
+from fpdf import FPDF
+from fpdf.ttfonts import TTFontFile
+from pypdf import PdfReader
+
+from mi_app.pdf_fonts import UNICODE_FAMILY, UnicodeFPDF, _Subset, find_unicode_font
+
+TEXT = "Descripción del cargo: coordinación, planificación y señalética"
+
+FONT = find_unicode_font()
+needs_font = pytest.mark.skipif(FONT is None, reason="no TrueType font with Latin coverage installed")
+
+
+def render(pdf_class, text=TEXT):
+    pdf = pdf_class()
+    pdf.add_font(UNICODE_FAMILY, '', FONT[''], uni=True)
+    pdf.add_page()
+    pdf.set_font(UNICODE_FAMILY, '', 11)
+    pdf.multi_cell(0, 6, text)
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def page_text(data):
+    return PdfReader(io.BytesIO(data), strict=True).pages[0].extract_text()
+
+
+def test_subset_keeps_distinct_characters_in_order():
+    subset = _Subset([0, 1, 1, 2])
+    for char in (65, 66, 65, 65):
+        subset.append(char)
+    assert list(subset) == [0, 1, 2, 65, 66]
+    assert 66 in subset and 67 not in subset
+    del subset[0]
+    assert 0 not in subset and list(subset) == [1, 2, 65, 66]
+
+
+@needs_font
+def test_output_matches_stock_fpdf():
+    assert page_text(render(UnicodeFPDF)) == page_text(render(FPDF)) == TEXT
+
+
+@needs_font
+def test_the_fpdf_module_is_never_patched(monkeypatch):
+    seen = []
+    original = TTFontFile.makeSubset
+
+    def spy(self, file, subset):
+        seen.append(fpdf.fpdf.TTFontFile)
+        return original(self, file, subset)
+
+    monkeypatch.setattr(TTFontFile, 'makeSubset', spy)
+    render(UnicodeFPDF, "texto sin caché ñ")
+    assert seen == [TTFontFile]
+    assert fpdf.fpdf.TTFontFile is TTFontFile
+
+
+@needs_font
+def test_subsets_are_built_once_per_content(monkeypatch):
+    calls = []
+    original = TTFontFile.makeSubset
+    monkeypatch.setattr(TTFontFile, 'makeSubset', lambda self, *args: calls.append(1) or original(self, *args))
+
+    first = render(UnicodeFPDF, "contenido repetido")
+    second = render(UnicodeFPDF, "contenido repetido")
+    render(UnicodeFPDF, "otro contenido")
+    assert len(calls) == 2
+    assert page_text(first) == page_text(second)
+
+
+@needs_font
+def test_concurrent_documents_render_correctly():
+    results = {}
+
+    def worker(n):
+        results[n] = page_text(render(UnicodeFPDF, f"{TEXT} {n}"))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {n: f"{TEXT} {n}" for n in range(6)}
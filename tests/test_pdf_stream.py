@@ -0,0 +1,93 @@
+import os
+import re
+
+import pandas as pd
+import pytest
+from fpdf import FPDF
+from pypdf import PdfReader
+
+from mi_app.pdf_fonts import UNICODE_FAMILY, find_unicode_font
+from mi_app.pdf_stream import StreamingFPDF
+
+FONT = find_unicode_font()
+needs_font = pytest.mark.skipif(FONT is None, reason="no TrueType font with Latin coverage installed")
+
+ROWS = 3000
+
+
+def fill(pdf, rows=ROWS):
+    """Write a table long enough to span many pages"""
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_font(UNICODE_FAMILY, '', FONT[''], uni=True)
+    pdf.add_page()
+    pdf.set_font(UNICODE_FAMILY, '', 10)
+    for row in range(rows):
+        for column in range(4):
+            pdf.cell(45, 10, f"fila {row} columna {column} ñ", border=1)
+        pdf.ln()
+    return pdf
+
+
+def without_creation_date(data):
+    return re.sub(rb'/CreationDate \(D:\d+\)', b'', data)
+
+
+@needs_font
+def test_streamed_pdf_matches_stock_fpdf(tmp_path):
+    stock_path, streamed_path = str(tmp_path / 'stock.pdf'), str(tmp_path / 'streamed.pdf')
+    fill(FPDF()).output(stock_path)
+    fill(StreamingFPDF(streamed_path)).output(streamed_path)
+
+    with open(stock_path, 'rb') as stock, open(streamed_path, 'rb') as streamed:
+        assert without_creation_date(streamed.read()) == without_creation_date(stock.read())
+    assert not os.path.exists(f"{streamed_path}.part")
+
+
+@needs_font
+def test_large_streamed_table_is_a_valid_pdf(tmp_path):
+    path = str(tmp_path / 'large.pdf')
+    pdf = fill(StreamingFPDF(path))
+    pages = pdf.page
+    pdf.output(path)
+
+    reader = PdfReader(path, strict=True)
+    assert len(reader.pages) == pages > 100
+    assert 'fila 0 columna 0 ñ' in reader.pages[0].extract_text()
+    assert f'fila {ROWS - 1} columna 3 ñ' in reader.pages[-1].extract_text()
+
+
+@needs_font
+def test_finished_pages_are_released(tmp_path):
+    path = str(tmp_path / 'released.pdf')
+    pdf = fill(StreamingFPDF(path), rows=200)
+    assert all(content == '' for page, content in pdf.pages.items() if page < pdf.page)
+    pdf.output(path)
+
+
+def test_discard_removes_the_partial_file(tmp_path):
+    path = str(tmp_path / 'broken.pdf')
+    pdf = StreamingFPDF(path)
+    pdf.set_font('Arial', '', 10)
+    pdf.add_page()
+    pdf.add_page()  # Ends the first page, which creates the .part file
+    assert os.path.exists(f"{path}.part")
+    pdf.discard()
+    assert not os.path.exists(f"{path}.part") and not os.path.exists(path)
+
+
+def test_page_count_alias_is_rejected(tmp_path):
+    with pytest.raises(RuntimeError, match='alias_nb_pages'):
+        StreamingFPDF(str(tmp_path / 'alias.pdf')).alias_nb_pages()
+
+
+def test_pdf_generator_streams_large_sheets(tmp_path):
+    main = pytest.importorskip('main')
+    df = pd.DataFrame({'Cargo': [f'Cargo {i}' for i in range(main.STREAMING_ROW_THRESHOLD + 1)],
+                       'Área': 'Producción'})
+    path = str(tmp_path / 'sheet.pdf')
+    generator = main.PDFGenerator()
+    generator.generate_from_dataframes([('Hoja 1', df)], path, title='Descriptores')
+
+    assert isinstance(generator.pdf, StreamingFPDF)
+    reader = PdfReader(path, strict=True)
+    assert f'Cargo {main.STREAMING_ROW_THRESHOLD}' in reader.pages[-1].extract_text()
@@ -0,0 +1,89 @@
+import threading
+
+from mi_app.prefetch import SheetPrefetcher
+from mi_app.utils import looks_like_spreadsheet
+
+KEY = "1AbCdEfGhIjKlMnOpQrStUvWxYz0123456789"
+
+
+class BlockingReader:
+    """Reader whose reads of the identifiers in ``blocked`` wait for ``release``"""
+
+    def __init__(self, blocked=(), failing=()):
+        self.blocked = set(blocked)
+        self.failing = set(failing)
+        self.release = threading.Event()
+        self.calls = []
+
+    def read_sheets(self, access_type, identifier):
+        self.calls.append(identifier)
+        if identifier in self.blocked:
+            self.release.wait(5)
+        if identifier in self.failing:
+            self.failing.discard(identifier)
+            raise ConnectionError("network down")
+        return f"data of {identifier}"
+
+
+def test_a_new_identifier_does_not_wait_for_a_stale_read():
+    reader = BlockingReader(blocked={'old'})
+    prefetcher = SheetPrefetcher(reader)
+    prefetcher.request('key', 'old')
+    prefetcher.request('key', 'new')
+    try:
+        assert prefetcher.read('key', 'new').result(timeout=2) == 'data of new'
+    finally:
+        reader.release.set()
+
+
+def test_the_prefetched_read_is_reused():
+    reader = BlockingReader()
+    prefetcher = SheetPrefetcher(reader)
+    prefetcher.request('key', ' sheet ')
+    prefetcher.request('key', 'sheet')
+    assert prefetcher.read('key', 'sheet').result(timeout=2) == 'data of sheet'
+    assert reader.calls == ['sheet']
+
+
+def test_reads_of_other_identifiers_are_not_handed_over():
+    reader = BlockingReader()
+    prefetcher = SheetPrefetcher(reader)
+    prefetcher.request('key', 'typed')
+    assert prefetcher.take('key', 'other') is None
+    assert prefetcher.take('name', 'typed') is None
+    assert prefetcher.read('key', 'other').result(timeout=2) == 'data of other'
+
+
+def test_a_failed_prefetch_is_read_again():
+    reader = BlockingReader(failing={'sheet'})
+    prefetcher = SheetPrefetcher(reader)
+    prefetcher.request('key', 'sheet')
+    prefetcher._future.exception(timeout=2)
+    assert prefetcher.read('key', 'sheet').result(timeout=2) == 'data of sheet'
+    assert reader.calls == ['sheet', 'sheet']
+
+
+def test_invalidate_drops_reads_for_other_identifiers():
+    prefetcher = SheetPrefetcher(BlockingReader())
+    prefetcher.request('key', 'first')
+    prefetcher.invalidate('key', 'first')
+    assert prefetcher.take('key', 'first') is not None
+    prefetcher.request('key', 'first')
+    prefetcher.invalidate('key', 'firs')
+    assert prefetcher.take('key', 'first') is None
+
+
+def test_only_complete_urls_and_keys_look_like_spreadsheets():
+    assert looks_like_spreadsheet('key', f' {KEY} ')
+    assert not looks_like_spreadsheet('key', KEY[:10])
+    assert looks_like_spreadsheet('url', f'https://docs.google.com/spreadsheets/d/{KEY}/edit')
+    assert not looks_like_spreadsheet('url', 'https://docs.google.com/spreadsheets/d/1Ab')
+    assert not looks_like_spreadsheet('name', 'Descriptores 2025')
+
+
+def test_reads_go_through_the_given_function():
+    reader = BlockingReader()
+    prefetcher = SheetPrefetcher(reader, read=lambda access_type, identifier: (access_type, identifier))
+    prefetcher.request('key', 'sheet')
+    assert prefetcher.read('key', 'sheet').result(timeout=2) == ('key', 'sheet')
+    assert reader.calls == []
@@ -0,0 +1,61 @@
+from mi_app.preflight import preflight
+from tests.conftest import make_sheet
+
+FIRST_JOB_ROW = 11
+
+
+def test_clean_sheet_passes():
+    report = preflight(make_sheet())
+    assert report.ok
+    assert report.can_generate
+    assert report.summary() == "No problems found"
+
+
+def test_missing_header_cells_are_reported_but_do_not_block():
+    sheet = make_sheet()
+    sheet.iloc[5, 42] = ' '
+    report = preflight(sheet)
+    assert report.missing_header_cells == ['author']
+    assert report.can_generate and not report.ok
+
+
+def test_header_cells_outside_a_narrow_sheet_are_missing():
+    report = preflight(make_sheet().iloc[:, :30])
+    assert 'code' in report.missing_header_cells
+    assert report.can_generate
+
+
+def test_rows_without_level_or_title_block_generation():
+    sheet = make_sheet()
+    sheet.iloc[FIRST_JOB_ROW + 2, 3] = ''
+    report = preflight(sheet)
+    assert report.misaligned_rows == [FIRST_JOB_ROW + 2]
+    assert not report.can_generate
+    assert "Rows without level or job title: 13" in report.summary()
+
+
+def test_duplicate_keys_ignore_case_and_spaces_and_do_not_block():
+    sheet = make_sheet()
+    sheet.iloc[FIRST_JOB_ROW + 4, 2] = ' NIVEL 1'
+    sheet.iloc[FIRST_JOB_ROW + 4, 3] = 'cargo 1 '
+    report = preflight(sheet)
+    assert report.duplicate_keys == {('nivel 1', 'cargo 1'): [FIRST_JOB_ROW + 1, FIRST_JOB_ROW + 4]}
+    assert report.can_generate and not report.ok
+    assert "Duplicated job 'nivel 1 / cargo 1' at rows 12, 15" in report.summary()
+
+
+def test_empty_required_fields_are_listed_by_row():
+    sheet = make_sheet()
+    sheet.iloc[FIRST_JOB_ROW, 4] = ''
+    sheet.iloc[FIRST_JOB_ROW + 3, 4] = '  '
+    report = preflight(sheet)
+    assert report.empty_required_fields == {'a_trabajo': [FIRST_JOB_ROW, FIRST_JOB_ROW + 3]}
+    assert report.can_generate
+
+
+def test_required_fields_missing_from_the_sheet_are_empty_for_every_job():
+    report = preflight(make_sheet(jobs=2), required_fields=('puesto', 'organigram', 'no_such_field'))
+    assert report.empty_required_fields == {
+        'organigram': [FIRST_JOB_ROW, FIRST_JOB_ROW + 1],
+        'no_such_field': [FIRST_JOB_ROW, FIRST_JOB_ROW + 1],
+    }
@@ -0,0 +1,50 @@
+import pytest
+
+from mi_app import progress as progress_module
+from mi_app.progress import RATE_WINDOW, ProgressTracker, _format_seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable monotonic clock: clock[0] holds the current time"""
+    now = [100.0]
+    monkeypatch.setattr(progress_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_rate_and_eta_are_unknown_before_the_first_document(clock):
+    tracker = ProgressTracker(total=10)
+    assert tracker.rate == 0.0
+    assert tracker.eta is None
+
+
+def test_first_document_is_measured_from_the_start(clock):
+    tracker = ProgressTracker(total=10)
+    clock[0] += 4
+    tracker.record('A')
+    assert tracker.rate == 0.25
+    assert tracker.eta == 36
+
+
+def test_rate_follows_the_recent_completions(clock):
+    tracker = ProgressTracker(total=100)
+    clock[0] += 60  # Slow start-up
+    for _ in range(RATE_WINDOW + 5):
+        tracker.record('doc')
+        clock[0] += 0.5
+    assert tracker.rate == pytest.approx(2.0)
+    assert tracker.eta == pytest.approx((100 - RATE_WINDOW - 5) / 2.0)
+
+
+def test_failures_are_kept_with_their_label(clock):
+    tracker = ProgressTracker(total=2)
+    error = ValueError("template missing")
+    tracker.record('Nivel 1 / Cargo 1')
+    tracker.record('Nivel 1 / Cargo 2', error)
+    assert tracker.done == 2
+    assert tracker.failures == [('Nivel 1 / Cargo 2', error)]
+
+
+@pytest.mark.parametrize('seconds, text', [(0, '0:00'), (59.6, '1:00'), (754, '12:34'), (3725, '1:02:05')])
+def test_format_seconds(seconds, text):
+    assert _format_seconds(seconds) == text
@@ -0,0 +1,153 @@
+import time
+
+import gspread
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+from fake_google_api import FakeGoogleAPI, FaultInjector, Fixtures
+from mi_app import scheduler as scheduler_module
+from mi_app.google_sheets import GoogleConnection, GoogleSheetsReader
+from mi_app.scheduler import RequestScheduler, TokenBucket
+
+
+class StatusError(Exception):
+    """Error carrying an HTTP status the way gspread and requests errors do"""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type('Response', (), {'status_code': status_code})()
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Record backoff delays instead of sleeping through them"""
+    delays = []
+    monkeypatch.setattr(scheduler_module.time, 'sleep', delays.append)
+    monkeypatch.setattr(scheduler_module.random, 'uniform', lambda low, high: high)
+    return delays
+
+
+def flaky(statuses, result='ok'):
+    """Return a callable failing with each status in turn, then returning ``result``"""
+    statuses = list(statuses)
+    calls = []
+
+    def func():
+        calls.append(1)
+        if statuses:
+            raise StatusError(statuses.pop(0))
+        return result
+
+    func.calls = calls
+    return func
+
+
+def test_bucket_allows_a_burst_up_to_capacity():
+    bucket = TokenBucket(rate_per_minute=600, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    assert bucket.tokens < 1
+
+
+def test_bucket_waits_for_refill_when_empty():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)  # one token every 0.1 s
+    bucket.acquire()
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.08
+
+
+def test_retryable_errors_are_retried_with_exponential_backoff(no_sleep):
+    scheduler = RequestScheduler(requests_per_minute=6000, base_delay=1.0, max_delay=64.0)
+    func = flaky([429, 503, 500])
+
+    assert scheduler.call(func) == 'ok'
+    assert len(func.calls) == 4
+    assert no_sleep == [1.0, 2.0, 4.0]
+    assert scheduler.metrics()['retries'] == 3
+    assert scheduler.metrics()['failures'] == 0
+
+
+def test_backoff_is_capped(no_sleep):
+    scheduler = RequestScheduler(requests_per_minute=6000, max_retries=5, base_delay=1.0, max_delay=3.0)
+    scheduler.call(flaky([429] * 5))
+    assert no_sleep == [1.0, 2.0, 3.0, 3.0, 3.0]
+
+
+def test_non_retryable_errors_are_raised_at_once(no_sleep):
+    scheduler = RequestScheduler(requests_per_minute=6000)
+    func = flaky([404])
+
+    with pytest.raises(StatusError):
+        scheduler.call(func)
+    assert len(func.calls) == 1
+    assert no_sleep == []
+    assert scheduler.metrics()['failures'] == 1
+
+
+def test_retries_stop_after_max_retries(no_sleep):
+    scheduler = RequestScheduler(requests_per_minute=6000, max_retries=2)
+    func = flaky([429] * 10)
+
+    with pytest.raises(StatusError):
+        scheduler.call(func)
+    assert len(func.calls) == 3
+    assert scheduler.metrics()['failures'] == 1
+
+
+def test_every_attempt_is_counted_against_the_quota(no_sleep):
+    scheduler = RequestScheduler(requests_per_minute=6000)
+    scheduler.call(flaky([429, 429]))
+    assert scheduler.requests_per_minute() == 3
+
+
+def test_read_sheets_retries_the_worksheet_metadata_fetch():
+    """Every request of a read, metadata included, goes through the scheduler"""
+    fixtures = Fixtures.synthetic(1, jobs=5)
+    key = next(iter(fixtures.spreadsheets))
+    with FakeGoogleAPI(fixtures, faults=FaultInjector(rate_429=0.5, seed=3)) as api:
+        connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url,
+                                      requests_per_minute=6000)
+        connection.scheduler.base_delay = 0.001
+        connection.scheduler.max_retries = 20
+        reader = GoogleSheetsReader(connection)
+
+        for _ in range(5):
+            assert reader.read_sheets("key", key).shape == (16, 43)
+        assert api.stats['fault_429'] > 0
+        assert connection.scheduler.metrics()['retries'] == api.stats['fault_429']
+
+
+def test_every_http_request_takes_a_token():
+    """gspread's own metadata requests and the credential check are counted too"""
+    fixtures = Fixtures.synthetic(2, jobs=5)
+    first, second = fixtures.spreadsheets
+    with FakeGoogleAPI(fixtures, faults=FaultInjector(rate_429=0.3, seed=5)) as api:
+        connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url,
+                                      requests_per_minute=6000)
+        connection.scheduler.base_delay = 0.001
+        connection.scheduler.max_retries = 20
+        reader = GoogleSheetsReader(connection)
+
+        assert connection.validate_credentials()[0]
+        reader.read_sheets("key", first)
+        reader.read_sheets("name", fixtures.spreadsheets[second]["title"])
+        reader.file_info(first)
+
+        served = sum(count for name, count in api.stats.items() if not name.startswith('fault_'))
+        assert connection.scheduler.requests_per_minute() == served
+        assert connection.scheduler.metrics()['retries'] == api.stats['fault_429']
+
+
+def test_exhausted_retries_return_the_error_to_the_caller(no_sleep):
+    fixtures = Fixtures.synthetic(1, jobs=5)
+    with FakeGoogleAPI(fixtures, faults=FaultInjector(rate_429=1.0)) as api:
+        connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url,
+                                      requests_per_minute=6000)
+        connection.scheduler.max_retries = 2
+        with pytest.raises(gspread.exceptions.APIError):
+            GoogleSheetsReader(connection).read_sheets("key", next(iter(fixtures.spreadsheets)))
+        assert api.stats['fault_429'] == 3
+        assert connection.scheduler.metrics()['failures'] == 1
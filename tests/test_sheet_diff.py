@@ -0,0 +1,84 @@
+from mi_app.docx_generator import DocumentGenerator
+from mi_app.sheet_diff import diff_snapshots, keyed_job_table
+from tests.conftest import make_sheet
+
+# Raw sheet rows of the job table start at row 11; columns 2 and 3 hold level and title
+FIRST_JOB_ROW = 11
+LEVEL_COLUMN, TITLE_COLUMN, AREA_COLUMN = 2, 3, 4
+
+
+def set_job(sheet, job, level=None, title=None, area=None):
+    row = FIRST_JOB_ROW + job
+    for column, value in ((LEVEL_COLUMN, level), (TITLE_COLUMN, title), (AREA_COLUMN, area)):
+        if value is not None:
+            sheet.iloc[row, column] = value
+
+
+def test_identical_snapshots_have_no_changes():
+    diff = diff_snapshots(make_sheet(), make_sheet())
+    assert diff.is_empty
+    assert diff.report() == "No changes"
+
+
+def test_added_removed_and_modified_jobs():
+    old = make_sheet(4)
+    new = make_sheet(4)
+    set_job(new, 1, area='Logística')
+    set_job(new, 3, title='Cargo nuevo')
+
+    diff = diff_snapshots(old, new)
+
+    assert diff.added == [('nivel 0', 'cargo nuevo', 0)]
+    assert diff.removed == [('nivel 0', 'cargo 3', 0)]
+    assert diff.modified == {('nivel 1', 'cargo 1', 0): ['a_trabajo']}
+    assert diff.jobs_to_render == [1, 3]
+
+
+def test_keys_ignore_case_and_surrounding_spaces():
+    new = make_sheet()
+    set_job(new, 2, level='  NIVEL 2 ', title='cargo 2')
+    diff = diff_snapshots(make_sheet(), new)
+    assert not diff.added and not diff.removed
+    assert diff.modified == {('nivel 2', 'cargo 2', 0): ['n_jerarquico', 'puesto']}
+
+
+def test_header_changes_are_reported():
+    new = make_sheet()
+    new.iloc[5, 42] = 'Beatriz'
+    diff = diff_snapshots(make_sheet(), new)
+    assert diff.header_changes == {'author': ('Ana', 'Beatriz')}
+    assert diff.jobs_to_render == [0, 1, 2, 3, 4]
+
+
+def test_edits_to_duplicated_rows_are_not_dropped():
+    old = make_sheet(4)
+    set_job(old, 3, level='Nivel 1', title='Cargo 1')
+    new = old.copy()
+    set_job(new, 3, area='Bodega')
+
+    keyed = keyed_job_table(DocumentGenerator().job_table(old))
+    assert keyed.index.is_unique
+
+    diff = diff_snapshots(old, new)
+    assert diff.modified == {('nivel 1', 'cargo 1', 1): ['a_trabajo']}
+    assert diff.report() == "~ nivel 1 / cargo 1 (#2): a_trabajo"
+    assert diff.jobs_to_render == [3]
+
+
+def test_removing_one_duplicate_reports_the_last_occurrence():
+    old = make_sheet(4)
+    set_job(old, 3, level='Nivel 1', title='Cargo 1')
+    new = make_sheet(3)
+
+    diff = diff_snapshots(old, new)
+    assert diff.removed == [('nivel 1', 'cargo 1', 1)]
+
+
+def test_job_options_keep_every_duplicated_row():
+    sheet = make_sheet(4)
+    set_job(sheet, 3, level='Nivel 1', title='Cargo 1')
+    options = DocumentGenerator().job_options(sheet)
+
+    assert options[('Nivel 1', 'Cargo 1')] == 1
+    assert options[('Nivel 1', 'Cargo 1 (2)')] == 3
+    assert sorted(options.values()) == [0, 1, 2, 3]
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from mi_app.text_generator import MARKDOWN_EXTENSIONS, TextGenerator, job_records
+from tests.conftest import make_sheet
+
+
+def test_jobs_with_the_same_name_get_separate_files(tmp_path):
+    sheet = make_sheet(3)
+    sheet.iloc[12, 2:4] = sheet.iloc[11, 2:4]
+    paths = [path for _, path in TextGenerator().generate_descriptors(sheet, range(3), str(tmp_path))]
+
+    assert [os.path.basename(path) for path in paths] == [
+        'Nivel_0-Cargo_0.md', 'Nivel_0-Cargo_0_2.md', 'Nivel_2-Cargo_2.md'
+    ]
+    with open(paths[1], encoding='utf-8') as f:
+        assert 'valor 1-4' in f.read()
+
+
+def render_job(fmt, **values):
+    generator = TextGenerator()
+    sheet = make_sheet(1)
+    header = generator.doc_generator.header_context(sheet)
+    job_data = dict(job_records(generator.doc_generator.job_table(sheet))[0], **values)
+    return generator.render(header, job_data, fmt)
+
+
+def table_row(text, label):
+    return next(line for line in text.splitlines() if line.startswith(f'| **{label}** |'))
+
+
+def test_markdown_values_stay_inside_their_table_row():
+    text = render_job('markdown', p_participa='Compras | Ventas\nLogística\r\nBodega')
+    assert table_row(text, 'Procesos en los que participa') == (
+        '| **Procesos en los que participa** | Compras \\| Ventas<br>Logística<br>Bodega |'
+    )
+
+
+def test_escaped_values_render_as_a_single_html_cell():
+    markdown = pytest.importorskip('markdown')
+    text = render_job('markdown', p_participa='Compras | Ventas\nLogística')
+    html = markdown.markdown(text, extensions=list(MARKDOWN_EXTENSIONS))
+    assert '<td>Compras | Ventas<br>Logística</td>' in html
+
+
+def test_html_values_keep_their_pipes():
+    pytest.importorskip('markdown')
+    html = render_job('html', p_participa='Compras | Ventas\nLogística')
+    assert 'Compras | Ventas<br>\nLogística' in html
+
+
+def test_image_links_are_not_escaped():
+    text = render_job('markdown', organigram='https://example.com/org.png?a=1|2')
+    assert '![organigram](https://example.com/org.png?a=1|2)' in text
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from mi_app.utils import atomic_path, descriptor_filenames
+
+
+def test_descriptor_filenames_are_unique_per_folder():
+    jobs = [('Nivel 1', 'Cargo'), ('Nivel 1', 'Cargo'), ('nivel 1', 'CARGO'), ('Nivel 1', 'Cargo?'),
+            ('Nivel 2', 'Cargo')]
+    assert descriptor_filenames(jobs, '.docx') == [
+        'Nivel_1-Cargo.docx', 'Nivel_1-Cargo_2.docx', 'nivel_1-CARGO_3.docx', 'Nivel_1-Cargo_4.docx',
+        'Nivel_2-Cargo.docx',
+    ]
+
+
+def test_a_counter_never_reuses_a_real_name():
+    jobs = [('Nivel', 'Cargo 2'), ('Nivel', 'Cargo'), ('Nivel', 'Cargo')]
+    assert descriptor_filenames(jobs, '.md') == ['Nivel-Cargo_2.md', 'Nivel-Cargo.md', 'Nivel-Cargo_3.md']
+
+
+def test_names_taken_earlier_are_skipped():
+    taken = set()
+    assert descriptor_filenames([('A', 'B')], '.md', taken) == ['A-B.md']
+    assert descriptor_filenames([('A', 'B')], '.md', taken) == ['A-B_2.md']
+    assert taken == {'a-b.md', 'a-b_2.md'}
+
+
+def test_atomic_path_moves_the_file_into_place(tmp_path):
+    path = tmp_path / 'estado.json'
+    path.write_text('viejo')
+    with atomic_path(str(path)) as tmp:
+        with open(tmp, 'w') as f:
+            f.write('nuevo')
+        assert path.read_text() == 'viejo'
+    assert path.read_text() == 'nuevo'
+    assert os.listdir(tmp_path) == ['estado.json']
+
+
+def test_atomic_path_leaves_the_old_file_on_failure(tmp_path):
+    path = tmp_path / 'estado.json'
+    path.write_text('viejo')
+    with pytest.raises(ValueError):
+        with atomic_path(str(path)) as tmp:
+            with open(tmp, 'w') as f:
+                f.write('a medias')
+            raise ValueError("serialization failed")
+    assert path.read_text() == 'viejo'
+    assert os.listdir(tmp_path) == ['estado.json']
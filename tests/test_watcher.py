@@ -0,0 +1,135 @@
+import os
+
+import pytest
+from fake_google_api import FakeGoogleAPI, Fixtures
+from google.auth.credentials import AnonymousCredentials
+
+from mi_app.docx_generator import DocumentGenerator
+from mi_app.google_sheets import GoogleConnection
+from mi_app.watcher import DriveChangesWatcher, regenerate_descriptors
+from tests.conftest import make_sheet
+
+
+@pytest.fixture
+def drive():
+    fixtures = Fixtures.synthetic(3, jobs=1)
+    with FakeGoogleAPI(fixtures) as api:
+        connection = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=api.url,
+                                      requests_per_minute=6000)
+        yield fixtures, connection
+
+
+def make_watcher(connection, tmp_path):
+    return DriveChangesWatcher(connection, state_path=str(tmp_path / 'state.json'), interval=0)
+
+
+def test_only_changed_registered_spreadsheets_are_regenerated(drive, tmp_path):
+    fixtures, connection = drive
+    first, second, unwatched = list(fixtures.spreadsheets)
+    watcher = make_watcher(connection, tmp_path)
+    calls = []
+    watcher.register(first, calls.append)
+    watcher.register(second, calls.append)
+
+    assert watcher.poll_once() == set()
+    fixtures.touch(second)
+    fixtures.touch(unwatched)
+    assert watcher.poll_once() == {second}
+    assert calls == [second]
+    assert watcher.poll_once() == set()
+
+
+def test_failed_regeneration_is_retried_on_the_next_poll(drive, tmp_path):
+    fixtures, connection = drive
+    key = next(iter(fixtures.spreadsheets))
+    watcher = make_watcher(connection, tmp_path)
+    attempts = []
+
+    def regenerate(spreadsheet_key):
+        attempts.append(spreadsheet_key)
+        if len(attempts) == 1:
+            raise RuntimeError("template missing")
+
+    watcher.register(key, regenerate)
+    watcher.poll_once()
+    fixtures.touch(key)
+
+    assert watcher.poll_once() == set()
+    assert watcher.pending == {key}
+    # No new change in the feed: the failed spreadsheet is retried anyway
+    assert watcher.poll_once() == {key}
+    assert attempts == [key, key]
+    assert watcher.pending == set()
+
+
+def test_pending_spreadsheets_survive_a_restart(drive, tmp_path):
+    fixtures, connection = drive
+    key = next(iter(fixtures.spreadsheets))
+    watcher = make_watcher(connection, tmp_path)
+    watcher.register(key, lambda spreadsheet_key: 1 / 0)
+    watcher.poll_once()
+    fixtures.touch(key)
+    watcher.poll_once()
+
+    restarted = make_watcher(connection, tmp_path)
+    calls = []
+    restarted.register(key, calls.append)
+    assert restarted.poll_once() == {key}
+    assert calls == [key]
+
+
+def test_default_state_file_is_scoped_by_account_and_endpoint(drive):
+    _, connection = drive
+    other_endpoint = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint='http://127.0.0.1:9')
+    same_scope = GoogleConnection(credentials=AnonymousCredentials(), api_endpoint=connection.api_endpoint)
+
+    path = DriveChangesWatcher(connection).state_path
+    assert DriveChangesWatcher(same_scope).state_path == path
+    assert DriveChangesWatcher(other_endpoint).state_path != path
+
+    DriveChangesWatcher(connection, interval=0).poll_once()
+    watcher = DriveChangesWatcher(other_endpoint)
+    assert not os.path.exists(watcher.state_path)
+
+
+class SnapshotReader:
+    """Reader returning whatever sheet the test put in ``sheet``"""
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+
+    def read_sheets(self, access_type, identifier):
+        return self.sheet.copy()
+
+
+def test_only_out_of_date_descriptors_are_regenerated(tmp_path):
+    reader = SnapshotReader(make_sheet(4))
+    generator = DocumentGenerator()
+    snapshots = {}
+
+    paths = regenerate_descriptors(reader, generator, 'hoja', str(tmp_path), snapshots)
+    assert len(paths) == 4 and 'hoja' in snapshots
+
+    reader.sheet.iloc[13, 4] = 'Bodega'  # Job 2
+    paths = regenerate_descriptors(reader, generator, 'hoja', str(tmp_path), snapshots)
+    assert [os.path.basename(path) for path in paths] == ['Nivel_2-Cargo_2.docx']
+
+    assert regenerate_descriptors(reader, generator, 'hoja', str(tmp_path), snapshots) == []
+
+    reader.sheet.iloc[5, 42] = 'Beatriz'  # A header cell is on every descriptor
+    assert len(regenerate_descriptors(reader, generator, 'hoja', str(tmp_path), snapshots)) == 4
+
+
+def test_duplicates_keep_their_file_names_when_re_rendered(tmp_path):
+    sheet = make_sheet(3)
+    sheet.iloc[13, 2:4] = sheet.iloc[11, 2:4]  # Job 2 repeats job 0's level and title
+    reader = SnapshotReader(sheet)
+    generator = DocumentGenerator()
+    snapshots = {}
+    paths = regenerate_descriptors(reader, generator, 'hoja', str(tmp_path), snapshots)
+    assert sorted(os.path.basename(path) for path in paths) == [
+        'Nivel_0-Cargo_0.docx', 'Nivel_0-Cargo_0_2.docx', 'Nivel_1-Cargo_1.docx']
+
+    reader.sheet.iloc[13, 4] = 'Bodega'
+    paths = regenerate_descriptors(reader, generator, 'hoja', str(tmp_path), snapshots)
+    assert [os.path.basename(path) for path in paths] == ['Nivel_0-Cargo_0_2.docx']